@@ -1,6 +1,8 @@
 from __future__ import unicode_literals
 
+from django.core.management import call_command
 from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
 
 import factories
 
@@ -33,7 +35,23 @@ class Command(BaseCommand):
                             default=True,
                             help="No journals.")
 
+        parser.add_argument('--no-index',
+                            action='store_false',
+                            dest='with_index',
+                            default=True,
+                            help="Do not index the data created.")
+
     def handle(self, *args, **options):
+        # Objects are not indexed one by one upon save (which takes a
+        # request per object), but bulk indexed once all of them are created.
+        with override_settings(ELASTICSEARCH_DSL_AUTOSYNC=False):
+            self.create_data(**options)
+
+        if options.get('with_index', True):
+            call_command('elasticsearch_bulk_index')
+
+    def create_data(self, **options):
+        """Create test data."""
         if options.get('number'):
             number = options['number']
         else:
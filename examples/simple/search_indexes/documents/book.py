@@ -168,6 +168,15 @@ class BookDocument(Document):
         # queryset_pagination = 50  # This will split the queryset
         #                           # into parts while indexing
 
+    def get_queryset(self):
+        """Get queryset, fetching the related objects indexed at once."""
+        return super(BookDocument, self).get_queryset().select_related(
+            'publisher'
+        ).prefetch_related(
+            'authors',
+            'tags',
+        )
+
     def prepare_summary(self, instance):
         """Prepare summary."""
         return instance.summary[:32766] if instance.summary else None
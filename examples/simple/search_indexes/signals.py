@@ -6,17 +6,46 @@ the `django_elasticsearch_dsl`), but also make sure that upon updates in any
 of the indexed related fields (such as foreign keys and many-to-many fields;
 in case of `books.Book` model one of them is `publisher`) the Book index is
 updated as well.
+
+Books of the related object are re-indexed in a single bulk request (the
+books and their related objects are fetched in a constant number of
+queries, see `BookDocument.get_queryset`).
 """
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
-from django_elasticsearch_dsl.registries import registry
+from django_elasticsearch_dsl.apps import DEDConfig
 
 __all__ = (
+    'update_books',
     'update_document',
     'delete_document',
 )
 
+# Models which books are indexed.
+RELATED_MODELS = ('publisher', 'author', 'tag')
+
+
+def update_books(instance):
+    """Re-index books of the related object in a single bulk request.
+
+    :param instance: `books.Publisher`, `books.Author` or `books.Tag`
+        instance.
+    """
+    if not DEDConfig.autosync_enabled():
+        return
+
+    # Documents import models, which are not loaded yet when the signals
+    # are connected.
+    from .documents import BookDocument
+
+    document = BookDocument()
+    document.update(
+        document.get_queryset().filter(
+            pk__in=instance.books.values('pk')
+        )
+    )
+
 
 @receiver(post_save)
 def update_document(sender, **kwargs):
@@ -26,28 +55,9 @@ def update_document(sender, **kwargs):
     `books.Author` (`authors`), `books.Tag` (`tags`) fields have been updated
     in the database.
     """
-    app_label = sender._meta.app_label
-    model_name = sender._meta.model_name
-    instance = kwargs['instance']
-
-    if app_label == 'book':
-        # If it is `books.Publisher` that is being updated.
-        if model_name == 'publisher':
-            instances = instance.books.all()
-            for _instance in instances:
-                registry.update(_instance)
-
-        # If it is `books.Author` that is being updated.
-        if model_name == 'author':
-            instances = instance.books.all()
-            for _instance in instances:
-                registry.update(_instance)
-
-        # If it is `books.Tag` that is being updated.
-        if model_name == 'tag':
-            instances = instance.books.all()
-            for _instance in instances:
-                registry.update(_instance)
+    if sender._meta.app_label == 'books' \
+            and sender._meta.model_name in RELATED_MODELS:
+        update_books(kwargs['instance'])
 
 
 @receiver(post_delete)
@@ -58,28 +68,6 @@ def delete_document(sender, **kwargs):
     (`publisher`), `books.Author` (`authors`), `books.Tag` (`tags`) fields
     have been removed from database.
     """
-    app_label = sender._meta.app_label
-    model_name = sender._meta.model_name
-    instance = kwargs['instance']
-
-    if app_label == 'books':
-        # If it is `books.Publisher` that is being updated.
-        if model_name == 'publisher':
-            instances = instance.books.all()
-            for _instance in instances:
-                registry.update(_instance)
-                # registry.delete(_instance, raise_on_error=False)
-
-        # If it is `books.Author` that is being updated.
-        if model_name == 'author':
-            instances = instance.books.all()
-            for _instance in instances:
-                registry.update(_instance)
-                # registry.delete(_instance, raise_on_error=False)
-
-        # If it is `books.Tag` that is being updated.
-        if model_name == 'tag':
-            instances = instance.books.all()
-            for _instance in instances:
-                registry.update(_instance)
-                # registry.delete(_instance, raise_on_error=False)
+    if sender._meta.app_label == 'books' \
+            and sender._meta.model_name in RELATED_MODELS:
+        update_books(kwargs['instance'])
@@ -9,6 +9,7 @@ from .viewsets import (
     BookCustomDocumentViewSet,
     BookDefaultFilterLookupDocumentViewSet,
     BookDocumentViewSet,
+    BookFastJSONDocumentViewSet,
     BookFrontendDocumentViewSet,
     BookFunctionalSuggesterDocumentViewSet,
     BookIgnoreIndexErrorsDocumentViewSet,
@@ -20,6 +21,8 @@ from .viewsets import (
     BookOrderingByScoreCompoundSearchBackendDocumentViewSet,
     BookOrderingByScoreDocumentViewSet,
     BookPermissionsDocumentViewSet,
+    BookRescoreCompoundSearchBackendDocumentViewSet,
+    BookSearchTemplateBackendDocumentViewSet,
     BookNoPermissionsDocumentViewSet,
     BookNoRecordsDocumentViewSet,
     BookSimpleQueryStringBoostSearchFilterBackendDocumentViewSet,
@@ -176,6 +179,24 @@ router.register(
     basename='bookdocument_compound_search_boost_backend'
 )
 
+router.register(
+    r'books-compound-search-backend-rescore',
+    BookRescoreCompoundSearchBackendDocumentViewSet,
+    basename='bookdocument_compound_search_backend_rescore'
+)
+
+router.register(
+    r'books-search-template-backend',
+    BookSearchTemplateBackendDocumentViewSet,
+    basename='bookdocument_search_template_backend'
+)
+
+router.register(
+    r'books-fast-json',
+    BookFastJSONDocumentViewSet,
+    basename='bookdocument_fast_json'
+)
+
 router.register(
     r'books-compound-search-backend-ordered-by-score',
     BookOrderingByScoreCompoundSearchBackendDocumentViewSet,
@@ -16,6 +16,7 @@ __all__ = (
     'BookCustomDocumentViewSet',
     'BookDefaultFilterLookupDocumentViewSet',
     'BookDocumentViewSet',
+    'BookFastJSONDocumentViewSet',
     'BookFrontendDocumentViewSet',
     'BookFunctionalSuggesterDocumentViewSet',
     'BookIgnoreIndexErrorsDocumentViewSet',
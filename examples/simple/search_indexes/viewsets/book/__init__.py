@@ -4,6 +4,7 @@ from .compound_search_boost import *
 from .default import *
 from .default_filter_lookup import *
 from .faceted_filtered import *
+from .fast_json import *
 from .functional_suggester import *
 from .ignore_index_errors import *
 from .frontend import *
@@ -15,6 +16,8 @@ from .ordering_by_score import *
 from .ordering_by_score_compound_search import *
 from .permissions import *
 from .query_friendly_pagination import *
+from .rescore import *
+from .search_template import *
 from .simple_query_string import *
 from .simple_query_string_boost import *
 from .source import *
@@ -11,7 +11,9 @@ from django_elasticsearch_dsl_drf.constants import (
     LOOKUP_QUERY_LT,
     LOOKUP_QUERY_LTE,
 )
+from django_elasticsearch_dsl_drf.facets import CompositeTermsFacet
 from django_elasticsearch_dsl_drf.filter_backends import (
+    CollapseBackend,
     DefaultOrderingFilterBackend,
     FacetedSearchFilterBackend,
     FilteringFilterBackend,
@@ -53,6 +55,7 @@ class BaseBookDocumentViewSet(BaseDocumentViewSet):
         # SuggesterFilterBackend,
         # FunctionalSuggesterFilterBackend,
         HighlightBackend,
+        CollapseBackend,
     ]
     # Define search fields
     search_fields = (
@@ -60,6 +63,18 @@ class BaseBookDocumentViewSet(BaseDocumentViewSet):
         'description',
         'summary',
     )
+    # Define collapse fields
+    collapse_fields = {
+        'publisher': 'publisher.raw',
+        'state': {
+            'field': 'state.raw',
+            'inner_hits': {
+                'name': 'books',
+                'size': 3,
+                '_source': ['id', 'title'],
+            },
+        },
+    }
     # Define highlight fields
     highlight_fields = {
         'title': {
@@ -197,6 +212,13 @@ class BaseBookDocumentViewSet(BaseDocumentViewSet):
             'enabled': True,
             'global': True,
         },
+        'state_composite': {
+            'field': 'state.raw',
+            'facet': CompositeTermsFacet,
+            'options': {
+                'size': 1,
+            }
+        },
         'publication_date': {
             'field': 'publication_date',
             'facet': DateHistogramFacet,
@@ -17,9 +17,11 @@ from django_elasticsearch_dsl_drf.filter_backends import (
 from django_elasticsearch_dsl_drf.viewsets import (
     SuggestMixin,
     MoreLikeThisMixin,
+    OmniSuggestMixin,
 )
 
 from .base import BaseBookDocumentViewSet
+from ...documents import AuthorDocument, PublisherDocument
 
 
 __all__ = (
@@ -29,7 +31,8 @@ __all__ = (
 
 class BookDocumentViewSet(BaseBookDocumentViewSet,
                           SuggestMixin,
-                          MoreLikeThisMixin):
+                          MoreLikeThisMixin,
+                          OmniSuggestMixin):
     """The BookDocument view."""
 
     filter_backends = [
@@ -70,3 +73,18 @@ class BookDocumentViewSet(BaseBookDocumentViewSet,
         'tag_suggest': 'tags.suggest',
         'summary_suggest': 'summary',
     }
+
+    # Omni-suggest fields
+    omnisuggest_fields = {
+        'title': 'title.suggest',
+        'author': {
+            'document': AuthorDocument,
+            'field': 'name.suggest',
+            'size': 3,
+        },
+        'publisher': {
+            'document': PublisherDocument,
+            'field': 'name.suggest',
+            'size': 3,
+        },
+    }
@@ -0,0 +1,21 @@
+from django_elasticsearch_dsl_drf.json_codecs import FastJSONSerializer
+from django_elasticsearch_dsl_drf.renderers import FastJSONRenderer
+
+from rest_framework.renderers import BrowsableAPIRenderer
+
+from .default import BookDocumentViewSet
+
+__all__ = (
+    'BookFastJSONDocumentViewSet',
+)
+
+
+class BookFastJSONDocumentViewSet(BookDocumentViewSet):
+    """Book document view set using the fast JSON codec.
+
+    Both Elasticsearch transport and the response rendering use the
+    fastest JSON codec available.
+    """
+
+    transport_serializer = FastJSONSerializer
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
@@ -0,0 +1,49 @@
+from django_elasticsearch_dsl_drf.filter_backends import (
+    CompoundSearchFilterBackend,
+    DefaultOrderingFilterBackend,
+    FacetedSearchFilterBackend,
+    FilteringFilterBackend,
+    HighlightBackend,
+    IdsFilterBackend,
+    OrderingFilterBackend,
+    PostFilterFilteringFilterBackend,
+    RescoreBackend,
+)
+
+from .default import BookDocumentViewSet
+
+__all__ = (
+    'BookRescoreCompoundSearchBackendDocumentViewSet',
+)
+
+
+class BookRescoreCompoundSearchBackendDocumentViewSet(BookDocumentViewSet):
+    """Book document view set based on compound search backend.
+
+    Top hits of the compound search are rescored using the phrase query.
+    """
+
+    filter_backends = [
+        FilteringFilterBackend,
+        PostFilterFilteringFilterBackend,
+        IdsFilterBackend,
+        OrderingFilterBackend,
+        DefaultOrderingFilterBackend,
+        CompoundSearchFilterBackend,
+        RescoreBackend,
+        FacetedSearchFilterBackend,
+        HighlightBackend,
+    ]
+
+    search_fields = {
+        'title': {'boost': 4},
+        'summary': {'boost': 2},
+        'description': None,
+    }
+    # Rescoring is only possible when sorting on `_score`
+    ordering = ('_score',)
+    rescore_options = {
+        'window_size': 200,
+        'query_weight': 0.7,
+        'rescore_query_weight': 1.2,
+    }
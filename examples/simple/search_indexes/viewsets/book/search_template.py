@@ -0,0 +1,40 @@
+from django_elasticsearch_dsl_drf.filter_backends import (
+    DefaultOrderingFilterBackend,
+    FacetedSearchFilterBackend,
+    FilteringFilterBackend,
+    HighlightBackend,
+    IdsFilterBackend,
+    OrderingFilterBackend,
+    PostFilterFilteringFilterBackend,
+    SearchTemplateBackend,
+)
+
+from .default import BookDocumentViewSet
+
+__all__ = (
+    'BookSearchTemplateBackendDocumentViewSet',
+)
+
+
+class BookSearchTemplateBackendDocumentViewSet(BookDocumentViewSet):
+    """Book document view set based on search template backend.
+
+    Search query is executed through the stored search template.
+    """
+
+    filter_backends = [
+        FilteringFilterBackend,
+        PostFilterFilteringFilterBackend,
+        IdsFilterBackend,
+        OrderingFilterBackend,
+        DefaultOrderingFilterBackend,
+        SearchTemplateBackend,
+        FacetedSearchFilterBackend,
+        HighlightBackend,
+    ]
+
+    search_fields = {
+        'title': {'boost': 4},
+        'summary': {'boost': 2},
+        'description': None,
+    }
@@ -122,6 +122,9 @@ class CityCompoundSearchBackendDocumentViewSet(CityDocumentViewSet):
         SuggesterFilterBackend,
     ]
 
+    # Build search queries from a compiled query template
+    compile_search_queries = True
+
     # search_nested_fields = {
     #     # 'country': ['name'],
     #     'country': {
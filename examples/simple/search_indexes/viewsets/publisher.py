@@ -11,6 +11,7 @@ from django_elasticsearch_dsl_drf.constants import (
 )
 from django_elasticsearch_dsl_drf.filter_backends import (
     FilteringFilterBackend,
+    GeoGridAggregationBackend,
     DefaultOrderingFilterBackend,
     OrderingFilterBackend,
     SearchFilterBackend,
@@ -20,7 +21,10 @@ from django_elasticsearch_dsl_drf.filter_backends import (
     GeoSpatialOrderingFilterBackend,
 )
 from django_elasticsearch_dsl_drf.pagination import LimitOffsetPagination
-from django_elasticsearch_dsl_drf.viewsets import DocumentViewSet
+from django_elasticsearch_dsl_drf.viewsets import (
+    DocumentViewSet,
+    GeoGridMixin,
+)
 
 from ..documents import PublisherDocument
 from ..serializers import PublisherDocumentSerializer
@@ -30,7 +34,7 @@ __all__ = (
 )
 
 
-class PublisherDocumentViewSet(DocumentViewSet):
+class PublisherDocumentViewSet(DocumentViewSet, GeoGridMixin):
     """The PublisherDocument view."""
 
     document = PublisherDocument
@@ -45,8 +49,11 @@ class PublisherDocumentViewSet(DocumentViewSet):
         # DefaultOrderingFilterBackend,
         SuggesterFilterBackend,
         FunctionalSuggesterFilterBackend,
+        GeoGridAggregationBackend,
     ]
     pagination_class = LimitOffsetPagination
+    # Execute functional suggesters concurrently with the native ones
+    concurrent_functional_suggest = True
     # Define search fields
     search_fields = (
         'name',
@@ -85,6 +92,10 @@ class PublisherDocumentViewSet(DocumentViewSet):
             ]
         },
     }
+    # Define geo grid aggregation fields
+    geo_grid_aggregation_fields = {
+        'location': None,
+    }
     # Define ordering fields
     ordering_fields = {
         'id': None,
@@ -124,6 +135,16 @@ class PublisherDocumentViewSet(DocumentViewSet):
             ],
             'default_suggester': SUGGESTER_COMPLETION,
         },
+        'country_suggest_cached': {
+            'field': 'country.suggest',
+            'suggesters': [
+                SUGGESTER_COMPLETION,
+            ],
+            'default_suggester': SUGGESTER_COMPLETION,
+            'cache': {
+                'max_prefix_length': 2,
+            },
+        },
     }
 
     # Functional suggester fields
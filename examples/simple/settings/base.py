@@ -271,6 +271,9 @@ ELASTICSEARCH_DSL = {
     },
 }
 
+# Bump index generations (conditional GET) when the indexed models change
+ELASTICSEARCH_DSL_DRF_WATCH_DOCUMENTS = True
+
 # CORS headers config
 CORS_ORIGIN_ALLOW_ALL = True
 
@@ -3,6 +3,8 @@ Apps.
 """
 
 from django.apps import AppConfig
+from django.conf import settings
+from django.utils.module_loading import autodiscover_modules
 
 __title__ = 'django_elasticsearch_dsl_drf.apps'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
@@ -16,3 +18,14 @@ class Config(AppConfig):
 
     name = 'django_elasticsearch_dsl_drf'
     label = 'django_elasticsearch_dsl_drf'
+
+    def ready(self):
+        from .conditional import WATCH_DOCUMENTS_SETTING, watch_documents
+
+        if not getattr(settings, WATCH_DOCUMENTS_SETTING, False):
+            return
+
+        # Documents are registered when their modules are imported (apps
+        # may be ready before `django_elasticsearch_dsl` autodiscovers them)
+        autodiscover_modules('documents')
+        watch_documents()
@@ -0,0 +1,246 @@
+"""
+Coalescing of identical concurrent searches (single-flight).
+
+During traffic spikes many workers send byte-identical searches at the
+same moment. Identical searches executed concurrently within a process wait
+for the one in-flight request and share its response. Optionally (see
+`CoalescingSearch.coalesce_cache`), searches are coalesced across processes
+by a lock held in the Django cache. Responses are shared only while the
+search is in-flight, thus results are never stale.
+"""
+
+import hashlib
+import json
+import threading
+import time
+
+from django.core.cache import caches
+
+from elasticsearch_dsl import Search
+
+__title__ = 'django_elasticsearch_dsl_drf.coalescing'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'CoalescingSearch',
+    'CoalescingSearchMixin',
+    'get_connection_key',
+    'get_search_key',
+    'SingleFlight',
+)
+
+
+class _Call(object):
+    """In-flight call."""
+
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Single-flight: concurrent calls with the same key are executed once.
+
+    Example:
+
+        >>> single_flight = SingleFlight()
+        >>> result, shared = single_flight.do('key', func)
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """Call the function, unless a call with the same key is in-flight.
+
+        In the latter case, wait for the in-flight call and share its
+        result (or exception).
+
+        :param key: Key of the call.
+        :param func: Function (without arguments).
+        :type key: str
+        :type func: callable
+        :return: Tuple of the result and a flag telling whether the result
+            of another call was shared.
+        :rtype: tuple
+        """
+        with self._lock:
+            __call = self._calls.get(key)
+            __leader = __call is None
+            if __leader:
+                __call = self._calls[key] = _Call()
+
+        if not __leader:
+            __call.event.wait()
+            if __call.error is not None:
+                raise __call.error
+            return __call.result, True
+
+        try:
+            __call.result = func()
+        except Exception as err:
+            __call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            __call.event.set()
+
+        return __call.result, False
+
+
+# Searches in-flight within the current process
+SINGLE_FLIGHT = SingleFlight()
+
+
+def get_connection_key(using):
+    """Get key of the connection.
+
+    :param using: Connection alias or client.
+    :type using: str or elasticsearch.Elasticsearch
+    :return: Connection alias or hosts of the client.
+    :rtype: str
+    """
+    if isinstance(using, str):
+        return using
+    return json.dumps(
+        getattr(getattr(using, 'transport', None), 'hosts', None),
+        sort_keys=True,
+        default=str
+    )
+
+
+def get_search_key(search):
+    """Get key of the search.
+
+    Searches sent to the same cluster and indexes, having the same body and
+    params, share the key.
+
+    :param search: Search.
+    :type search: elasticsearch_dsl.Search
+    :return: Key.
+    :rtype: str
+    """
+    return hashlib.sha1(
+        json.dumps(
+            [
+                get_connection_key(search._using),
+                search._index,
+                search.to_dict(),
+                search._params,
+            ],
+            sort_keys=True,
+            default=str
+        ).encode('utf-8')
+    ).hexdigest()
+
+
+class CoalescingSearchMixin(object):
+    """Coalescing search mixin.
+
+    Identical searches executed concurrently share the response of a
+    single request.
+
+    If `coalesce_cache` (a Django cache alias) is given, searches are
+    coalesced across processes as well: the first process executing the
+    search holds a lock in the cache, others poll the cache for the
+    response (kept for `coalesce_result_timeout` seconds) until the lock
+    is released, then execute the search themselves if no response is
+    found. The lock expires after `coalesce_timeout` seconds.
+    """
+
+    coalesce_cache = None
+
+    coalesce_timeout = 5
+
+    coalesce_result_timeout = 1
+
+    coalesce_poll_interval = 0.01
+
+    coalesce_key_prefix = 'django_elasticsearch_dsl_drf.coalescing'
+
+    def _execute_raw_single(self):
+        """Execute the search (not coalesced).
+
+        :return: Raw response.
+        :rtype: dict
+        """
+        return super(CoalescingSearchMixin, self).execute(
+            ignore_cache=True
+        ).to_dict()
+
+    def _execute_raw_shared(self, key):
+        """Execute the search coalesced across processes.
+
+        :param key: Key of the search.
+        :type key: str
+        :return: Raw response.
+        :rtype: dict
+        """
+        __cache = caches[self.coalesce_cache]
+        __lock_key = '{}.lock.{}'.format(self.coalesce_key_prefix, key)
+        __result_key = '{}.result.{}'.format(self.coalesce_key_prefix, key)
+
+        __deadline = time.monotonic() + self.coalesce_timeout
+        while not __cache.add(__lock_key, 1, self.coalesce_timeout):
+            __raw = __cache.get(__result_key)
+            if __raw is not None:
+                return __raw
+            if time.monotonic() > __deadline:
+                return self._execute_raw_single()
+            time.sleep(self.coalesce_poll_interval)
+
+        try:
+            __raw = self._execute_raw_single()
+            __cache.set(__result_key, __raw, self.coalesce_result_timeout)
+        finally:
+            __cache.delete(__lock_key)
+        return __raw
+
+    def execute(self, ignore_cache=False):
+        """Execute the search, coalesced with identical concurrent searches.
+
+        :param ignore_cache: If set to True, response of the previous
+            execution of this search is ignored.
+        :type ignore_cache: bool
+        :return:
+        :rtype: elasticsearch_dsl.response.Response
+        """
+        if ignore_cache or not hasattr(self, '_response'):
+            __key = get_search_key(self)
+            if self.coalesce_cache is None:
+                __raw = SINGLE_FLIGHT.do(
+                    __key,
+                    self._execute_raw_single
+                )[0]
+            else:
+                __raw = SINGLE_FLIGHT.do(
+                    __key,
+                    lambda: self._execute_raw_shared(__key)
+                )[0]
+            self._response = self._response_class(self, __raw)
+        return self._response
+
+
+class CoalescingSearch(CoalescingSearchMixin, Search):
+    """Coalescing search.
+
+    Example:
+
+        >>> from django_elasticsearch_dsl_drf.coalescing import (
+        >>>     CoalescingSearch
+        >>> )
+        >>> from django_elasticsearch_dsl_drf.viewsets import (
+        >>>     DocumentViewSet
+        >>> )
+        >>>
+        >>> class BookDocumentViewSet(DocumentViewSet):
+        >>>
+        >>>     document = BookDocument
+        >>>     search_class = CoalescingSearch
+    """
@@ -20,6 +20,16 @@ try:
 except ImportError:
     coreschema = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
 # try:
 #     from rest_framework.pagination import _get_count
 # except ImportError:
@@ -34,7 +44,9 @@ __all__ = (
     'coreschema',
     # 'get_count',
     'KeywordField',
+    'orjson',
     'StringField',
+    'ujson',
 )
 
 
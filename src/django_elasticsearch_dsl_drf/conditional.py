@@ -0,0 +1,183 @@
+"""
+Conditional GET.
+
+Search responses can't change unless the index changes. Every index has a
+generation (the time of the last change), stored in the Django cache and
+bumped when the models indexed (or their related models) are saved or
+deleted, or when the index is (re-)indexed. ETags are derived from the
+normalised request and the generation, thus conditional requests are
+answered without touching Elasticsearch.
+
+Receivers are connected for all registered documents when the app is ready
+if the `ELASTICSEARCH_DSL_DRF_WATCH_DOCUMENTS` setting is True (see
+`django_elasticsearch_dsl_drf.apps`), thus in every process saving the
+models (web workers, admin, management commands, task workers). It's off by
+default, since every save of the indexed (and related) models then writes
+to the cache.
+
+The cache shall be shared by the processes (for instance, Redis or
+Memcached), otherwise changes made in one process are not seen by others.
+"""
+
+import hashlib
+import json
+import time
+
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+
+from django_elasticsearch_dsl.registries import registry
+
+from .utils import Registry
+
+__title__ = 'django_elasticsearch_dsl_drf.conditional'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'bump_index_generation',
+    'get_etag',
+    'get_index_generation',
+    'watch_document',
+    'watch_documents',
+)
+
+# Cache holding the index generations
+GENERATION_CACHE = 'default'
+
+# Setting enabling watching the documents when the app is ready
+WATCH_DOCUMENTS_SETTING = 'ELASTICSEARCH_DSL_DRF_WATCH_DOCUMENTS'
+
+GENERATION_KEY_PREFIX = 'django_elasticsearch_dsl_drf.conditional'
+
+# Indexes changing with the models, key is the model
+WATCHED_MODELS = Registry()
+
+
+def _get_generation_key(index):
+    return '{}.{}'.format(GENERATION_KEY_PREFIX, index)
+
+
+def get_index_generation(index):
+    """Get generation of the index.
+
+    :param index: Index name.
+    :type index: str
+    :return: Time of the last change of the index (Unix timestamp). If
+        unknown (for instance, the cache is cleared), the current time.
+    :rtype: float
+    """
+    __cache = caches[GENERATION_CACHE]
+    __key = _get_generation_key(index)
+    __generation = __cache.get(__key)
+    if __generation is None:
+        __generation = time.time()
+        if not __cache.add(__key, __generation, None):
+            __generation = __cache.get(__key, __generation)
+    return __generation
+
+
+def bump_index_generation(index):
+    """Bump generation of the index (shall be called when it changes).
+
+    :param index: Index name.
+    :type index: str
+    """
+    caches[GENERATION_CACHE].set(
+        _get_generation_key(index),
+        time.time(),
+        None
+    )
+
+
+def _bump_index_generations(sender, **kwargs):
+    """Bump generations of the indexes changing with the model.
+
+    :param sender: Django model.
+    """
+    for __index in WATCHED_MODELS.get(sender, ()):
+        bump_index_generation(__index)
+
+
+def watch_document(document, models=None):
+    """Bump generation of the index of the document when the model (or the
+    related models) of the document are saved or deleted.
+
+    Shall be called when the app is ready (`AppConfig.ready`), so that
+    receivers are connected in every process.
+
+    :param document: Document class.
+    :param models: Other models changes of which change the index (for
+        instance, models indexed as nested fields, which are not declared
+        as `related_models` of the document).
+    :type document: django_elasticsearch_dsl.Document
+    :type models: list
+    """
+    __index = document._index._name
+    __models = [document.Django.model]
+    __models.extend(getattr(document.django, 'related_models', []))
+    __models.extend(models or [])
+    for __model in __models:
+        if __index in WATCHED_MODELS.get(__model, ()):
+            continue
+
+        with WATCHED_MODELS.lock:
+            __uid = '{}.{}'.format(GENERATION_KEY_PREFIX, __model._meta.label)
+            post_save.connect(
+                _bump_index_generations,
+                sender=__model,
+                dispatch_uid=__uid
+            )
+            post_delete.connect(
+                _bump_index_generations,
+                sender=__model,
+                dispatch_uid=__uid
+            )
+            WATCHED_MODELS[__model] = \
+                WATCHED_MODELS.get(__model, frozenset()) | {__index}
+
+
+def get_etag(request, generation, *args):
+    """Get ETag of the response to the request.
+
+    Derived from the path, the query params (sorted by name), the format of
+    the response, the user and the generation given.
+
+    :param request: Django REST framework request.
+    :param generation: Index generation.
+    :param args: Other values the response depends on.
+    :type request: rest_framework.request.Request
+    :type generation: float
+    :return: Quoted ETag.
+    :rtype: str
+    """
+    __user = getattr(request, 'user', None)
+    __renderer = getattr(request, 'accepted_renderer', None)
+    return '"{}"'.format(
+        hashlib.sha1(
+            json.dumps(
+                [
+                    request.path,
+                    sorted(request.query_params.lists()),
+                    getattr(__renderer, 'format', None),
+                    getattr(__user, 'pk', None),
+                    generation,
+                ] + list(args),
+                default=str
+            ).encode('utf-8')
+        ).hexdigest()
+    )
+
+
+def watch_documents(documents=None):
+    """Bump generations of the indexes when the models of the documents
+    (or their related models) are saved or deleted.
+
+    :param documents: Document classes. If not given, all documents
+        registered with `django_elasticsearch_dsl` are watched.
+    :type documents: iterable
+    """
+    if documents is None:
+        documents = registry.get_documents()
+    for __document in documents:
+        watch_document(__document)
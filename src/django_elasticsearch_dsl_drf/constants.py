@@ -12,6 +12,7 @@ __all__ = (
     'ALL_GEO_SPATIAL_LOOKUP_FILTERS_AND_QUERIES',
     'ALL_LOOKUP_FILTERS_AND_QUERIES',
     'ALL_SUGGESTERS',
+    'COLLAPSE_COUNT_AGGREGATION',
     'DEFAULT_MATCHING_OPTION',
     'EXTENDED_NUMBER_LOOKUP_FILTERS',
     'EXTENDED_STRING_LOOKUP_FILTERS',
@@ -20,7 +21,14 @@ __all__ = (
     'FUNCTIONAL_SUGGESTER_COMPLETION_PREFIX',
     'FUNCTIONAL_SUGGESTER_PHRASE_MATCH',
     'FUNCTIONAL_SUGGESTER_TERM_MATCH',
+    'GEOJSON_DEPTHS',
     'GEO_DISTANCE_ORDERING_PARAM',
+    'GEO_ENCODING_GEOJSON_PREFIX',
+    'GEO_ENCODING_POLYLINE_PREFIX',
+    'GEO_GRID_AGGREGATION_GEOHASH',
+    'GEO_GRID_AGGREGATION_GEOTILE',
+    'GEO_MAX_VERTICES',
+    'LOOKUP_AGGREGATION_GEO_GRID',
     'LOOKUP_FILTER_EXISTS',
     'LOOKUP_FILTER_GEO_BOUNDING_BOX',
     'LOOKUP_FILTER_GEO_DISTANCE',
@@ -47,6 +55,7 @@ __all__ = (
     'MATCHING_OPTIONS',
     'NUMBER_LOOKUP_FILTERS',
     'SEARCH_QUERY_PARAM',
+    'SEARCH_TEMPLATE_BODY_KEYS',
     'SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE',
     'SEPARATOR_LOOKUP_COMPLEX_VALUE',
     'SEPARATOR_LOOKUP_FILTER',
@@ -55,6 +64,10 @@ __all__ = (
     'SUGGESTER_COMPLETION',
     'SUGGESTER_PHRASE',
     'SUGGESTER_TERM',
+    'TERMS_LOOKUP_INDEX',
+    'TERMS_LOOKUP_THRESHOLD',
+    'TERMS_LOOKUP_TTL',
+    'TERMS_MAX_VALUES',
     'TRUE_VALUES',
 )
 
@@ -116,6 +129,50 @@ SEARCH_QUERY_PARAM = 'q'
 # Geo distance ordering param
 GEO_DISTANCE_ORDERING_PARAM = 'ordering'
 
+# Prefix of the encoded polyline values of geo-spatial lookups.
+# Example: /api/articles/?location__geo_polygon=polyline:_p~iF~ps|U_ulLnnqC
+GEO_ENCODING_POLYLINE_PREFIX = 'polyline:'
+
+# Prefix of the GeoJSON values of geo-spatial lookups (values starting with
+# `{` are treated as GeoJSON as well).
+# Example: /api/articles/?location__geo_shape=geojson:{"type":"Point",...}
+GEO_ENCODING_GEOJSON_PREFIX = 'geojson:'
+
+# Nesting depth of the coordinates of the GeoJSON geometries (1 for a
+# single point), by lower-cased geometry type.
+GEOJSON_DEPTHS = {
+    'point': 1,
+    'multipoint': 2,
+    'linestring': 2,
+    'polygon': 3,
+    'multilinestring': 3,
+    'multipolygon': 4,
+}
+
+# Maximum number of vertices accepted in geo-spatial lookups. Can be
+# overridden per field using the `max_vertices` option of the
+# `geo_spatial_filter_fields`.
+GEO_MAX_VERTICES = 10000
+
+# Maximum number of values accepted in the `in` and `exclude` lookups
+# (`index.max_terms_count` of Elasticsearch). Can be overridden per field
+# using the `max_values` option of the `filter_fields`.
+TERMS_MAX_VALUES = 65536
+
+# Number of values of the `in` and `exclude` lookups, above which the
+# values are stored in a document of the `TERMS_LOOKUP_INDEX` and referenced
+# by a terms lookup (thus searches write to Elasticsearch). Disabled if None.
+# Can be overridden per field using the `terms_lookup_threshold` option of
+# the `filter_fields`.
+TERMS_LOOKUP_THRESHOLD = None
+
+# Name of the index holding the values of the terms lookups.
+TERMS_LOOKUP_INDEX = 'django_elasticsearch_dsl_drf_terms_lookup'
+
+# Time (in seconds) the values of the terms lookups are kept (see
+# `django_elasticsearch_dsl_drf.terms_lookup.delete_expired_terms_lookups`).
+TERMS_LOOKUP_TTL = 86400
+
 # ****************************************************************************
 # ************************ Native lookup filters/queries *********************
 # ****************************************************************************
@@ -438,6 +495,67 @@ SUGGESTER_PHRASE = 'phrase'
 # http://127.0.0.1:8000/search/books/?title_suggest__completion=Lore
 SUGGESTER_COMPLETION = 'completion'
 
+# ****************************************************************************
+# ******************************** Collapse **********************************
+# ****************************************************************************
+
+# Name of the `cardinality` aggregation holding the number of collapsed
+# results. Used by paginators instead of `hits.total`.
+COLLAPSE_COUNT_AGGREGATION = '_collapse_count'
+
+# ****************************************************************************
+# **************************** Search templates ******************************
+# ****************************************************************************
+
+# Keys of the search body, which are passed to the stored search template
+# as params (along with the `query` of the other filter backends). Searches
+# having other keys in the body are executed as they are.
+SEARCH_TEMPLATE_BODY_KEYS = (
+    '_source',
+    'aggs',
+    'collapse',
+    'docvalue_fields',
+    'explain',
+    'from',
+    'highlight',
+    'indices_boost',
+    'min_score',
+    'post_filter',
+    'rescore',
+    'script_fields',
+    'search_after',
+    'seq_no_primary_term',
+    'size',
+    'sort',
+    'stored_fields',
+    'suggest',
+    'terminate_after',
+    'timeout',
+    'track_scores',
+    'track_total_hits',
+    'version',
+)
+
+# ****************************************************************************
+# ************************** Geo grid aggregations ***************************
+# ****************************************************************************
+
+# The `geo_grid` aggregation lookup. Accepts the viewport (top-left and
+# bottom-right corners) and the zoom level.
+# Example: /search/publishers/geo_grid/
+#          ?location__geo_grid=48.98,6.37__48.90,6.47__zoom,12
+LOOKUP_AGGREGATION_GEO_GRID = 'geo_grid'
+
+# The `geotile_grid` aggregation (precision matches the map zoom level)
+# https://www.elastic.co/guide/en/elasticsearch/reference/current/
+# search-aggregations-bucket-geotilegrid-aggregation.html
+GEO_GRID_AGGREGATION_GEOTILE = 'geotile_grid'
+
+# The `geohash_grid` aggregation
+# https://www.elastic.co/guide/en/elasticsearch/reference/current/
+# search-aggregations-bucket-geohashgrid-aggregation.html
+GEO_GRID_AGGREGATION_GEOHASH = 'geohash_grid'
+
 # ****************************************************************************
 # ********************** Functional suggestions filters **********************
 # ****************************************************************************
@@ -0,0 +1,104 @@
+"""
+Facets.
+"""
+
+from elasticsearch_dsl import A
+from elasticsearch_dsl.faceted_search import Facet
+from elasticsearch_dsl.query import Terms
+
+__title__ = 'django_elasticsearch_dsl_drf.facets'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = ('CompositeTermsFacet',)
+
+
+class CompositeTermsFacet(Facet):
+    """Terms facet backed by the `composite` aggregation.
+
+    Unlike the `TermsFacet`, which returns at most `size` most frequent
+    terms, the `CompositeTermsFacet` allows to page through all of the
+    terms (sorted by value), `size` buckets at a time. The `after_key`
+    of the response shall be passed back (see the
+    `faceted_search_after_param` of the `FacetedSearchFilterBackend`) to get
+    the next page of buckets.
+
+    Example:
+
+        >>> faceted_search_fields = {
+        >>>     'author': {
+        >>>         'field': 'author.raw',
+        >>>         'facet': CompositeTermsFacet,
+        >>>         'options': {
+        >>>             'size': 100,
+        >>>         },
+        >>>     },
+        >>> }
+
+    Example query (next page of author facet buckets):
+
+        /search/books/?facet=author&facet_after=author:Jones
+    """
+
+    agg_type = 'composite'
+
+    # Name of the (single) composite source
+    source_name = 'value'
+
+    default_size = 100
+
+    # Upper limit of the `size`, to keep memory usage bounded on both
+    # the Elasticsearch and Python sides.
+    max_size = 1000
+
+    def __init__(self, size=None, after=None, order='asc',
+                 missing_bucket=False, **kwargs):
+        self.size = min(size or self.default_size, self.max_size)
+        self.after = after
+        self.order = order
+        self.missing_bucket = missing_bucket
+        super(CompositeTermsFacet, self).__init__(**kwargs)
+
+    def get_aggregation(self):
+        """Return the aggregation object.
+
+        :return:
+        """
+        __source = {
+            'field': self._params['field'],
+            'order': self.order,
+        }
+        if self.missing_bucket:
+            __source['missing_bucket'] = True
+
+        __params = {
+            'sources': [{self.source_name: {'terms': __source}}],
+            'size': self.size,
+        }
+        if self.after is not None:
+            __params['after'] = {self.source_name: self.after}
+
+        __agg = A(self.agg_type, **__params)
+        if self._metric:
+            __agg.metric('metric', self._metric)
+        return __agg
+
+    def add_filter(self, filter_values):
+        """Create a terms filter.
+
+        :param filter_values:
+        :return:
+        """
+        if filter_values:
+            return Terms(
+                _expand__to_dot=False,
+                **{self._params['field']: filter_values}
+            )
+
+    def get_value(self, bucket):
+        """Return a value representing a bucket.
+
+        :param bucket:
+        :return:
+        """
+        return bucket['key'][self.source_name]
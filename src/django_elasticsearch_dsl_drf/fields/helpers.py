@@ -3,6 +3,8 @@ Helpers.
 """
 from elasticsearch_dsl.utils import AttrDict, AttrList
 
+from ..utils import ResponseProxy
+
 __title__ = 'django_elasticsearch_dsl_drf.fields.helpers'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
 __copyright__ = '2017-2020 Artur Barseghyan'
@@ -12,7 +14,7 @@ __all__ = ('to_representation',)
 
 def to_representation(value):
     """To representation."""
-    if isinstance(value, AttrDict):
+    if isinstance(value, (AttrDict, ResponseProxy)):
         return value.to_dict()
     if isinstance(value, AttrList):
         _value = [to_representation(__v) for __v in value]
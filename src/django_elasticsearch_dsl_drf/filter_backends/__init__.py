@@ -2,6 +2,8 @@
 All filter backends.
 """
 
+from .aggregations import GeoGridAggregationBackend
+from .collapse import CollapseBackend
 from .faceted_search import (
     FacetedSearchFilterBackend,
     FacetedFilterSearchFilterBackend
@@ -22,7 +24,9 @@ from .search import (
     BaseSearchFilterBackend,
     CompoundSearchFilterBackend,
     MultiMatchSearchFilterBackend,
+    RescoreBackend,
     SearchFilterBackend,
+    SearchTemplateBackend,
     SimpleQueryStringSearchFilterBackend,
 )
 from .source import SourceBackend
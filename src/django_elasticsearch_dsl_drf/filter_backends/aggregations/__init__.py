@@ -1,17 +1,17 @@
-# """
-# Aggregations filtering backends.
-# """
-#
-# from .bucket_aggregations import *
+"""
+Aggregations filtering backends.
+"""
+
+from .bucket_aggregations import GeoGridAggregationBackend
 # from .metrics_aggregations import *
 # from .pipeline_aggregations import *
-#
-# __title__ = 'django_elasticsearch_dsl_drf.filter_backends.suggester'
-# __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
-# __copyright__ = '2017-2020 Artur Barseghyan'
-# __license__ = 'GPL 2.0/LGPL 2.1'
-# __all__ = (
-#     'BucketAggregationsFilterBackend',
-#     'MetricsAggregationsFilterBackend',
-#     'PipelineAggregationsFilterBackend',
-# )
+
+__title__ = 'django_elasticsearch_dsl_drf.filter_backends.aggregations'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'GeoGridAggregationBackend',
+    # 'MetricsAggregationsFilterBackend',
+    # 'PipelineAggregationsFilterBackend',
+)
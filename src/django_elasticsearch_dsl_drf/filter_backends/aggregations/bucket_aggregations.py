@@ -0,0 +1,296 @@
+"""
+Bucket aggregations filter backends.
+"""
+
+from elasticsearch_dsl.query import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from six import string_types
+
+from ...constants import (
+    GEO_GRID_AGGREGATION_GEOHASH,
+    GEO_GRID_AGGREGATION_GEOTILE,
+    LOOKUP_AGGREGATION_GEO_GRID,
+)
+from ..filtering.geo_spatial import GeoSpatialFilteringFilterBackend
+from ..mixins import FilterBackendMixin
+from ...query_params import get_query_params
+from ...versions import ELASTICSEARCH_GTE_7_0
+
+__title__ = (
+    'django_elasticsearch_dsl_drf.filter_backends.aggregations.'
+    'bucket_aggregations'
+)
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = ('GeoGridAggregationBackend',)
+
+
+class GeoGridAggregationBackend(BaseFilterBackend, FilterBackendMixin):
+    """Geo grid (`geotile_grid` or `geohash_grid`) aggregation backend.
+
+    Aggregates documents within the map viewport (bounding box) into grid
+    cells, matching the zoom level given. Each bucket gets a `geo_centroid`
+    sub-aggregation, so that clusters can be drawn at the centre of the
+    documents they hold instead of at the centre of the cell.
+
+    Use together with the `GeoGridMixin` (`geo_grid` action), which
+    executes the search with `size=0` and returns compact buckets only.
+    Malformed `geo_grid` lookup values give a validation error (400).
+
+    The `geotile_grid` aggregation requires Elasticsearch 7, thus the
+    `geohash_grid` is used by default with older versions.
+
+    Example:
+
+        >>> from django_elasticsearch_dsl_drf.constants import (
+        >>>     GEO_GRID_AGGREGATION_GEOHASH,
+        >>> )
+        >>> from django_elasticsearch_dsl_drf.filter_backends import (
+        >>>     GeoGridAggregationBackend
+        >>> )
+        >>> from django_elasticsearch_dsl_drf.viewsets import (
+        >>>     BaseDocumentViewSet,
+        >>>     GeoGridMixin,
+        >>> )
+        >>>
+        >>> # Local publisher document definition
+        >>> from .documents import PublisherDocument
+        >>>
+        >>> # Local publisher document serializer
+        >>> from .serializers import PublisherDocumentSerializer
+        >>>
+        >>> class PublisherDocumentView(BaseDocumentViewSet, GeoGridMixin):
+        >>>
+        >>>     document = PublisherDocument
+        >>>     serializer_class = PublisherDocumentSerializer
+        >>>     filter_backends = [GeoGridAggregationBackend,]
+        >>>     geo_grid_aggregation_fields = {
+        >>>         'location': None,  # Uses the default aggregation
+        >>>         'location_hash': {
+        >>>             'field': 'location',
+        >>>             'aggregation': GEO_GRID_AGGREGATION_GEOHASH,
+        >>>             'size': 1000,
+        >>>         },
+        >>>     }
+
+    Example query (viewport top-left and bottom-right corners, zoom level):
+
+        /search/publishers/geo_grid/
+            ?location__geo_grid=48.98,6.37__48.90,6.47__zoom,12
+
+    Response:
+
+        {
+            "location": [
+                {
+                    "key": "12/2120/1405",
+                    "count": 12,
+                    "lat": 48.94,
+                    "lon": 6.41
+                }
+            ]
+        }
+    """
+
+    # Prefix of the aggregation names, used to pick the geo grid
+    # aggregations from the response.
+    aggregation_prefix = '_geo_grid_'
+
+    # Default aggregation type. If not given, `geotile_grid` is used with
+    # Elasticsearch 7 (and later) and `geohash_grid` with older versions.
+    default_aggregation = None
+
+    # Default number of buckets returned
+    default_size = 10000
+
+    # Approximate `geohash_grid` precision per zoom level (index)
+    geohash_precision_per_zoom = (
+        1, 1, 1, 2, 2, 3, 3, 3, 4, 4, 5, 5, 5, 6, 6, 7, 7, 7, 8, 8, 9,
+    )
+
+    @classmethod
+    def prepare_geo_grid_aggregation_fields(cls, view):
+        """Prepare geo grid aggregation fields.
+
+        :param view:
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :return: Geo grid aggregation fields options.
+        :rtype: dict
+        """
+        fields = {}
+        for field, options in view.geo_grid_aggregation_fields.items():
+            if options is None or isinstance(options, string_types):
+                options = {'field': options or field}
+            else:
+                options = dict(options)
+                options.setdefault('field', field)
+
+            options.setdefault(
+                'aggregation',
+                cls.default_aggregation or (
+                    GEO_GRID_AGGREGATION_GEOTILE
+                    if ELASTICSEARCH_GTE_7_0
+                    else GEO_GRID_AGGREGATION_GEOHASH
+                )
+            )
+            options.setdefault('size', cls.default_size)
+            options.setdefault('precision_offset', 0)
+            fields[field] = options
+
+        return fields
+
+    @classmethod
+    def get_precision(cls, aggregation, zoom, precision_offset=0):
+        """Get grid precision for the zoom level given.
+
+        :param aggregation: Aggregation type.
+        :param zoom: Map zoom level.
+        :param precision_offset: Number of zoom levels to add (finer grid)
+            or subtract (coarser grid).
+        :type aggregation: str
+        :type zoom: int
+        :type precision_offset: int
+        :return: Precision.
+        :rtype: int
+        """
+        zoom = max(0, zoom + precision_offset)
+        if aggregation == GEO_GRID_AGGREGATION_GEOHASH:
+            return cls.geohash_precision_per_zoom[
+                min(zoom, len(cls.geohash_precision_per_zoom) - 1)
+            ]
+        return min(zoom, 29)
+
+    @classmethod
+    def get_geo_grid_params(cls, value):
+        """Get bounding box and zoom of the `geo_grid` lookup value.
+
+        :param value:
+        :type value: str
+        :return: Bounding box points (`[lat, lon]`) and zoom level.
+        :rtype: tuple
+        :raise ValueError: On malformed or out of range values.
+        """
+        points, options = GeoSpatialFilteringFilterBackend.get_geo_points(
+            value,
+            ('zoom',),
+            max_vertices=2
+        )
+        if len(points) != 2:
+            raise ValueError(
+                "Bounding box requires two points (top left and bottom right)"
+            )
+
+        zoom = int(options.get('zoom', 0))
+        if zoom < 0:
+            raise ValueError("Zoom level shall not be negative")
+
+        return points, zoom
+
+    @classmethod
+    def get_geo_grid_buckets(cls, aggregations):
+        """Get compact geo grid buckets from the response aggregations.
+
+        :param aggregations: Response aggregations.
+        :type aggregations: dict
+        :return: Buckets per field.
+        :rtype: dict
+        """
+        buckets = {}
+        for name, aggregation in aggregations.items():
+            if not name.startswith(cls.aggregation_prefix):
+                continue
+            field = name[len(cls.aggregation_prefix):]
+            buckets[field] = []
+            for bucket in aggregation['buckets']:
+                location = bucket['centroid'].get('location', {})
+                buckets[field].append({
+                    'key': bucket['key'],
+                    'count': bucket['doc_count'],
+                    'lat': location.get('lat'),
+                    'lon': location.get('lon'),
+                })
+        return buckets
+
+    def get_geo_grid_query_params(self, request, view):
+        """Get geo grid query params.
+
+        :param request: Django REST framework request.
+        :param view: View.
+        :type request: rest_framework.request.Request
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :return: Options per field.
+        :rtype: dict
+        :raise rest_framework.exceptions.ValidationError: On malformed (or
+            out of range) values.
+        """
+        fields = self.prepare_geo_grid_aggregation_fields(view)
+        params = {}
+        for query_param, field_name, lookup_param, values \
+                in get_query_params(request):
+            if (
+                lookup_param != LOOKUP_AGGREGATION_GEO_GRID
+                or field_name not in fields
+                or not values
+            ):
+                continue
+
+            try:
+                points, zoom = self.get_geo_grid_params(values[-1])
+            except ValueError as err:
+                raise ValidationError(str(err))
+
+            params[field_name] = dict(
+                fields[field_name],
+                points=points,
+                zoom=zoom
+            )
+
+        return params
+
+    def filter_queryset(self, request, queryset, view):
+        """Filter the queryset.
+
+        :param request: Django REST framework request.
+        :param queryset: Base queryset.
+        :param view: View.
+        :type request: rest_framework.request.Request
+        :type queryset: elasticsearch_dsl.search.Search
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :return: Updated queryset.
+        :rtype: elasticsearch_dsl.search.Search
+        """
+        for name, options in self.get_geo_grid_query_params(
+            request, view
+        ).items():
+            (top, left), (bottom, right) = options['points']
+            queryset = queryset.filter(
+                Q(
+                    'geo_bounding_box',
+                    **{
+                        options['field']: {
+                            'top_left': {'lat': top, 'lon': left},
+                            'bottom_right': {'lat': bottom, 'lon': right},
+                        }
+                    }
+                )
+            )
+            queryset.aggs.bucket(
+                self.aggregation_prefix + name,
+                options['aggregation'],
+                field=options['field'],
+                precision=self.get_precision(
+                    options['aggregation'],
+                    options['zoom'],
+                    options['precision_offset']
+                ),
+                size=options['size']
+            ).metric(
+                'centroid',
+                'geo_centroid',
+                field=options['field']
+            )
+
+        return queryset
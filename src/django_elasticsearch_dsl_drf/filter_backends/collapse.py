@@ -0,0 +1,164 @@
+"""
+Collapse backend.
+"""
+import copy
+
+from rest_framework.filters import BaseFilterBackend
+
+from six import string_types
+
+from ..constants import COLLAPSE_COUNT_AGGREGATION
+from ..query_params import get_query_params
+
+__title__ = 'django_elasticsearch_dsl_drf.collapse'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = ('CollapseBackend',)
+
+
+class CollapseBackend(BaseFilterBackend):
+    """Collapse (field collapsing) backend.
+
+    Collapses search results on the given (`keyword` or numeric) field,
+    so that only the top hit per distinct value is returned. Other hits of
+    the same group can be returned using `inner_hits`.
+
+    Example:
+
+        >>> from django_elasticsearch_dsl_drf.filter_backends import (
+        >>>     CollapseBackend
+        >>> )
+        >>> from django_elasticsearch_dsl_drf.viewsets import (
+        >>>     BaseDocumentViewSet,
+        >>> )
+        >>>
+        >>> # Local book document definition
+        >>> from .documents import BookDocument
+        >>>
+        >>> # Local book document serializer
+        >>> from .serializers import BookDocumentSerializer
+        >>>
+        >>> class BookDocumentView(BaseDocumentViewSet):
+        >>>
+        >>>     document = BookDocument
+        >>>     serializer_class = BookDocumentSerializer
+        >>>     filter_backends = [CollapseBackend,]
+        >>>     collapse_fields = {
+        >>>         'work': 'work_id',
+        >>>         'publisher': {
+        >>>             'field': 'publisher.raw',
+        >>>             'inner_hits': {
+        >>>                 'name': 'editions',
+        >>>                 'size': 3,
+        >>>             },
+        >>>             'enabled': False,
+        >>>         },
+        >>>     }
+
+    Collapsing is enabled either in the field options (`enabled` set to
+    True) or via query params `?collapse=publisher`. Only one field can
+    be collapsed on.
+
+    Paginators count collapsed results using the `cardinality`
+    aggregation (approximate for very large numbers of distinct values,
+    see the `precision_threshold` option), since `hits.total` counts the
+    hits before collapsing.
+    """
+
+    collapse_param = 'collapse'
+
+    @classmethod
+    def prepare_collapse_fields(cls, view):
+        """Prepare collapse fields.
+
+        Prepares the following structure:
+
+            >>> {
+            >>>     'work': {
+            >>>         'field': 'work_id',
+            >>>         'enabled': False,
+            >>>         'inner_hits': None,
+            >>>         'precision_threshold': None,
+            >>>     },
+            >>> }
+
+        :param view:
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :return: Collapse fields options.
+        :rtype: dict
+        """
+        collapse_fields = copy.deepcopy(view.collapse_fields)
+
+        for field, options in collapse_fields.items():
+            if options is None or isinstance(options, string_types):
+                collapse_fields[field] = {
+                    'field': options or field
+                }
+            elif 'field' not in collapse_fields[field]:
+                collapse_fields[field]['field'] = field
+
+            collapse_fields[field].setdefault('enabled', False)
+            collapse_fields[field].setdefault('inner_hits', None)
+            collapse_fields[field].setdefault('precision_threshold', None)
+
+        return collapse_fields
+
+    def get_collapse_query_params(self, request):
+        """Get collapse query params.
+
+        :param request: Django REST framework request.
+        :type request: rest_framework.request.Request
+        :return: List of collapse query params.
+        :rtype: list
+        """
+        return get_query_params(request).getlist(self.collapse_param)
+
+    def filter_queryset(self, request, queryset, view):
+        """Filter the queryset.
+
+        :param request: Django REST framework request.
+        :param queryset: Base queryset.
+        :param view: View.
+        :type request: rest_framework.request.Request
+        :type queryset: elasticsearch_dsl.search.Search
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :return: Updated queryset.
+        :rtype: elasticsearch_dsl.search.Search
+        """
+        collapse_query_params = self.get_collapse_query_params(request)
+        collapse_fields = self.prepare_collapse_fields(view)
+
+        # Elasticsearch supports collapsing on a single field only. Field
+        # given in query params takes precedence over the enabled ones.
+        __options = None
+        for __field in collapse_query_params:
+            if __field in collapse_fields:
+                __options = collapse_fields[__field]
+                break
+        else:
+            for __field_options in collapse_fields.values():
+                if __field_options['enabled']:
+                    __options = __field_options
+                    break
+
+        if __options is None:
+            return queryset
+
+        __collapse = {'field': __options['field']}
+        if __options['inner_hits']:
+            __collapse['inner_hits'] = __options['inner_hits']
+        queryset = queryset.extra(collapse=__collapse)
+
+        # Number of collapsed results (used by paginators)
+        __cardinality = {'field': __options['field']}
+        if __options['precision_threshold'] is not None:
+            __cardinality['precision_threshold'] = \
+                __options['precision_threshold']
+        queryset.aggs.metric(
+            COLLAPSE_COUNT_AGGREGATION,
+            'cardinality',
+            **__cardinality
+        )
+
+        return queryset
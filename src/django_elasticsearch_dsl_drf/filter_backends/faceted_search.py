@@ -11,6 +11,10 @@ from rest_framework.filters import BaseFilterBackend
 
 from six import string_types, iteritems
 
+from ..constants import SEPARATOR_LOOKUP_NAME
+from ..facets import CompositeTermsFacet
+from ..query_params import get_query_params
+
 __title__ = 'django_elasticsearch_dsl_drf.faceted_search'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
 __copyright__ = '2017-2020 Artur Barseghyan'
@@ -70,9 +74,14 @@ class FacetedSearchFilterBackend(BaseFilterBackend):
     facets are disabled and enabled only explicitly either in the filter
     options (`enabled` set to True) or via query params
     `?facet=state&facet=date_published`.
+
+    For high-cardinality fields, use the `CompositeTermsFacet`. Its buckets
+    are paginated: pass the `after_key` value of the previous response
+    as `?facet_after=author:{after_key}` to get the next page.
     """
 
     faceted_search_param = 'facet'
+    faceted_search_after_param = 'facet_after'
 
     @classmethod
     def prepare_faceted_search_fields(cls, view):
@@ -133,8 +142,27 @@ class FacetedSearchFilterBackend(BaseFilterBackend):
         :return: List of search query params.
         :rtype: list
         """
-        query_params = request.query_params.copy()
-        return query_params.getlist(self.faceted_search_param, [])
+        return get_query_params(request).getlist(self.faceted_search_param)
+
+    def get_faceted_search_after_query_params(self, request):
+        """Get faceted search `after` query params.
+
+        Values are given as `{facet_name}:{after_key}`, for example
+        `?facet_after=author:Jones`.
+
+        :param request: Django REST framework request.
+        :type request: rest_framework.request.Request
+        :return: After keys per facet name.
+        :rtype: dict
+        """
+        __after = {}
+        for __value in get_query_params(request).getlist(
+            self.faceted_search_after_param
+        ):
+            __split = __value.split(SEPARATOR_LOOKUP_NAME, 1)
+            if len(__split) == 2:
+                __after[__split[0]] = __split[1]
+        return __after
 
     def construct_facets(self, request, view):
         """Construct facets.
@@ -171,15 +199,27 @@ class FacetedSearchFilterBackend(BaseFilterBackend):
         faceted_search_query_params = self.get_faceted_search_query_params(
             request
         )
+        faceted_search_after_query_params = \
+            self.get_faceted_search_after_query_params(request)
         faceted_search_fields = self.prepare_faceted_search_fields(view)
         for __field, __options in faceted_search_fields.items():
             if __field in faceted_search_query_params or __options['enabled']:
+                __facet_options = __options['options']
+                # Paginated (composite) facets
+                if (
+                    __field in faceted_search_after_query_params
+                    and issubclass(__options['facet'], CompositeTermsFacet)
+                ):
+                    __facet_options = dict(
+                        __facet_options,
+                        after=faceted_search_after_query_params[__field]
+                    )
                 __facets.update(
                     {
                         __field: {
                             'facet': faceted_search_fields[__field]['facet'](
                                 field=faceted_search_fields[__field]['field'],
-                                **faceted_search_fields[__field]['options']
+                                **__facet_options
                             ),
                             'global': faceted_search_fields[__field]['global'],
                         }
@@ -306,7 +346,8 @@ class FacetedFilterSearchFilterBackend(FilteringFilterBackend, FacetedSearchFilt
             agg_filter = Q('match_all')
             for f, _filter in filters.items():
                 # apply filters for that are applicable for facets other than this one
-                if agg.field == f or f not in faceted_fields:
+                if facet['facet']._params['field'] == f \
+                        or f not in faceted_fields:
                     continue
                 # combine with or
                 q = _filter[0]
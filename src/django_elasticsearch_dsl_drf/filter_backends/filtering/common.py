@@ -2,13 +2,11 @@
 Common filtering backend.
 """
 
-import operator
-
 from elasticsearch_dsl.query import Q
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import BaseFilterBackend
 from django_elasticsearch_dsl import fields
 
-import six
 from six import string_types
 
 from ...constants import (
@@ -31,8 +29,12 @@ from ...constants import (
     LOOKUP_QUERY_ENDSWITH,
     LOOKUP_QUERY_ISNULL,
     LOOKUP_QUERY_EXCLUDE,
+    TERMS_LOOKUP_THRESHOLD,
+    TERMS_MAX_VALUES,
 )
 from ..mixins import FilterBackendMixin
+from ...terms_lookup import get_terms_lookup
+from ...query_params import get_query_params
 
 from ...compat import coreapi, coreschema
 
@@ -471,6 +473,43 @@ class FilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
             args=[Q('wildcard', **{options['field']: '*{}'.format(value)})]
         )
 
+    @classmethod
+    def get_terms_values(cls, queryset, options, value):
+        """Get values of the `in` and `exclude` lookups.
+
+        If the number of values is above the `terms_lookup_threshold` of the
+        field, values are stored in a document and a terms lookup is
+        returned instead.
+
+        :param queryset: Original queryset.
+        :param options: Filter options.
+        :param value: value to filter on.
+        :type queryset: elasticsearch_dsl.search.Search
+        :type options: dict
+        :type value: str
+        :return: List of values or terms lookup.
+        :rtype: list|dict
+        :raise rest_framework.exceptions.ValidationError: If the number of
+            values is above the `max_values` of the field.
+        """
+        __values = cls.split_lookup_complex_value(value)
+
+        __max_values = options.get('max_values', TERMS_MAX_VALUES)
+        if __max_values is not None and len(__values) > __max_values:
+            raise ValidationError(
+                "Too many values ({}) given, at most {} allowed"
+                "".format(len(__values), __max_values)
+            )
+
+        __threshold = options.get(
+            'terms_lookup_threshold',
+            TERMS_LOOKUP_THRESHOLD
+        )
+        if __threshold is not None and len(__values) > __threshold:
+            return get_terms_lookup(__values, using=queryset._using)
+
+        return __values
+
     @classmethod
     def apply_query_in(cls, queryset, options, value):
         """Apply `in` functional query.
@@ -480,7 +519,9 @@ class FilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
             /endpoint/?field_name__in={value1}__{value2}
             /endpoint/?field_name__in={value1}
 
-        Note, that number of values is not limited.
+        Values are matched by a single (not scored) `terms` filter. Number
+        of values is limited by the `max_values` option of the field (see
+        also the `terms_lookup_threshold` option).
 
         Example:
 
@@ -495,21 +536,18 @@ class FilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
         :return: Modified queryset.
         :rtype: elasticsearch_dsl.search.Search
         """
-        __values = cls.split_lookup_complex_value(value)
-        __queries = []
-        for __value in __values:
-            __queries.append(
-                Q('term', **{options['field']: __value})
-            )
-
-        if __queries:
-            queryset = cls.apply_query(
-                queryset=queryset,
-                options=options,
-                args=[six.moves.reduce(operator.or_, __queries)]
-            )
-
-        return queryset
+        return cls.apply_filter(
+            queryset=queryset,
+            options=options,
+            args=['terms'],
+            kwargs={
+                options['field']: cls.get_terms_values(
+                    queryset,
+                    options,
+                    value
+                )
+            }
+        )
 
     @classmethod
     def apply_query_gt(cls, queryset, options, value):
@@ -678,7 +716,9 @@ class FilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
             /endpoint/?field_name__isnull={value1}__{value2}
             /endpoint/?field_name__exclude={valu1}
 
-        Note, that number of values is not limited.
+        Values are excluded by a single (not scored) `terms` filter. Number
+        of values is limited by the `max_values` option of the field (see
+        also the `terms_lookup_threshold` option).
 
         Example:
 
@@ -694,22 +734,22 @@ class FilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
         :return: Modified queryset.
         :rtype: elasticsearch_dsl.search.Search
         """
-        __values = cls.split_lookup_complex_value(value)
-
-        __queries = []
-        for __value in __values:
-            __queries.append(
-                ~Q('term', **{options['field']: __value})
-            )
-
-        if __queries:
-            queryset = cls.apply_query(
-                queryset=queryset,
-                options=options,
-                args=[six.moves.reduce(operator.or_, __queries)]
-            )
-
-        return queryset
+        return cls.apply_filter(
+            queryset=queryset,
+            options=options,
+            args=[
+                ~Q(
+                    'terms',
+                    **{
+                        options['field']: cls.get_terms_values(
+                            queryset,
+                            options,
+                            value
+                        )
+                    }
+                )
+            ]
+        )
 
     def get_filter_query_params(self, request, view):
         """Get query params to be filtered on.
@@ -721,22 +761,11 @@ class FilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
         :return: Request query params to filter on.
         :rtype: dict
         """
-        query_params = request.query_params.copy()
-
         filter_query_params = {}
         filter_fields = self.prepare_filter_fields(view)
-        for query_param in query_params:
-            query_param_list = self.split_lookup_filter(
-                query_param,
-                maxsplit=1
-            )
-            field_name = query_param_list[0]
-
+        for query_param, field_name, lookup_param, values \
+                in get_query_params(request):
             if field_name in filter_fields:
-                lookup_param = None
-                if len(query_param_list) > 1:
-                    lookup_param = query_param_list[1]
-
                 valid_lookups = filter_fields[field_name]['lookups']
 
                 # If we have default lookup given use it as a default and
@@ -753,13 +782,6 @@ class FilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
                     if lookup_param is None and default_lookup is not None:
                         lookup_param = str(default_lookup)
 
-                    values = [
-                        __value.strip()
-                        for __value
-                        in query_params.getlist(query_param)
-                        if __value.strip() != ''
-                    ]
-
                     if values:
                         filter_query_params[query_param] = {
                             'lookup': lookup_param,
@@ -770,6 +792,11 @@ class FilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
                             ),
                             'type': view.mapping
                         }
+                        for __option in ('max_values',
+                                         'terms_lookup_threshold'):
+                            if __option in filter_fields[field_name]:
+                                filter_query_params[query_param][__option] = \
+                                    filter_fields[field_name][__option]
         return filter_query_params
 
     def filter_queryset(self, request, queryset, view):
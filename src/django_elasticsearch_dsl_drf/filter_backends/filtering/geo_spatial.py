@@ -23,12 +23,16 @@ The queries in this group are:
 """
 import logging
 from elasticsearch_dsl.query import Q
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import BaseFilterBackend
 
 from six import string_types
 
 from ...constants import (
     ALL_GEO_SPATIAL_LOOKUP_FILTERS_AND_QUERIES,
+    GEO_ENCODING_GEOJSON_PREFIX,
+    GEO_ENCODING_POLYLINE_PREFIX,
+    GEO_MAX_VERTICES,
     LOOKUP_FILTER_GEO_DISTANCE,
     LOOKUP_FILTER_GEO_POLYGON,
     LOOKUP_FILTER_GEO_BOUNDING_BOX,
@@ -36,7 +40,19 @@ from ...constants import (
     SEPARATOR_LOOKUP_COMPLEX_VALUE,
     SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE,
 )
+from ...geo_helpers import (
+    close_ring,
+    decode_polyline,
+    flatten_points,
+    is_encoded_value,
+    parse_geojson,
+    parse_lat_lon_pairs,
+    simplify_points,
+    split_encoded_value,
+    validate_lat_lon,
+)
 from ..mixins import FilterBackendMixin
+from ...query_params import get_query_params
 
 __title__ = 'django_elasticsearch_dsl_drf.filter_backends.filtering.common'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
@@ -81,8 +97,25 @@ class GeoSpatialFilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
         >>>             'lookups': [
         >>>                 LOOKUP_FILTER_GEO_DISTANCE,
         >>>             ],
+        >>>         },
+        >>>         'area': {
+        >>>             'field': 'location',
+        >>>             'lookups': [
+        >>>                 LOOKUP_FILTER_GEO_POLYGON,
+        >>>             ],
+        >>>             # Douglas-Peucker tolerance (in degrees) applied to
+        >>>             # polygons/lines before sending them to Elasticsearch.
+        >>>             # Can be overridden per request with
+        >>>             # `__simplify,<tolerance>`.
+        >>>             'simplify_tolerance': 0.0001,
+        >>>             # Maximum number of vertices accepted.
+        >>>             'max_vertices': 1000,
         >>>         }
         >>> }
+
+    Points of the `geo_polygon`, `geo_bounding_box` and `geo_shape` lookups
+    can be given as plain `lat,lon` pairs, as an encoded polyline
+    (`polyline:...`) or as a GeoJSON geometry (`geojson:{...}` or `{...}`).
     """
 
     @classmethod
@@ -148,7 +181,72 @@ class GeoSpatialFilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
         return params
 
     @classmethod
-    def get_geo_polygon_params(cls, value, field):
+    def get_geo_points(cls, value, option_names, max_vertices=None):
+        """Get points (and options) of a geo-spatial lookup value.
+
+        Plain `lat,lon` pairs are converted to floats in a single pass.
+        Encoded polylines (`polyline:...`) and GeoJSON geometries
+        (`geojson:{...}` or `{...}`) are supported as well. In case of
+        `Polygon` (or `MultiPolygon`) GeoJSON geometries, the outer ring of
+        the (first) polygon is taken.
+
+        :param value: Lookup value.
+        :param option_names: Names of the options recognised.
+        :param max_vertices: Maximum number of points allowed.
+        :type value: str
+        :type option_names: tuple
+        :type max_vertices: int
+        :return: List of `[lat, lon]` points and the options dictionary.
+        :rtype: tuple
+        :raise ValueError: On malformed or out of range values.
+        """
+        if is_encoded_value(value):
+            __encoded, __options = split_encoded_value(value, option_names)
+            if __encoded.startswith(GEO_ENCODING_POLYLINE_PREFIX):
+                __points = decode_polyline(
+                    __encoded[len(GEO_ENCODING_POLYLINE_PREFIX):],
+                    max_vertices=max_vertices
+                )
+            else:
+                if __encoded.startswith(GEO_ENCODING_GEOJSON_PREFIX):
+                    __encoded = __encoded[len(GEO_ENCODING_GEOJSON_PREFIX):]
+                __coordinates = parse_geojson(__encoded)['coordinates']
+                # Descend to the outer ring of the (first) polygon
+                while (
+                    __coordinates
+                    and isinstance(__coordinates[0], list)
+                    and __coordinates[0]
+                    and isinstance(__coordinates[0][0], list)
+                ):
+                    __coordinates = __coordinates[0]
+                __lon_lat = flatten_points(__coordinates)
+                if max_vertices is not None and len(__lon_lat) > max_vertices:
+                    raise ValueError("Too many points")
+                __points = [
+                    [float(__point[1]), float(__point[0])]
+                    for __point in __lon_lat
+                ]
+        else:
+            __points = []
+            __options = {}
+            for __value in cls.split_lookup_complex_value(value):
+                __name = __value.split(
+                    SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE, 1
+                )[0]
+                if __name in option_names:
+                    __options[__name] = __value[len(__name) + 1:]
+                elif SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE in __value:
+                    __points.append(__value)
+            __points = parse_lat_lon_pairs(
+                __points,
+                max_vertices=max_vertices
+            )
+
+        return validate_lat_lon(__points), __options
+
+    @classmethod
+    def get_geo_polygon_params(cls, value, field, options=None,
+                               raise_exception=False):
         """Get params for `geo_polygon` query.
 
         Example:
@@ -163,6 +261,17 @@ class GeoSpatialFilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
                 ___name,myname
                 __validation_method,IGNORE_MALFORMED
 
+        Example (encoded polyline, simplified with tolerance of 0.01 degree):
+
+            /api/articles/?location__geo_polygon=polyline:_p~iF~ps|U_ulLnnqC
+                _mqNvxq`@
+                __simplify,0.01
+
+        Example (GeoJSON):
+
+            /api/articles/?location__geo_polygon={"type":"Polygon",
+                "coordinates":[[[-70,40],[-80,30],[-90,20],[-70,40]]]}
+
         Elasticsearch:
 
             {
@@ -188,53 +297,58 @@ class GeoSpatialFilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
 
         :param value:
         :param field:
+        :param options: Filter options.
+        :param raise_exception: If True, malformed (or out of range) values
+            raise a validation error instead of giving empty params.
         :type value: str
         :type field:
-        :return: Params to be used in `geo_distance` query.
+        :type options: dict
+        :type raise_exception: bool
+        :return: Params to be used in `geo_polygon` query.
         :rtype: dict
+        :raise rest_framework.exceptions.ValidationError: On malformed (or
+            out of range) values, if `raise_exception` is True.
         """
-        __values = cls.split_lookup_complex_value(value)
-        __len_values = len(__values)
-
-        if not __len_values:
+        if options is None:
+            options = {}
+
+        try:
+            __points, __options = cls.get_geo_points(
+                value,
+                ('_name', 'validation_method', 'simplify'),
+                max_vertices=options.get('max_vertices', GEO_MAX_VERTICES)
+            )
+            __tolerance = float(
+                __options.pop('simplify', options.get('simplify_tolerance', 0))
+            )
+            if not __points:
+                raise ValueError("No points given")
+        except ValueError as err:
+            if raise_exception:
+                raise ValidationError(str(err))
             return {}
 
-        __points = []
-        __options = {}
-
-        for __value in __values:
-            if SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE in __value:
-                __split_value = __value.split(
-                    SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE
-                )
-                if len(__split_value) >= 2:
-                    if __split_value[0] in ('_name', 'validation_method'):
-                        __options.update(
-                            {
-                                __split_value[0]: __split_value[1]
-                            }
-                        )
-                    else:
-                        __points.append(
-                            {
-                                'lat': float(__split_value[0]),
-                                'lon': float(__split_value[1]),
-                            }
-                        )
+        if __tolerance:
+            __simplified = simplify_points(__points, __tolerance)
+            # A polygon needs at least three distinct points
+            if len(set(map(tuple, __simplified))) >= 3:
+                __points = __simplified
 
-        if __points:
-            params = {
-                field: {
-                    'points': __points
-                }
+        params = {
+            field: {
+                'points': [
+                    {'lat': __lat, 'lon': __lon}
+                    for __lat, __lon in __points
+                ]
             }
-            params.update(__options)
+        }
+        params.update(__options)
 
-            return params
-        return {}
+        return params
 
     @classmethod
-    def get_geo_bounding_box_params(cls, value, field):
+    def get_geo_bounding_box_params(cls, value, field, options=None,
+                                    raise_exception=False):
         """Get params for `geo_bounding_box` query.
 
         Example:
@@ -277,60 +391,43 @@ class GeoSpatialFilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
 
         :param value:
         :param field:
+        :param options: Filter options.
+        :param raise_exception: If True, malformed (or out of range) values
+            raise a validation error instead of giving empty params.
         :type value: str
         :type field:
+        :type options: dict
+        :type raise_exception: bool
         :return: Params to be used in `geo_bounding_box` query.
         :rtype: dict
+        :raise rest_framework.exceptions.ValidationError: On malformed (or
+            out of range) values, if `raise_exception` is True.
         """
-        __values = cls.split_lookup_complex_value(value)
-        __len_values = len(__values)
-
-        if not __len_values:
-            return {}
-
-        __top_left_points = {}
-        __bottom_right_points = {}
-        __options = {}
-
-        # Top left
-        __lat_lon = __values[0].split(
-            SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE
-        )
-        if len(__lat_lon) >= 2:
-            __top_left_points.update({
-                'lat': float(__lat_lon[0]),
-                'lon': float(__lat_lon[1]),
-            })
-
-        # Bottom right
-        __lat_lon = __values[1].split(
-            SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE
-        )
-        if len(__lat_lon) >= 2:
-            __bottom_right_points.update({
-                'lat': float(__lat_lon[0]),
-                'lon': float(__lat_lon[1]),
-            })
-
-        # Options
-        for __value in __values[2:]:
-            if SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE in __value:
-                __opt_name_val = __value.split(
-                    SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE
+        try:
+            __points, __options = cls.get_geo_points(
+                value,
+                ('_name', 'validation_method', 'type'),
+                max_vertices=2
+            )
+            if len(__points) != 2:
+                raise ValueError(
+                    "Exactly two points (top left and bottom right) shall "
+                    "be given"
                 )
-                if len(__opt_name_val) >= 2:
-                    if __opt_name_val[0] in ('_name',
-                                             'validation_method',
-                                             'type'):
-                        __options.update(
-                            {
-                                __opt_name_val[0]: __opt_name_val[1]
-                            }
-                        )
-
-        if not __top_left_points or not __bottom_right_points:
+        except ValueError as err:
+            if raise_exception:
+                raise ValidationError(str(err))
             return {}
 
+        __top_left_points = {
+            'lat': __points[0][0],
+            'lon': __points[0][1],
+        }
+        __bottom_right_points = {
+            'lat': __points[1][0],
+            'lon': __points[1][1],
+        }
+
         params = {
             field: {
                 'top_left': __top_left_points,
@@ -342,7 +439,91 @@ class GeoSpatialFilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
         return params
 
     @classmethod
-    def get_geo_shape_params(cls, value, field):
+    def get_geo_shape_coordinates(cls, value, option_names, max_vertices=None):
+        """Get coordinates (and options) of an encoded `geo_shape` value.
+
+        Unlike other lookups, `geo_shape` coordinates are in `[lon, lat]`
+        (GeoJSON) order. The `type` option is taken from the GeoJSON
+        geometry, unless given explicitly.
+
+        :param value: Encoded (polyline or GeoJSON) lookup value.
+        :param option_names: Names of the options recognised.
+        :param max_vertices: Maximum number of points allowed.
+        :type value: str
+        :type option_names: tuple
+        :type max_vertices: int
+        :return: Coordinates and the options dictionary.
+        :rtype: tuple
+        :raise ValueError: On malformed or out of range values.
+        """
+        __encoded, __options = split_encoded_value(value, option_names)
+        if __encoded.startswith(GEO_ENCODING_POLYLINE_PREFIX):
+            __coordinates = [
+                [__lon, __lat]
+                for __lat, __lon
+                in validate_lat_lon(
+                    decode_polyline(
+                        __encoded[len(GEO_ENCODING_POLYLINE_PREFIX):],
+                        max_vertices=max_vertices
+                    )
+                )
+            ]
+        else:
+            if __encoded.startswith(GEO_ENCODING_GEOJSON_PREFIX):
+                __encoded = __encoded[len(GEO_ENCODING_GEOJSON_PREFIX):]
+            __geometry = parse_geojson(__encoded)
+            __coordinates = __geometry['coordinates']
+            __points = flatten_points(__coordinates)
+            if max_vertices is not None and len(__points) > max_vertices:
+                raise ValueError("Too many points")
+            validate_lat_lon(__points, lon_first=True)
+            __options.setdefault('type', __geometry['type'].lower())
+            # Polygon rings shall be closed
+            if __options['type'] == 'polygon':
+                __coordinates = [
+                    close_ring(__ring) for __ring in __coordinates
+                ]
+            elif __options['type'] == 'multipolygon':
+                __coordinates = [
+                    [close_ring(__ring) for __ring in __polygon]
+                    for __polygon in __coordinates
+                ]
+        return __coordinates, __options
+
+    @classmethod
+    def simplify_geo_shape_coordinates(cls, coordinates, tolerance):
+        """Simplify `geo_shape` coordinates.
+
+        Lines and rings are simplified using the Douglas-Peucker algorithm.
+        Rings (or lines) that would degenerate are left intact.
+
+        :param coordinates: GeoJSON coordinates.
+        :param tolerance: Tolerance in degrees.
+        :type coordinates: list
+        :type tolerance: float
+        :return: Simplified coordinates.
+        :rtype: list
+        """
+        if not coordinates or not isinstance(coordinates[0], list):
+            return coordinates
+
+        if not isinstance(coordinates[0][0], list):
+            __closed = (
+                len(coordinates) > 1 and coordinates[0] == coordinates[-1]
+            )
+            __simplified = simplify_points(coordinates, tolerance)
+            if len(__simplified) >= (4 if __closed else 2):
+                return __simplified
+            return coordinates
+
+        return [
+            cls.simplify_geo_shape_coordinates(__item, tolerance)
+            for __item in coordinates
+        ]
+
+    @classmethod
+    def get_geo_shape_params(cls, value, field, options=None,
+                             raise_exception=False):
         """Get params for `geo_shape` query.
 
         Example:
@@ -359,6 +540,20 @@ class GeoSpatialFilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
                 __relation,within
                 __type,envelope
 
+        Example (GeoJSON, simplified with tolerance of 0.001 degree):
+
+            /search/publishers/?location__geo_shape={"type":"Polygon",
+                "coordinates":[[[6.37,48.98],[6.47,48.98],[6.47,48.90],
+                [6.37,48.98]]]}
+                __relation,within
+                __simplify,0.001
+
+        Example (encoded polyline):
+
+            /search/publishers/?location__geo_shape=polyline:_p~iF~ps|U_ulLnnqC
+                __relation,intersects
+                __type,linestring
+
         Elasticsearch:
 
             {
@@ -385,57 +580,79 @@ class GeoSpatialFilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
 
         :param value:
         :param field:
+        :param options: Filter options.
+        :param raise_exception: If True, malformed (or out of range) values
+            raise a validation error instead of giving empty params.
         :type value: str
         :type field:
+        :type options: dict
+        :type raise_exception: bool
         :return: Params to be used in `geo_shape` query.
         :rtype: dict
+        :raise rest_framework.exceptions.ValidationError: On malformed (or
+            out of range) values, if `raise_exception` is True.
         """
-        __values = cls.split_lookup_complex_value(value)
-        __len_values = len(__values)
+        if options is None:
+            options = {}
+
+        __max_vertices = options.get('max_vertices', GEO_MAX_VERTICES)
+        __option_names = ('relation', 'type', 'radius', 'simplify')
+
+        try:
+            if is_encoded_value(value):
+                __coordinates, __options = cls.get_geo_shape_coordinates(
+                    value,
+                    __option_names,
+                    max_vertices=__max_vertices
+                )
+            else:
+                __coordinates = []
+                __options = {}
+
+                # Parse coordinates (can be x points)
+                for __value in cls.split_lookup_complex_value(value):
+                    __name = __value.split(
+                        SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE, 1
+                    )[0]
+                    if __name in __option_names:
+                        __options[__name] = __value[len(__name) + 1:]
+                    elif SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE in __value:
+                        __coordinates.append(__value)
+                __coordinates = validate_lat_lon(
+                    parse_lat_lon_pairs(
+                        __coordinates,
+                        max_vertices=__max_vertices
+                    ),
+                    lon_first=True
+                )
+                if len(__coordinates) == 1:
+                    __coordinates = __coordinates[0]
 
-        if not __len_values:
+            __tolerance = float(
+                __options.pop('simplify', options.get('simplify_tolerance', 0))
+            )
+            __type = __options.pop('type', None)
+            __relation = __options.pop('relation', None)
+            if not __coordinates or not __type or not __relation:
+                raise ValueError(
+                    "Coordinates, type and relation shall be given"
+                )
+        except ValueError as err:
+            if raise_exception:
+                raise ValidationError(str(err))
             return {}
 
-        __coordinates = []
-        __options = {}
-
-        # Parse coordinates (can be x points)
-        for value in __values:
-            __lat_lon = value.split(
-                SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE
+        if __tolerance:
+            __coordinates = cls.simplify_geo_shape_coordinates(
+                __coordinates,
+                __tolerance
             )
-            if len(__lat_lon) >= 2:
-                try:
-                    __point = [
-                        float(__lat_lon[0]),
-                        float(__lat_lon[1]),
-                    ]
-                    __coordinates.append(list(__point))
-                except ValueError:
-                    if SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE in value:
-                        __opt_name_val = value.split(
-                            SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE
-                        )
-                        if len(__opt_name_val) >= 2:
-                            if __opt_name_val[0] in ('relation',
-                                                     'type',
-                                                     'radius'):
-                                __options.update(
-                                    {
-                                        __opt_name_val[0]: __opt_name_val[1]
-                                    }
-                                )
-
-        __type = __options.pop('type', None)
-        __relation = __options.pop('relation', None)
-        if not __coordinates or not __type or not __relation:
-            return {}
 
         params = {
             field: {
                 'shape': {
                     'type': __type,
-                    'coordinates': __coordinates if len(__coordinates) > 1 else __coordinates[0],
+                    'coordinates': __coordinates,
                 },
                 'relation': __relation,
             }
@@ -479,11 +696,18 @@ class GeoSpatialFilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
         :type value: str
         :return: Modified queryset.
         :rtype: elasticsearch_dsl.search.Search
+        :raise rest_framework.exceptions.ValidationError: On malformed (or
+            out of range) values.
         """
         return queryset.query(
             Q(
                 'geo_polygon',
-                **cls.get_geo_polygon_params(value, options['field'])
+                **cls.get_geo_polygon_params(
+                    value,
+                    options['field'],
+                    options,
+                    raise_exception=True
+                )
             )
         )
 
@@ -499,11 +723,18 @@ class GeoSpatialFilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
         :type value: str
         :return: Modified queryset.
         :rtype: elasticsearch_dsl.search.Search
+        :raise rest_framework.exceptions.ValidationError: On malformed (or
+            out of range) values.
         """
         return queryset.query(
             Q(
                 'geo_bounding_box',
-                **cls.get_geo_bounding_box_params(value, options['field'])
+                **cls.get_geo_bounding_box_params(
+                    value,
+                    options['field'],
+                    options,
+                    raise_exception=True
+                )
             )
         )
 
@@ -519,11 +750,18 @@ class GeoSpatialFilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
         :type value: str
         :return: Modified queryset.
         :rtype: elasticsearch_dsl.search.Search
+        :raise rest_framework.exceptions.ValidationError: On malformed (or
+            out of range) values.
         """
         return queryset.query(
             Q(
                 'geo_shape',
-                **cls.get_geo_shape_params(value, options['field'])
+                **cls.get_geo_shape_params(
+                    value,
+                    options['field'],
+                    options,
+                    raise_exception=True
+                )
             )
         )
 
@@ -537,32 +775,14 @@ class GeoSpatialFilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
         :return: Request query params to filter on.
         :rtype: dict
         """
-        query_params = request.query_params.copy()
-
         filter_query_params = {}
         filter_fields = self.prepare_filter_fields(view)
-        for query_param in query_params:
-            query_param_list = self.split_lookup_filter(
-                query_param,
-                maxsplit=1
-            )
-            field_name = query_param_list[0]
-
+        for query_param, field_name, lookup_param, values \
+                in get_query_params(request):
             if field_name in filter_fields:
-                lookup_param = None
-                if len(query_param_list) > 1:
-                    lookup_param = query_param_list[1]
-
                 valid_lookups = filter_fields[field_name]['lookups']
 
                 if lookup_param is None or lookup_param in valid_lookups:
-                    values = [
-                        __value.strip()
-                        for __value
-                        in query_params.getlist(query_param)
-                        if __value.strip() != ''
-                    ]
-
                     if values:
                         filter_query_params[query_param] = {
                             'lookup': lookup_param,
@@ -573,6 +793,11 @@ class GeoSpatialFilteringFilterBackend(BaseFilterBackend, FilterBackendMixin):
                             ),
                             'type': view.mapping
                         }
+                        for __option in ('max_vertices',
+                                         'simplify_tolerance'):
+                            if __option in filter_fields[field_name]:
+                                filter_query_params[query_param][__option] = \
+                                    filter_fields[field_name][__option]
         return filter_query_params
 
     def filter_queryset(self, request, queryset, view):
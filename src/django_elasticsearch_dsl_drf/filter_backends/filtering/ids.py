@@ -29,6 +29,7 @@ Official Elastic docs:
 from rest_framework.filters import BaseFilterBackend
 
 from ...versions import ELASTICSEARCH_LTE_6_0
+from ...query_params import get_query_params
 from ..mixins import FilterBackendMixin
 
 __title__ = 'django_elasticsearch_dsl_drf.filter_backends.filtering.ids'
@@ -73,8 +74,7 @@ class IdsFilterBackend(BaseFilterBackend, FilterBackendMixin):
         :return: List of search query params.
         :rtype: list
         """
-        query_params = request.query_params.copy()
-        return query_params.getlist(self.ids_query_param, [])
+        return get_query_params(request).getlist(self.ids_query_param)
 
     def get_ids_values(self, request, view):
         """Get ids values for query.
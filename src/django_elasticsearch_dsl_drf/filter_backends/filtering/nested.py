@@ -2,7 +2,9 @@
 Nested filtering backend.
 """
 
-from elasticsearch_dsl.query import Q
+from collections import OrderedDict
+
+from elasticsearch_dsl.query import Bool, Q
 from django.core.exceptions import ImproperlyConfigured
 from django_elasticsearch_dsl import fields
 
@@ -15,6 +17,7 @@ from ...constants import (
 
 from ...compat import coreapi
 from ...compat import coreschema
+from ...query_params import get_query_params
 from .common import FilteringFilterBackend
 
 __title__ = 'django_elasticsearch_dsl_drf.filter_backends.filtering.nested'
@@ -27,6 +30,11 @@ __all__ = ('NestedFilteringFilterBackend',)
 class NestedFilteringFilterBackend(FilteringFilterBackend):
     """Nested filter backend.
 
+    Nested filters are applied in the filter context (not scored and
+    cached by Elasticsearch), using the `none` score mode. Filters on the
+    same `path` are grouped into a single `nested` query, thus all of them
+    shall match the same nested object.
+
     Example:
 
         >>> from django_elasticsearch_dsl_drf.constants import (
@@ -124,22 +132,11 @@ class NestedFilteringFilterBackend(FilteringFilterBackend):
         :return: Request query params to filter on.
         :rtype: dict
         """
-        query_params = request.query_params.copy()
-
         filter_query_params = {}
         filter_fields = self.prepare_filter_fields(view)
-        for query_param in query_params:
-            query_param_list = self.split_lookup_filter(
-                query_param,
-                maxsplit=1
-            )
-            field_name = query_param_list[0]
-
+        for query_param, field_name, lookup_param, values \
+                in get_query_params(request):
             if field_name in filter_fields:
-                lookup_param = None
-                if len(query_param_list) > 1:
-                    lookup_param = query_param_list[1]
-
                 valid_lookups = filter_fields[field_name]['lookups']
                 nested_path = self.get_filter_field_nested_path(
                     filter_fields,
@@ -147,13 +144,6 @@ class NestedFilteringFilterBackend(FilteringFilterBackend):
                 )
 
                 if lookup_param is None or lookup_param in valid_lookups:
-                    values = [
-                        __value.strip()
-                        for __value
-                        in query_params.getlist(query_param)
-                        if __value.strip() != ''
-                    ]
-
                     if values:
                         filter_query_params[query_param] = {
                             'lookup': lookup_param,
@@ -165,6 +155,11 @@ class NestedFilteringFilterBackend(FilteringFilterBackend):
                             'type': view.mapping,
                             'path': nested_path,
                         }
+                        for __option in ('max_values',
+                                         'terms_lookup_threshold'):
+                            if __option in filter_fields[field_name]:
+                                filter_query_params[query_param][__option] = \
+                                    filter_fields[field_name][__option]
         return filter_query_params
 
     @classmethod
@@ -187,9 +182,10 @@ class NestedFilteringFilterBackend(FilteringFilterBackend):
         if kwargs is None:
             kwargs = {}
 
-        return queryset.query(
+        return queryset.filter(
             'nested',
             path=options.get('path'),
+            score_mode='none',
             query=Q(*args, **kwargs)
         )
 
@@ -197,28 +193,76 @@ class NestedFilteringFilterBackend(FilteringFilterBackend):
     def apply_query(cls, queryset, options=None, args=None, kwargs=None):
         """Apply query.
 
+        Nested queries of the lookups are not scored, thus applied in the
+        filter context, the same way as the filters.
+
         :param queryset:
         :param options:
         :param args:
         :param kwargs:
         :return:
         """
-        if options is None:
-            raise ImproperlyConfigured(
-                "You should provide an `path` argument in the field options."
-            )
+        return cls.apply_filter(
+            queryset=queryset,
+            options=options,
+            args=args,
+            kwargs=kwargs
+        )
 
-        path = options.pop('path')
+    @classmethod
+    def group_nested_filters(cls, queryset, filters):
+        """Apply nested filters, grouped per path.
+
+        :param queryset: Original queryset.
+        :param filters: Nested filters.
+        :type queryset: elasticsearch_dsl.search.Search
+        :type filters: list
+        :return: Modified queryset.
+        :rtype: elasticsearch_dsl.search.Search
+        """
+        __paths = OrderedDict()
+        for __filter in filters:
+            __paths.setdefault(__filter.path, []).append(__filter.query)
+
+        for __path, __queries in __paths.items():
+            queryset = queryset.filter(
+                'nested',
+                path=__path,
+                score_mode='none',
+                query=(
+                    __queries[0] if len(__queries) == 1
+                    else Q('bool', filter=__queries)
+                )
+            )
+        return queryset
 
-        if args is None:
-            args = []
-        if kwargs is None:
-            kwargs = {}
+    def filter_queryset(self, request, queryset, view):
+        """Filter the queryset.
 
-        return queryset.query(
-            'nested',
-            path=path,
-            query=Q(*args, **kwargs)
+        :param request: Django REST framework request.
+        :param queryset: Base queryset.
+        :param view: View.
+        :type request: rest_framework.request.Request
+        :type queryset: elasticsearch_dsl.search.Search
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :return: Updated queryset.
+        :rtype: elasticsearch_dsl.search.Search
+        """
+        # Filters are collected on an empty search first, to be grouped
+        # per path. Search is a clone of the queryset (with the query
+        # reset), thus connection and index (used by the terms lookups, for
+        # instance) are kept.
+        __search = queryset._clone()
+        __search.query._proxied = None
+        __query = super(NestedFilteringFilterBackend, self).filter_queryset(
+            request,
+            __search,
+            view
+        ).query._proxied
+
+        return self.group_nested_filters(
+            queryset,
+            list(__query.filter) if isinstance(__query, Bool) else []
         )
 
     def get_coreschema_field(self, field):
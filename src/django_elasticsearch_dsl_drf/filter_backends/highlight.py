@@ -3,6 +3,8 @@ Highlight backend.
 """
 from rest_framework.filters import BaseFilterBackend
 
+from ..query_params import get_query_params
+
 __title__ = 'django_elasticsearch_dsl_drf.highlight'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
 __copyright__ = '2017-2020 Artur Barseghyan'
@@ -105,8 +107,7 @@ class HighlightBackend(BaseFilterBackend):
         :return: List of search query params.
         :rtype: list
         """
-        query_params = request.query_params.copy()
-        return query_params.getlist(self.highlight_param, [])
+        return get_query_params(request).getlist(self.highlight_param)
 
     def filter_queryset(self, request, queryset, view):
         """Filter the queryset.
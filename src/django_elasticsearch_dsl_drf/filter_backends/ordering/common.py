@@ -10,6 +10,7 @@ from rest_framework.settings import api_settings
 from ...compat import coreapi
 from ...compat import coreschema
 from ...compat import nested_sort_entry
+from ...query_params import get_query_params
 
 __title__ = 'django_elasticsearch_dsl_drf.filter_backends.ordering.common'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
@@ -127,8 +128,9 @@ class OrderingFilterBackend(BaseFilterBackend, OrderingMixin):
         :rtype: list
         """
         # TODO: Support `mode` argument.
-        query_params = request.query_params.copy()
-        ordering_query_params = query_params.getlist(self.ordering_param, [])
+        ordering_query_params = get_query_params(request).getlist(
+            self.ordering_param
+        )
         # ordering_fields is always dict
         ordering_fields = self.prepare_ordering_fields(view)
 
@@ -254,8 +256,9 @@ class DefaultOrderingFilterBackend(BaseFilterBackend, OrderingMixin):
         :return: Ordering params to be used for ordering.
         :rtype: list
         """
-        query_params = request.query_params.copy()
-        ordering_query_params = query_params.getlist(self.ordering_param, [])
+        ordering_query_params = get_query_params(request).getlist(
+            self.ordering_param
+        )
         ordering_params_present = False
         # Remove invalid ordering query params
         for query_param in ordering_query_params:
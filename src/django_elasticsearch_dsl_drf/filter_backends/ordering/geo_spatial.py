@@ -8,6 +8,7 @@ from ..mixins import FilterBackendMixin
 from ...constants import (
     GEO_DISTANCE_ORDERING_PARAM,
 )
+from ...query_params import get_query_params
 
 __title__ = 'django_elasticsearch_dsl_drf.filter_backends.ordering.common'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
@@ -139,8 +140,9 @@ class GeoSpatialOrderingFilterBackend(BaseFilterBackend, FilterBackendMixin):
         :rtype: list
         """
         # TODO: Support `mode` argument.
-        query_params = request.query_params.copy()
-        ordering_query_params = query_params.getlist(self.ordering_param, [])
+        ordering_query_params = get_query_params(request).getlist(
+            self.ordering_param
+        )
         __ordering_params = []
         # Remove invalid ordering query params
         for query_param in ordering_query_params:
@@ -6,6 +6,8 @@ from .base import BaseSearchFilterBackend
 from .compound import CompoundSearchFilterBackend
 from .historical import SearchFilterBackend
 from .multi_match import MultiMatchSearchFilterBackend
+from .rescore import RescoreBackend
+from .search_template import SearchTemplateBackend
 from .simple_query_string import SimpleQueryStringSearchFilterBackend
 
 __title__ = 'django_elasticsearch_dsl_drf.filter_backends.search'
@@ -16,6 +18,8 @@ __all__ = (
     'BaseSearchFilterBackend',
     'CompoundSearchFilterBackend',
     'MultiMatchSearchFilterBackend',
+    'RescoreBackend',
     'SearchFilterBackend',
+    'SearchTemplateBackend',
     'SimpleQueryStringSearchFilterBackend',
 )
@@ -6,9 +6,11 @@ from django_elasticsearch_dsl import fields
 from rest_framework.filters import BaseFilterBackend
 from rest_framework.settings import api_settings
 
+from .query_templates import get_query_template
 from ..mixins import FilterBackendMixin
 from ...compat import coreapi, coreschema
 from ...constants import MATCHING_OPTIONS, DEFAULT_MATCHING_OPTION
+from ...query_params import get_query_params
 
 __title__ = 'django_elasticsearch_dsl_drf.filter_backends.search.common'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
@@ -36,8 +38,7 @@ class BaseSearchFilterBackend(BaseFilterBackend, FilterBackendMixin):
         :return: List of search query params.
         :rtype: list
         """
-        query_params = request.query_params.copy()
-        return query_params.getlist(self.search_param, [])
+        return get_query_params(request).getlist(self.search_param)
 
     def get_query_backends(self, request, view):
         """Get query backends.
@@ -69,6 +70,61 @@ class BaseSearchFilterBackend(BaseFilterBackend, FilterBackendMixin):
             )
         return self.query_backends[:]
 
+    @classmethod
+    def is_compilable(cls, view, query_backends):
+        """Check if queries can be built from a compiled query template.
+
+        :param view: View.
+        :param query_backends: Query backends.
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :type query_backends: list
+        :return:
+        :rtype: bool
+        """
+        return getattr(view, 'compile_search_queries', False) and all(
+            getattr(query_backend, 'compilable', False)
+            for query_backend
+            in query_backends
+        )
+
+    def construct_queries(self, request, view, query_backends):
+        """Construct search queries.
+
+        If the view has `compile_search_queries` set to True (and all of the
+        query backends are compilable), queries are rendered from the
+        query template compiled for the view (see the `query_templates`
+        module). Otherwise, queries are constructed by the query backends.
+
+        :param request: Django REST framework request.
+        :param view: View.
+        :param query_backends: Query backends.
+        :type request: rest_framework.request.Request
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :type query_backends: list
+        :return: List of queries.
+        :rtype: list
+        """
+        if self.is_compilable(view, query_backends):
+            __search_terms = self.get_search_query_params(request)
+            return get_query_template(
+                request,
+                view,
+                self,
+                query_backends,
+                __search_terms
+            ).render(__search_terms)
+
+        __queries = []
+        for query_backend in query_backends:
+            __queries.extend(
+                query_backend.construct_search(
+                    request=request,
+                    view=view,
+                    search_backend=self
+                )
+            )
+        return __queries
+
     def filter_queryset(self, request, queryset, view):
         """Filter the queryset.
 
@@ -89,32 +145,7 @@ class BaseSearchFilterBackend(BaseFilterBackend, FilterBackendMixin):
 
         __query_backends = self._get_query_backends(request, view)
 
-        if len(__query_backends) > 1:
-            __queries = []
-            for query_backend in __query_backends:
-                __queries.extend(
-                    query_backend.construct_search(
-                        request=request,
-                        view=view,
-                        search_backend=self
-                    )
-                )
-
-            if __queries:
-                queryset = queryset.query(
-                    'bool',
-                    **{self.matching: __queries}
-                )
-
-        elif len(__query_backends) == 1:
-            __query = __query_backends[0].construct_search(
-                request=request,
-                view=view,
-                search_backend=self
-            )
-            queryset = queryset.query('bool', **{self.matching: __query})
-
-        else:
+        if not __query_backends:
             raise ImproperlyConfigured(
                 "Search filter backend shall have at least one query_backend"
                 "specified either in `query_backends` property or "
@@ -122,6 +153,14 @@ class BaseSearchFilterBackend(BaseFilterBackend, FilterBackendMixin):
                 "your {} class".format(self.__class__.__name__)
             )
 
+        __queries = self.construct_queries(request, view, __query_backends)
+
+        if __queries or len(__query_backends) == 1:
+            queryset = queryset.query(
+                'bool',
+                **{self.matching: __queries}
+            )
+
         return queryset
 
     def get_coreschema_field(self, field):
@@ -13,6 +13,7 @@ import six
 
 from ..mixins import FilterBackendMixin
 from ...compat import coreapi, coreschema
+from ...query_params import get_query_params
 
 __title__ = 'django_elasticsearch_dsl_drf.filter_backends.search.historical'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
@@ -64,8 +65,7 @@ class SearchFilterBackend(BaseFilterBackend, FilterBackendMixin):
         :return: List of search query params.
         :rtype: list
         """
-        query_params = request.query_params.copy()
-        return query_params.getlist(self.search_param, [])
+        return get_query_params(request).getlist(self.search_param)
 
     def construct_nested_search(self, request, view):
         """Construct nested search.
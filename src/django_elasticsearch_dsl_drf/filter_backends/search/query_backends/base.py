@@ -9,6 +9,12 @@ __all__ = ('BaseSearchQueryBackend',)
 class BaseSearchQueryBackend(object):
     """Search query backend."""
 
+    # Whether queries can be compiled into a query template (see the
+    # `query_templates` module). Set to True only if the queries depend on
+    # the view configuration and the search terms, and search terms are
+    # used as they are (not analysed or altered otherwise).
+    compilable = False
+
     @classmethod
     def construct_search(cls, request, view, search_backend):
         """Construct search.
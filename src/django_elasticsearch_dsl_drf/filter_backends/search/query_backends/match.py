@@ -15,6 +15,8 @@ class MatchQueryBackend(BaseSearchQueryBackend):
 
     query_type = 'match'
 
+    compilable = True
+
     @classmethod
     def construct_search(cls, request, view, search_backend):
         """Construct search.
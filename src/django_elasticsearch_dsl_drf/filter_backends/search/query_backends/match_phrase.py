@@ -15,6 +15,8 @@ class MatchPhraseQueryBackend(BaseSearchQueryBackend):
 
     query_type = 'match_phrase'
 
+    compilable = True
+
     @classmethod
     def construct_search(cls, request, view, search_backend):
         """Construct search.
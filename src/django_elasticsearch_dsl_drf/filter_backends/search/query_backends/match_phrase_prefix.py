@@ -15,6 +15,8 @@ class MatchPhrasePrefixQueryBackend(BaseSearchQueryBackend):
 
     query_type = 'match_phrase_prefix'
 
+    compilable = True
+
     @classmethod
     def construct_search(cls, request, view, search_backend):
         """Construct search.
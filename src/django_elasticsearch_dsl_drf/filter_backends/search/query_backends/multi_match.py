@@ -17,6 +17,8 @@ class MultiMatchQueryBackend(BaseSearchQueryBackend):
 
     query_type = 'multi_match'
 
+    compilable = True
+
     @classmethod
     def get_field(cls, field, options):
         """Get field.
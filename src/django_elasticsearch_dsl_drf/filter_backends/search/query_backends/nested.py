@@ -18,6 +18,8 @@ class NestedQueryBackend(BaseSearchQueryBackend):
 
     query_type = 'nested'
 
+    compilable = True
+
     @classmethod
     def construct_search(cls, request, view, search_backend):
         """Construct search.
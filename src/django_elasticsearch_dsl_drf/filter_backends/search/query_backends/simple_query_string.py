@@ -17,6 +17,8 @@ class SimpleQueryStringQueryBackend(BaseSearchQueryBackend):
 
     query_type = 'simple_query_string'
 
+    compilable = True
+
     @classmethod
     def get_field(cls, field, options):
         """Get field.
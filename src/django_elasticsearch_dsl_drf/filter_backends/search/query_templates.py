@@ -0,0 +1,290 @@
+"""
+Compiled search query templates.
+
+Search backends build the same query trees from the view configuration on
+each request, while the only thing that varies is the search term. Query
+templates are compiled once (per view class, search backend, query
+backends and shape of the search terms) by running the query backends with
+placeholders instead of the search terms. Per request, only the search
+terms are substituted.
+"""
+
+import json
+from json.encoder import encode_basestring_ascii
+import re
+import uuid
+
+from elasticsearch_dsl.query import Query
+
+from ...constants import SEPARATOR_LOOKUP_NAME
+from ...utils import Registry
+
+__title__ = 'django_elasticsearch_dsl_drf.filter_backends.search.' \
+            'query_templates'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'clear_query_templates',
+    'compile_query_template',
+    'get_query_template',
+    'get_search_terms_shape',
+    'get_search_terms_values',
+    'QueryTemplate',
+    'RawQuery',
+)
+
+# Registry of compiled templates, key is a tuple of view class, search
+# backend class, search param, query backends and shape of search terms.
+QUERY_TEMPLATES = Registry()
+
+# Upper limit of the number of compiled templates. Shape of search terms
+# depends on the user input (field prefixes), thus templates are no
+# longer cached once the limit is reached.
+MAX_QUERY_TEMPLATES = 1000
+
+
+class RawQuery(Query):
+    """Query given as a (serialized) dict.
+
+    Can be combined with other queries, but not modified.
+    """
+
+    def __init__(self, query=None):
+        # Parameters are not used, thus `DslBase.__init__` is skipped.
+        self._params = {}
+        self._raw = query or {}
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, self._raw)
+
+    def _clone(self):
+        return self.__class__(self._raw)
+
+    def to_dict(self):
+        return self._raw
+
+
+class _TemplateSearchBackend(object):
+    """Search backend proxy, which gives placeholders as search terms."""
+
+    def __init__(self, search_backend, search_terms):
+        self._search_backend = search_backend
+        self._search_terms = search_terms
+
+    def __getattr__(self, name):
+        return getattr(self._search_backend, name)
+
+    def get_search_query_params(self, request):
+        return list(self._search_terms)
+
+
+class QueryTemplate(object):
+    """Query template.
+
+    Serialized list of queries with placeholders for the search terms
+    (values of the search terms with field prefix).
+    """
+
+    def __init__(self, queries, placeholder_pattern, shape):
+        self.shape = shape
+        __parts = re.split(
+            placeholder_pattern,
+            json.dumps([__query.to_dict() for __query in queries])
+        )
+        self._chunks = __parts[::2]
+        self._indexes = [int(__index) for __index in __parts[1::2]]
+
+    def render(self, search_terms):
+        """Render queries for the search terms given.
+
+        :param search_terms: Search terms (of the shape the template was
+            compiled for).
+        :type search_terms: list
+        :return: List of queries.
+        :rtype: list
+        """
+        # Search term values, JSON-escaped, without the quotes
+        __values = [
+            encode_basestring_ascii(__value)[1:-1]
+            for __value
+            in get_search_terms_values(search_terms, self.shape)
+        ]
+        __chunks = [self._chunks[0]]
+        for __index, __chunk in zip(self._indexes, self._chunks[1:]):
+            __chunks.append(__values[__index])
+            __chunks.append(__chunk)
+
+        return [
+            RawQuery(__query)
+            for __query
+            in json.loads(''.join(__chunks))
+        ]
+
+    def to_mustache(self, param_name='search_term_{}'):
+        """Get the (JSON) source of the mustache template of the queries.
+
+        Search term values are referred to as `{{search_term_0}}`, etc.
+        Elasticsearch JSON-escapes the values of the params.
+
+        :param param_name: Format of the param names.
+        :type param_name: str
+        :return:
+        :rtype: str
+        """
+        __chunks = [self._chunks[0]]
+        for __index, __chunk in zip(self._indexes, self._chunks[1:]):
+            __chunks.append('{{' + param_name.format(__index) + '}}')
+            __chunks.append(__chunk)
+        return ''.join(__chunks)
+
+
+def get_search_terms_shape(search_backend, search_terms):
+    """Get shape of the search terms.
+
+    Query backends treat the search terms the same way, unless they differ
+    in the field prefix (`title:lorem`).
+
+    :param search_backend: Search backend.
+    :param search_terms: Search terms.
+    :type search_backend:
+        django_elasticsearch_dsl_drf.filter_backends.search.base.
+        BaseSearchFilterBackend
+    :type search_terms: list
+    :return: Tuple of field prefixes (None for terms without prefix).
+    :rtype: tuple
+    """
+    __shape = []
+    for __search_term in search_terms:
+        __values = search_backend.split_lookup_name(__search_term, 1)
+        __shape.append(__values[0] if len(__values) > 1 else None)
+    return tuple(__shape)
+
+
+def get_search_terms_values(search_terms, shape):
+    """Get values of the search terms (without the field prefixes).
+
+    :param search_terms: Search terms.
+    :param shape: Shape of the search terms.
+    :type search_terms: list
+    :type shape: tuple
+    :return:
+    :rtype: list
+    """
+    return [
+        __search_term
+        if __field is None
+        else __search_term.split(SEPARATOR_LOOKUP_NAME, 1)[1]
+        for __search_term, __field
+        in zip(search_terms, shape)
+    ]
+
+
+def compile_query_template(request, view, search_backend, query_backends,
+                           shape):
+    """Compile query template.
+
+    :param request: Django REST framework request.
+    :param view: View.
+    :param search_backend: Search backend.
+    :param query_backends: Query backends.
+    :param shape: Shape of the search terms.
+    :type request: rest_framework.request.Request
+    :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+    :type search_backend:
+        django_elasticsearch_dsl_drf.filter_backends.search.base.
+        BaseSearchFilterBackend
+    :type query_backends: list
+    :type shape: tuple
+    :return:
+    :rtype: django_elasticsearch_dsl_drf.filter_backends.search.
+        query_templates.QueryTemplate
+    """
+    __token = uuid.uuid4().hex
+    __placeholders = []
+    for __index, __field in enumerate(shape):
+        __placeholder = '__qt_{}_{}__'.format(__token, __index)
+        if __field is not None:
+            __placeholder = '{}{}{}'.format(
+                __field,
+                SEPARATOR_LOOKUP_NAME,
+                __placeholder
+            )
+        __placeholders.append(__placeholder)
+
+    __search_backend = _TemplateSearchBackend(search_backend, __placeholders)
+    __queries = []
+    for query_backend in query_backends:
+        __queries.extend(
+            query_backend.construct_search(
+                request=request,
+                view=view,
+                search_backend=__search_backend
+            )
+        )
+
+    return QueryTemplate(
+        __queries,
+        r'__qt_{}_(\d+)__'.format(__token),
+        shape
+    )
+
+
+def get_query_template(request, view, search_backend, query_backends,
+                       search_terms):
+    """Get (or compile) the query template.
+
+    :param request: Django REST framework request.
+    :param view: View.
+    :param search_backend: Search backend.
+    :param query_backends: Query backends.
+    :param search_terms: Search terms.
+    :type request: rest_framework.request.Request
+    :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+    :type search_backend:
+        django_elasticsearch_dsl_drf.filter_backends.search.base.
+        BaseSearchFilterBackend
+    :type query_backends: list
+    :type search_terms: list
+    :return:
+    :rtype: django_elasticsearch_dsl_drf.filter_backends.search.
+        query_templates.QueryTemplate
+    """
+    __shape = get_search_terms_shape(search_backend, search_terms)
+    __key = (
+        view.__class__,
+        search_backend.__class__,
+        search_backend.search_param,
+        tuple(query_backends),
+        __shape,
+    )
+    __template = QUERY_TEMPLATES.get(__key)
+    if __template is not None:
+        return __template
+
+    __template = compile_query_template(
+        request,
+        view,
+        search_backend,
+        query_backends,
+        __shape
+    )
+    with QUERY_TEMPLATES.lock:
+        if len(QUERY_TEMPLATES) < MAX_QUERY_TEMPLATES:
+            QUERY_TEMPLATES.setdefault(__key, __template)
+
+    return __template
+
+
+def clear_query_templates(view_class=None):
+    """Clear compiled query templates.
+
+    Shall be called if search configuration of the view changes at run
+    time.
+
+    :param view_class: View class. If not given, all templates are cleared.
+    :type view_class: type
+    """
+    QUERY_TEMPLATES.remove(
+        None if view_class is None else lambda key: key[0] is view_class
+    )
@@ -0,0 +1,175 @@
+"""Rescore backend."""
+
+import copy
+
+from elasticsearch_dsl.query import Q
+
+from six import string_types
+
+from .base import BaseSearchFilterBackend
+from .query_backends import (
+    MatchPhraseQueryBackend,
+    NestedQueryBackend,
+)
+
+__title__ = 'django_elasticsearch_dsl_drf.filter_backends.search.rescore'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'RescoreBackend',
+)
+
+
+class RescoreBackend(BaseSearchFilterBackend):
+    """Rescore backend.
+
+    Adds a `rescore` window to the search: the main query (for instance,
+    of the `CompoundSearchFilterBackend`) stays cheap, while the more
+    expensive query (by default `match_phrase` and `nested`, built by the
+    query backends from the same `search` query params and `search_fields`)
+    is executed on the top `window_size` hits of each shard only.
+
+    Rescoring is skipped if results are sorted on anything but `_score`
+    or collapsed, since Elasticsearch does not support `rescore` in
+    combination with those. Thus, the `RescoreBackend` shall be placed after
+    the ordering and collapse backends.
+
+    Example:
+
+        >>> from django_elasticsearch_dsl_drf.filter_backends import (
+        >>>     CompoundSearchFilterBackend,
+        >>>     RescoreBackend,
+        >>> )
+        >>> from django_elasticsearch_dsl_drf.viewsets import (
+        >>>     BaseDocumentViewSet,
+        >>> )
+        >>>
+        >>> # Local book document definition
+        >>> from .documents import BookDocument
+        >>>
+        >>> # Local book document serializer
+        >>> from .serializers import BookDocumentSerializer
+        >>>
+        >>> class BookDocumentView(BaseDocumentViewSet):
+        >>>
+        >>>     document = BookDocument
+        >>>     serializer_class = BookDocumentSerializer
+        >>>     filter_backends = [
+        >>>         CompoundSearchFilterBackend,
+        >>>         RescoreBackend,
+        >>>     ]
+        >>>     search_fields = {
+        >>>         'title': {'boost': 4},
+        >>>         'summary': None,
+        >>>     }
+        >>>     rescore_options = {
+        >>>         'window_size': 200,
+        >>>         'query_weight': 0.7,
+        >>>         'rescore_query_weight': 1.2,
+        >>>     }
+    """
+
+    query_backends = [
+        MatchPhraseQueryBackend,
+        NestedQueryBackend,
+    ]
+
+    # Default rescore options
+    rescore_options = {
+        'window_size': 100,
+        'query_weight': 1.0,
+        'rescore_query_weight': 1.0,
+        'score_mode': 'total',
+    }
+
+    # Upper limit of the `window_size`, since rescoring is executed for
+    # `window_size` hits on each shard.
+    max_window_size = 1000
+
+    @classmethod
+    def prepare_rescore_options(cls, view):
+        """Prepare rescore options.
+
+        :param view:
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :return: Rescore options.
+        :rtype: dict
+        """
+        options = copy.deepcopy(cls.rescore_options)
+        options.update(getattr(view, 'rescore_options', {}))
+        options['window_size'] = min(
+            int(options['window_size']),
+            cls.max_window_size
+        )
+        return options
+
+    @classmethod
+    def is_rescore_allowed(cls, queryset):
+        """Check if rescoring can be applied to the queryset given.
+
+        :param queryset: Search.
+        :type queryset: elasticsearch_dsl.search.Search
+        :return:
+        :rtype: bool
+        """
+        if queryset._extra.get('collapse'):
+            return False
+
+        for sort in queryset._sort:
+            if isinstance(sort, string_types):
+                field = sort
+            else:
+                field = next(iter(sort), None)
+            if field != '_score':
+                return False
+
+        return True
+
+    def filter_queryset(self, request, queryset, view):
+        """Filter the queryset.
+
+        :param request: Django REST framework request.
+        :param queryset: Base queryset.
+        :param view: View.
+        :type request: rest_framework.request.Request
+        :type queryset: elasticsearch_dsl.search.Search
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :return: Updated queryset.
+        :rtype: elasticsearch_dsl.search.Search
+        """
+        if not self.is_rescore_allowed(queryset):
+            return queryset
+
+        __queries = self.construct_queries(
+            request,
+            view,
+            self._get_query_backends(request, view)
+        )
+
+        if not __queries:
+            return queryset
+
+        options = self.prepare_rescore_options(view)
+        window_size = options.pop('window_size')
+        options['rescore_query'] = Q(
+            'bool',
+            **{self.matching: __queries}
+        ).to_dict()
+
+        return queryset.extra(
+            rescore={
+                'window_size': window_size,
+                'query': options,
+            }
+        )
+
+    def get_schema_fields(self, view):
+        """Get schema fields.
+
+        Search query param is documented by the search backend.
+
+        :param view:
+        :return:
+        """
+        return []
@@ -0,0 +1,385 @@
+"""
+Search template backend.
+"""
+
+from functools import lru_cache
+import json
+import logging
+
+from elasticsearch.exceptions import NotFoundError
+from elasticsearch_dsl.connections import get_connection
+from elasticsearch_dsl.query import Q
+from elasticsearch_dsl.search import Search
+
+from .base import BaseSearchFilterBackend
+from .query_backends import (
+    MatchQueryBackend,
+    NestedQueryBackend,
+)
+from .query_templates import (
+    compile_query_template,
+    get_search_terms_shape,
+    get_search_terms_values,
+)
+from ...constants import SEARCH_TEMPLATE_BODY_KEYS
+
+__title__ = 'django_elasticsearch_dsl_drf.filter_backends.search.' \
+            'search_template'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'SearchTemplateBackend',
+    'TemplatedSearch',
+    'get_templated_search_class',
+)
+
+LOGGER = logging.getLogger(__name__)
+
+
+class TemplatedSearch(Search):
+    """Search executed through a stored search template.
+
+    The search query (built by the `SearchTemplateBackend`) is defined in
+    the stored template, thus only the search terms and the rest of the
+    search body are sent to the `_search/template` endpoint. Counting
+    (and serialization) is done with the search query included. If the
+    template is not registered (see the
+    `elasticsearch_register_search_templates` management command), the
+    search is executed with the search query included.
+
+    Searches of other search classes (for instance, coalescing, resilient
+    or hedged searches) are made templated by the
+    `get_templated_search_class`.
+    """
+
+    _search_template = None
+
+    @classmethod
+    def from_search(cls, search, search_template):
+        """Make a templated search of the search given.
+
+        :param search: Search.
+        :param search_template: Dictionary with the `id` and the `params`
+            of the stored template and the search `query` (used when the
+            search can't be executed through the template).
+        :type search: elasticsearch_dsl.search.Search
+        :type search_template: dict
+        :return:
+        :rtype: django_elasticsearch_dsl_drf.filter_backends.search.
+            search_template.TemplatedSearch
+        """
+        __search = search._clone()
+        __search.__class__ = get_templated_search_class(
+            search.__class__,
+            cls
+        )
+        __search._search_template = search_template
+        return __search
+
+    def _clone(self):
+        __search = super(TemplatedSearch, self)._clone()
+        __search._search_template = self._search_template
+        return __search
+
+    def to_dict(self, count=False, **kwargs):
+        """Serialize the search (with the search query included).
+
+        :param count:
+        :param kwargs:
+        :return:
+        :rtype: dict
+        """
+        __body = super(TemplatedSearch, self).to_dict(count=count, **kwargs)
+        if self._search_template is not None:
+            __query = self._search_template['query']
+            if 'query' in __body:
+                __query = Q(__body['query']) & __query
+            __body['query'] = __query.to_dict()
+        return __body
+
+    def get_search_template_params(self):
+        """Get params of the stored template.
+
+        :return: Params or None if the search can't be executed through
+            the template.
+        :rtype: dict
+        """
+        __body = super(TemplatedSearch, self).to_dict()
+        __params = dict(self._search_template['params'])
+        __params['query'] = __body.pop('query', {'match_all': {}})
+        for __key, __value in __body.items():
+            if __key not in SEARCH_TEMPLATE_BODY_KEYS:
+                return None
+            __params[__key] = __value
+            __params['has_{}'.format(__key)] = True
+        return __params
+
+    def execute(self, ignore_cache=False):
+        """Execute the search through the stored template.
+
+        :param ignore_cache: If set to True, consecutive calls will hit
+            Elasticsearch.
+        :type ignore_cache: bool
+        :return:
+        :rtype: elasticsearch_dsl.response.Response
+        """
+        if self._search_template is None:
+            return super(TemplatedSearch, self).execute(ignore_cache)
+
+        if ignore_cache or not hasattr(self, '_response'):
+            __params = self.get_search_template_params()
+            if __params is None:
+                return super(TemplatedSearch, self).execute(ignore_cache)
+
+            es = get_connection(self._using)
+            try:
+                __raw = es.search_template(
+                    index=self._index,
+                    body={
+                        'id': self._search_template['id'],
+                        'params': __params,
+                    },
+                    **self._params
+                )
+            except NotFoundError as err:
+                if err.error != 'resource_not_found_exception':
+                    raise
+                LOGGER.warning(
+                    "Search template %s is not registered, executing the "
+                    "search query",
+                    self._search_template['id']
+                )
+                return super(TemplatedSearch, self).execute(True)
+            self._response = self._response_class(self, __raw)
+        return self._response
+
+
+@lru_cache(maxsize=None)
+def _get_templated_search_class(search_class, templated_search_class):
+    if issubclass(search_class, templated_search_class):
+        return search_class
+    if search_class is Search:
+        return templated_search_class
+    return type(
+        'Templated{}'.format(search_class.__name__),
+        (search_class, templated_search_class),
+        {}
+    )
+
+
+def get_templated_search_class(search_class,
+                               templated_search_class=TemplatedSearch):
+    """Get templated search class of the search class given.
+
+    Templated search class is a subclass of both, with the templated search
+    class right before the `Search` in the MRO. Thus, searches are still
+    executed by the search class given (for instance,
+    `django_elasticsearch_dsl_drf.coalescing.CoalescingSearch`), which
+    sends them through the template.
+
+    :param search_class: Search class.
+    :param templated_search_class: Templated search class.
+    :type search_class: type
+    :type templated_search_class: type
+    :return:
+    :rtype: type
+    """
+    return _get_templated_search_class(search_class, templated_search_class)
+
+
+class SearchTemplateBackend(BaseSearchFilterBackend):
+    """Search template backend.
+
+    Search queries (the same as of the `CompoundSearchFilterBackend`, or
+    of the other query backends given in `query_backends`) are registered
+    in Elasticsearch as stored mustache templates at deploy time (see the
+    `elasticsearch_register_search_templates` management command). On
+    request, only the id of the template and the params (search term and
+    the rest of the search body, such as filters, sorting and pagination)
+    are sent to the `_search/template` endpoint. Stored templates can be
+    tuned in Elasticsearch directly.
+
+    Templates are registered per view and shape of the search term: one
+    for the search term without field prefix and one per field prefix
+    (`?search=title:lorem`). Searches of other shapes (for instance,
+    multiple search terms) are executed as they are.
+
+    Example:
+
+        >>> from django_elasticsearch_dsl_drf.filter_backends import (
+        >>>     SearchTemplateBackend
+        >>> )
+        >>> from django_elasticsearch_dsl_drf.viewsets import (
+        >>>     BaseDocumentViewSet,
+        >>> )
+        >>>
+        >>> # Local book document definition
+        >>> from .documents import BookDocument
+        >>>
+        >>> # Local book document serializer
+        >>> from .serializers import BookDocumentSerializer
+        >>>
+        >>> class BookDocumentView(BaseDocumentViewSet):
+        >>>
+        >>>     document = BookDocument
+        >>>     serializer_class = BookDocumentSerializer
+        >>>     filter_backends = [SearchTemplateBackend,]
+        >>>     search_fields = {
+        >>>         'title': {'boost': 4},
+        >>>         'summary': None,
+        >>>     }
+    """
+
+    query_backends = [
+        MatchQueryBackend,
+        NestedQueryBackend,
+    ]
+
+    # Prefix of the ids of the stored templates
+    search_template_prefix = ''
+
+    def get_search_template_id(self, view, shape):
+        """Get id of the stored template.
+
+        :param view: View.
+        :param shape: Shape of the search terms.
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :type shape: tuple
+        :return:
+        :rtype: str
+        """
+        __parts = [
+            self.search_template_prefix,
+            view.__class__.__module__,
+            view.__class__.__name__,
+            self.__class__.__name__,
+        ]
+        __parts.extend(__field for __field in shape if __field is not None)
+        return '.'.join(__part for __part in __parts if __part)
+
+    def get_search_template_shapes(self, view):
+        """Get shapes of the search terms to register templates for.
+
+        :param view: View.
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :return:
+        :rtype: list
+        """
+        __shapes = [(None,)]
+        for __field in getattr(view, 'search_fields', None) or []:
+            __shapes.append((__field,))
+        for __label in getattr(view, 'search_nested_fields', None) or {}:
+            if (__label,) not in __shapes:
+                __shapes.append((__label,))
+        return __shapes
+
+    def get_search_template_source(self, request, view, shape):
+        """Get source of the stored (mustache) template.
+
+        :param request: Django REST framework request.
+        :param view: View.
+        :param shape: Shape of the search terms.
+        :type request: rest_framework.request.Request
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :type shape: tuple
+        :return:
+        :rtype: str
+        """
+        __queries = compile_query_template(
+            request,
+            view,
+            self,
+            self._get_query_backends(request, view),
+            shape
+        ).to_mustache()
+
+        __source = ['{']
+        for __key in SEARCH_TEMPLATE_BODY_KEYS:
+            __source.append(
+                '{{{{#has_{key}}}}}"{key}": {{{{#toJson}}}}{key}'
+                '{{{{/toJson}}}},{{{{/has_{key}}}}}'.format(key=__key)
+            )
+        __source.append(
+            '"query": {{"bool": {{"must": [{{{{#toJson}}}}query'
+            '{{{{/toJson}}}}, {{"bool": {{{matching}: {queries}}}}}]}}}}'
+            ''.format(
+                matching=json.dumps(self.matching),
+                queries=__queries
+            )
+        )
+        __source.append('}')
+        return '\n'.join(__source)
+
+    def register_search_templates(self, view):
+        """Register stored templates of the view.
+
+        :param view: View.
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :return: Ids of the registered templates.
+        :rtype: list
+        """
+        __ids = []
+        for __shape in self.get_search_template_shapes(view):
+            __id = self.get_search_template_id(view, __shape)
+            view.client.put_script(
+                id=__id,
+                body={
+                    'script': {
+                        'lang': 'mustache',
+                        'source': self.get_search_template_source(
+                            None,
+                            view,
+                            __shape
+                        ),
+                    }
+                }
+            )
+            __ids.append(__id)
+        return __ids
+
+    def filter_queryset(self, request, queryset, view):
+        """Filter the queryset.
+
+        :param request: Django REST framework request.
+        :param queryset: Base queryset.
+        :param view: View.
+        :type request: rest_framework.request.Request
+        :type queryset: elasticsearch_dsl.search.Search
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :return: Updated queryset.
+        :rtype: elasticsearch_dsl.search.Search
+        """
+        __search_terms = self.get_search_query_params(request)
+        __shape = get_search_terms_shape(self, __search_terms)
+        if not __search_terms \
+                or __shape not in self.get_search_template_shapes(view):
+            return super(SearchTemplateBackend, self).filter_queryset(
+                request,
+                queryset,
+                view
+            )
+
+        __query_backends = self._get_query_backends(request, view)
+        __params = dict(
+            ('search_term_{}'.format(__index), __value)
+            for __index, __value
+            in enumerate(get_search_terms_values(__search_terms, __shape))
+        )
+        return TemplatedSearch.from_search(
+            queryset,
+            {
+                'id': self.get_search_template_id(view, __shape),
+                'params': __params,
+                'query': Q(
+                    'bool',
+                    **{
+                        self.matching: self.construct_queries(
+                            request,
+                            view,
+                            __query_backends
+                        )
+                    }
+                ),
+            }
+        )
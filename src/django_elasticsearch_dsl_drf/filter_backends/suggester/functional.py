@@ -77,6 +77,7 @@ from django_elasticsearch_dsl_drf.constants import (
     ALL_FUNCTIONAL_SUGGESTERS,
 )
 from django_elasticsearch_dsl_drf.utils import EmptySearch
+from django_elasticsearch_dsl_drf.query_params import get_query_params
 
 from rest_framework.exceptions import ValidationError
 from rest_framework.filters import BaseFilterBackend
@@ -312,22 +313,11 @@ class FunctionalSuggesterFilterBackend(BaseFilterBackend, FilterBackendMixin):
         :return: Request query params to filter on.
         :rtype: dict
         """
-        query_params = request.query_params.copy()
-
         suggester_query_params = {}
         suggester_fields = self.prepare_suggester_fields(view)
-        for query_param in query_params:
-            query_param_list = self.split_lookup_filter(
-                query_param,
-                maxsplit=1
-            )
-            field_name = query_param_list[0]
-
+        for query_param, field_name, suggester_param, values \
+                in get_query_params(request):
             if field_name in suggester_fields:
-                suggester_param = None
-                if len(query_param_list) > 1:
-                    suggester_param = query_param_list[1]
-
                 valid_suggesters = suggester_fields[field_name]['suggesters']
 
                 suggester_options = {}
@@ -351,13 +341,6 @@ class FunctionalSuggesterFilterBackend(BaseFilterBackend, FilterBackendMixin):
                             and default_suggester is not None:
                         suggester_param = str(default_suggester)
 
-                    values = [
-                        __value.strip()
-                        for __value
-                        in query_params.getlist(query_param)
-                        if __value.strip() != ''
-                    ]
-
                     # If specific field given, use that. Otherwise,
                     # fall back to the top level field name.
                     if 'serializer_field' in suggester_fields[field_name]:
@@ -75,6 +75,9 @@ from django_elasticsearch_dsl_drf.constants import (
     SUGGESTER_COMPLETION,
     ALL_SUGGESTERS,
 )
+from django_elasticsearch_dsl_drf.suggestion_cache import get_suggestion_cache
+from django_elasticsearch_dsl_drf.versions import ELASTICSEARCH_GTE_6_0
+from django_elasticsearch_dsl_drf.query_params import get_query_params
 
 from rest_framework.filters import BaseFilterBackend
 
@@ -150,10 +153,32 @@ class SuggesterFilterBackend(BaseFilterBackend, FilterBackendMixin):
         >>>             'suggesters': [
         >>>                 SUGGESTER_COMPLETION,
         >>>             ],
+        >>>             # Serve completions for prefixes of up to 2
+        >>>             # characters from the in-process cache.
+        >>>             'cache': {
+        >>>                 'max_prefix_length': 2,
+        >>>                 'timeout': 300,
+        >>>             },
         >>>         },
         >>>     }
+
+    Completion suggestions of the fields having the `cache` option set
+    (either True or a dictionary of `SuggestionCache` options) are served
+    from the in-process cache for short prefixes. The cache is warmed on
+    first use (one request for all single character prefixes), re-warmed
+    after `timeout` seconds or when the indexed model changes and filled
+    with other short prefixes as they are requested. Longer prefixes, which
+    extend a prefix having fewer options than the `size` requested, are
+    answered by filtering those options locally. Suggesters using
+    contexts are never cached.
     """
 
+    # Max number of suggesters per request when warming the cache
+    suggestion_cache_chunk_size = 100
+
+    # Default `size` of the `completion` suggester in Elasticsearch
+    completion_default_size = 5
+
     @classmethod
     def prepare_suggester_fields(cls, view):
         """Prepare filter fields.
@@ -272,14 +297,14 @@ class SuggesterFilterBackend(BaseFilterBackend, FilterBackendMixin):
         :return:
         """
         contexts = {}
-        query_params = request.query_params.copy()
+        query_params = get_query_params(request)
 
         # Processing `category` filters:
         for query_param, context_field \
                 in field['completion_options'].get('category_filters',
                                                    {}).items():
             context_field_query = defaultdict(list)
-            for context_field_value in query_params.getlist(query_param, []):
+            for context_field_value in query_params.getlist(query_param):
                 context_field_value_parts = cls.split_lookup_filter(
                     context_field_value,
                     maxsplit=2
@@ -324,7 +349,7 @@ class SuggesterFilterBackend(BaseFilterBackend, FilterBackendMixin):
         for query_param, context_field \
                 in field['completion_options'].get('geo_filters', {}).items():
             context_field_query = defaultdict(list)
-            for context_field_value in query_params.getlist(query_param, []):
+            for context_field_value in query_params.getlist(query_param):
                 context_field_value_parts = cls.split_lookup_filter(
                     context_field_value,
                     maxsplit=3
@@ -443,6 +468,136 @@ class SuggesterFilterBackend(BaseFilterBackend, FilterBackendMixin):
             completion=completion_kwargs
         )
 
+    @classmethod
+    def fetch_suggester_completion(cls, queryset, options, prefixes):
+        """Fetch `completion` suggester options for a number of prefixes.
+
+        Prefixes are queried in as few requests as possible (up to
+        `suggestion_cache_chunk_size` suggesters per request).
+
+        :param queryset: Original queryset.
+        :param options: Filter options.
+        :param prefixes: Prefixes to fetch suggestions for.
+        :type queryset: elasticsearch_dsl.search.Search
+        :type options: dict
+        :type prefixes: list
+        :return: Suggester options per prefix.
+        :rtype: dict
+        """
+        suggestions = {}
+        __chunk_size = cls.suggestion_cache_chunk_size
+        for __start in range(0, len(prefixes), __chunk_size):
+            __prefixes = prefixes[__start:__start + __chunk_size]
+            __queryset = queryset.extra(size=0)
+            # Drop the suggesters of the current request
+            __queryset._suggest = {}
+            for __index, __prefix in enumerate(__prefixes):
+                __queryset = cls.apply_suggester_completion(
+                    'prefix_{}'.format(__index),
+                    __queryset,
+                    options,
+                    __prefix
+                )
+
+            if ELASTICSEARCH_GTE_6_0:
+                __response = __queryset.execute().to_dict().get('suggest', {})
+            else:
+                __response = __queryset.execute_suggest().to_dict()
+
+            for __index, __prefix in enumerate(__prefixes):
+                __suggestions = __response.get('prefix_{}'.format(__index))
+                suggestions[__prefix] = (
+                    __suggestions[0]['options'] if __suggestions else []
+                )
+
+        return suggestions
+
+    @classmethod
+    def get_suggester_completion_cache(cls, options, view):
+        """Get the suggestion cache for the `completion` suggester.
+
+        :param options: Filter options.
+        :param view: View.
+        :type options: dict
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :return: Suggestion cache or None if suggestions can't be cached.
+        :rtype: django_elasticsearch_dsl_drf.suggestion_cache.SuggestionCache
+        """
+        if not options.get('cache') or 'contexts' in options:
+            return None
+
+        cache_options = {}
+        if isinstance(options['cache'], dict):
+            cache_options.update(options['cache'])
+        for __option in ('size', 'skip_duplicates'):
+            if __option in options:
+                cache_options[__option] = options[__option]
+
+        return get_suggestion_cache(
+            view.index,
+            options['field'],
+            model=view.document.django.model,
+            **cache_options
+        )
+
+    @classmethod
+    def get_cached_suggester_completion(cls, queryset, options, value, view):
+        """Get cached `completion` suggestions.
+
+        :param queryset: Original queryset.
+        :param options: Filter options.
+        :param value: value to filter on.
+        :param view: View.
+        :type queryset: elasticsearch_dsl.search.Search
+        :type options: dict
+        :type value: str
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :return: Suggestions in the format of the Elasticsearch response
+            or None if suggestions are not cached for the field.
+        :rtype: list
+        """
+        cache = cls.get_suggester_completion_cache(options, view)
+        if cache is None:
+            return None
+
+        if cache.is_stale():
+            cache.warm(
+                lambda prefixes: cls.fetch_suggester_completion(
+                    queryset,
+                    options,
+                    prefixes
+                )
+            )
+
+        suggester_options = cache.get(value)
+
+        # Value extends a prefix, all completions of which are known
+        if suggester_options is None:
+            suggester_options = cache.get_extension(
+                value,
+                options.get('size', cls.completion_default_size)
+            )
+
+        if suggester_options is None:
+            suggester_options = cls.fetch_suggester_completion(
+                queryset,
+                options,
+                [value]
+            )[value]
+            if cache.is_cacheable(value):
+                cache.set(value, suggester_options)
+            else:
+                cache.remember(value, suggester_options)
+
+        return [
+            {
+                'text': value,
+                'offset': 0,
+                'length': len(value),
+                'options': suggester_options,
+            }
+        ]
+
     def get_suggester_query_params(self, request, view):
         """Get query params to be for suggestions.
 
@@ -453,22 +608,11 @@ class SuggesterFilterBackend(BaseFilterBackend, FilterBackendMixin):
         :return: Request query params to filter on.
         :rtype: dict
         """
-        query_params = request.query_params.copy()
-
         suggester_query_params = {}
         suggester_fields = self.prepare_suggester_fields(view)
-        for query_param in query_params:
-            query_param_list = self.split_lookup_filter(
-                query_param,
-                maxsplit=1
-            )
-            field_name = query_param_list[0]
-
+        for query_param, field_name, suggester_param, values \
+                in get_query_params(request):
             if field_name in suggester_fields:
-                suggester_param = None
-                if len(query_param_list) > 1:
-                    suggester_param = query_param_list[1]
-
                 valid_suggesters = suggester_fields[field_name]['suggesters']
 
                 # If we have default suggester given use it as a default and
@@ -487,13 +631,6 @@ class SuggesterFilterBackend(BaseFilterBackend, FilterBackendMixin):
                             and default_suggester is not None:
                         suggester_param = str(default_suggester)
 
-                    values = [
-                        __value.strip()
-                        for __value
-                        in query_params.getlist(query_param)
-                        if __value.strip() != ''
-                    ]
-
                     if values:
                         _sf = suggester_fields[field_name]
                         suggester_query_params[query_param] = {
@@ -517,6 +654,10 @@ class SuggesterFilterBackend(BaseFilterBackend, FilterBackendMixin):
                                         _sf['options']['skip_duplicates']
                                 })
 
+                        if 'cache' in _sf:
+                            suggester_query_params[query_param]['cache'] = \
+                                _sf['cache']
+
                         if (
                             suggester_param == SUGGESTER_COMPLETION
                             and 'completion_options' in _sf
@@ -555,6 +696,11 @@ class SuggesterFilterBackend(BaseFilterBackend, FilterBackendMixin):
             return queryset
 
         suggester_query_params = self.get_suggester_query_params(request, view)
+
+        # Suggestions served from the in-process cache, picked up by the
+        # ``suggest`` action.
+        view.cached_suggestions = {}
+
         for suggester_name, options in suggester_query_params.items():
             # We don't have multiple values here.
             for value in options['values']:
@@ -574,6 +720,17 @@ class SuggesterFilterBackend(BaseFilterBackend, FilterBackendMixin):
 
                 # `completion` suggester
                 elif options['suggester'] == SUGGESTER_COMPLETION:
+                    __suggestions = self.get_cached_suggester_completion(
+                        queryset,
+                        options,
+                        value,
+                        view
+                    )
+                    if __suggestions is not None:
+                        view.cached_suggestions[suggester_name] = \
+                            __suggestions
+                        continue
+
                     queryset = self.apply_suggester_completion(suggester_name,
                                                                queryset,
                                                                options,
@@ -0,0 +1,371 @@
+"""
+Geo-spatial helpers.
+
+Parsing, validation and simplification of coordinates passed in the query
+params of the geo-spatial filter backends.
+
+Supported encodings of a list of points:
+
+- Plain: ``40,-70__30,-80__20,-90`` (lat,lon pairs, the default).
+- Encoded polyline: ``polyline:_p~iF~ps|U_ulLnnqC_mqNvxq`@`` (Google
+  encoded polyline algorithm format, lat/lon order, precision 5).
+- GeoJSON: ``geojson:{"type": "Polygon", "coordinates": [...]}`` or simply
+  a GeoJSON object starting with ``{`` (lon/lat order, as GeoJSON mandates).
+"""
+
+import json
+import math
+import re
+
+from .constants import (
+    GEOJSON_DEPTHS,
+    GEO_ENCODING_GEOJSON_PREFIX,
+    GEO_ENCODING_POLYLINE_PREFIX,
+    GEO_MAX_VERTICES,
+    SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE,
+    SEPARATOR_LOOKUP_COMPLEX_VALUE,
+)
+
+__title__ = 'django_elasticsearch_dsl_drf.geo_helpers'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'close_ring',
+    'decode_polyline',
+    'flatten_points',
+    'is_encoded_value',
+    'parse_geojson',
+    'parse_lat_lon_pairs',
+    'simplify_points',
+    'split_encoded_value',
+    'validate_lat_lon',
+)
+
+
+def parse_lat_lon_pairs(values, max_vertices=GEO_MAX_VERTICES):
+    """Parse a list of ``lat,lon`` strings into a list of ``[lat, lon]``.
+
+    :param values: List of strings, each holding a single ``lat,lon`` pair.
+    :param max_vertices: Maximum number of points allowed. None for no limit.
+    :type values: list
+    :type max_vertices: int
+    :return: List of ``[lat, lon]`` pairs.
+    :rtype: list
+    :raise ValueError: On malformed values or too many points.
+    """
+    if max_vertices is not None and len(values) > max_vertices:
+        raise ValueError(
+            "Too many points: {} (max {})".format(len(values), max_vertices)
+        )
+    points = []
+    for value in values:
+        point = list(map(
+            float,
+            value.split(SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE)
+        ))
+        if len(point) != 2:
+            raise ValueError(
+                "Point {!r} shall consist of exactly two values".format(value)
+            )
+        points.append(point)
+    return points
+
+
+def validate_lat_lon(points, lon_first=False):
+    """Validate latitude and longitude ranges of the points given.
+
+    :param points: List of two-element points.
+    :param lon_first: If True, points are in ``[lon, lat]`` (GeoJSON) order.
+    :type points: list
+    :type lon_first: bool
+    :return: Points given.
+    :rtype: list
+    :raise ValueError: If any of the values is out of range (or is not
+        finite).
+    """
+    if not points:
+        return points
+    lat_idx, lon_idx = (1, 0) if lon_first else (0, 1)
+    try:
+        lats = [float(point[lat_idx]) for point in points]
+        lons = [float(point[lon_idx]) for point in points]
+    except (TypeError, IndexError):
+        raise ValueError("Each point shall consist of two numbers")
+    if not all(map(math.isfinite, lats + lons)):
+        raise ValueError("Coordinates shall be finite numbers")
+    if min(lats) < -90.0 or max(lats) > 90.0:
+        raise ValueError("Latitude shall be within [-90, 90]")
+    if min(lons) < -180.0 or max(lons) > 180.0:
+        raise ValueError("Longitude shall be within [-180, 180]")
+    return points
+
+
+def decode_polyline(value, precision=5, max_vertices=GEO_MAX_VERTICES):
+    """Decode a Google encoded polyline.
+
+    :param value: Encoded polyline.
+    :param precision: Number of decimals used when encoding.
+    :param max_vertices: Maximum number of points allowed. None for no limit.
+    :type value: str
+    :type precision: int
+    :type max_vertices: int
+    :return: List of ``[lat, lon]`` pairs.
+    :rtype: list
+    :raise ValueError: On malformed input or too many points.
+    """
+    factor = float(10 ** precision)
+    numbers = []
+    shift = result = 0
+    for char in value:
+        byte = ord(char) - 63
+        if byte < 0 or byte > 63:
+            raise ValueError("Invalid polyline character {!r}".format(char))
+        result |= (byte & 0x1f) << shift
+        shift += 5
+        if byte < 0x20:
+            numbers.append(~(result >> 1) if result & 1 else result >> 1)
+            shift = result = 0
+            if (
+                max_vertices is not None
+                and len(numbers) > 2 * max_vertices
+            ):
+                raise ValueError(
+                    "Too many points (max {})".format(max_vertices)
+                )
+    if shift or len(numbers) % 2:
+        raise ValueError("Truncated polyline")
+
+    points = []
+    lat = lon = 0
+    for d_lat, d_lon in zip(numbers[0::2], numbers[1::2]):
+        lat += d_lat
+        lon += d_lon
+        points.append([lat / factor, lon / factor])
+    return points
+
+
+def _is_point(value):
+    """Check if value is a point (list of at least two numbers).
+
+    :param value:
+    :rtype: bool
+    """
+    return (
+        isinstance(value, (list, tuple))
+        and len(value) >= 2
+        and all(
+            isinstance(__v, (int, float)) and not isinstance(__v, bool)
+            for __v in value
+        )
+    )
+
+
+def _has_depth(coordinates, depth):
+    """Check if coordinates are lists of points nested `depth` levels.
+
+    :param coordinates: GeoJSON coordinates.
+    :param depth: Depth (1 for a single point).
+    :type coordinates: list
+    :type depth: int
+    :rtype: bool
+    """
+    stack = [(coordinates, depth)]
+    while stack:
+        item, item_depth = stack.pop()
+        if item_depth == 1:
+            if not _is_point(item):
+                return False
+        elif isinstance(item, (list, tuple)):
+            stack.extend((__i, item_depth - 1) for __i in item)
+        else:
+            return False
+    return True
+
+
+def parse_geojson(value):
+    """Parse a GeoJSON geometry (or a feature holding a geometry).
+
+    Structure of the coordinates of the geometries (`GEOJSON_DEPTHS`) is
+    validated.
+
+    :param value: GeoJSON string.
+    :type value: str
+    :return: GeoJSON geometry.
+    :rtype: dict
+    :raise ValueError: On malformed input.
+    """
+    try:
+        geometry = json.loads(value)
+    except RecursionError:
+        raise ValueError("GeoJSON is nested too deep")
+    if isinstance(geometry, dict) and geometry.get('type') == 'Feature':
+        geometry = geometry.get('geometry')
+    if not isinstance(geometry, dict):
+        raise ValueError("GeoJSON geometry object expected")
+    if not isinstance(geometry.get('type'), str) \
+            or not isinstance(geometry.get('coordinates'), list):
+        raise ValueError(
+            "GeoJSON geometry shall have type (string) and coordinates (list)"
+        )
+    depth = GEOJSON_DEPTHS.get(geometry['type'].lower())
+    if depth is not None and not _has_depth(geometry['coordinates'], depth):
+        raise ValueError(
+            "Malformed coordinates of the GeoJSON {}".format(geometry['type'])
+        )
+    return geometry
+
+
+def close_ring(points):
+    """Close the ring (make the last point equal to the first one).
+
+    :param points: List of points.
+    :type points: list
+    :return: Closed ring.
+    :rtype: list
+    """
+    if points and points[0] != points[-1]:
+        return points + [list(points[0])]
+    return points
+
+
+def _sq_segment_distance(point, start, end):
+    """Squared distance from the point to the segment (planar)."""
+    x, y = point[0], point[1]
+    x1, y1 = start[0], start[1]
+    dx, dy = end[0] - x1, end[1] - y1
+    if dx or dy:
+        t = ((x - x1) * dx + (y - y1) * dy) / (dx * dx + dy * dy)
+        if t > 1:
+            x1, y1 = end[0], end[1]
+        elif t > 0:
+            x1 += dx * t
+            y1 += dy * t
+    dx, dy = x - x1, y - y1
+    return dx * dx + dy * dy
+
+
+def simplify_points(points, tolerance):
+    """Simplify a line (or a ring) using the Douglas-Peucker algorithm.
+
+    Iterative implementation (no recursion limits on large inputs). The
+    first and the last points are always kept, thus closed rings stay
+    closed.
+
+    :param points: List of two-element points.
+    :param tolerance: Tolerance in coordinate units (degrees).
+    :type points: list
+    :type tolerance: float
+    :return: Simplified list of points.
+    :rtype: list
+    """
+    if not tolerance or len(points) < 3:
+        return points
+
+    sq_tolerance = tolerance * tolerance
+    last = len(points) - 1
+    keep = [False] * len(points)
+    keep[0] = keep[last] = True
+    stack = [(0, last)]
+    while stack:
+        first, last = stack.pop()
+        max_sq_dist = 0.0
+        index = None
+        for idx in range(first + 1, last):
+            sq_dist = _sq_segment_distance(
+                points[idx], points[first], points[last]
+            )
+            if sq_dist > max_sq_dist:
+                index = idx
+                max_sq_dist = sq_dist
+        if index is not None and max_sq_dist > sq_tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def is_encoded_value(value):
+    """Check if value is an encoded (polyline or GeoJSON) value.
+
+    :param value:
+    :type value: str
+    :rtype: bool
+    """
+    return (
+        value.startswith(GEO_ENCODING_POLYLINE_PREFIX)
+        or value.startswith(GEO_ENCODING_GEOJSON_PREFIX)
+        or value.startswith('{')
+    )
+
+
+def split_encoded_value(value, option_names):
+    """Split encoded value into the encoded part and trailing options.
+
+    Encoded polylines may contain the ``__`` separator, thus the value can't
+    simply be split on it. Instead, recognised options (``name,value``) are
+    stripped from the end of the value.
+
+    Example:
+
+        >>> split_encoded_value(
+        >>>     'polyline:_p~iF~ps|U_ulLnnqC___name,myname',
+        >>>     ('_name',)
+        >>> )
+        ('polyline:_p~iF~ps|U_ulLnnqC', {'_name': 'myname'})
+
+    :param value: Value to split.
+    :param option_names: Recognised option names.
+    :type value: str
+    :type option_names: iterable
+    :return: Encoded part and options dictionary.
+    :rtype: tuple
+    """
+    option_start = '{sep}(?:{names}){multi}'.format(
+        sep=re.escape(SEPARATOR_LOOKUP_COMPLEX_VALUE),
+        names='|'.join(re.escape(name) for name in option_names),
+        multi=re.escape(SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE),
+    )
+    option = '{start}[^{multi}]*?(?=(?:{start})|$)'.format(
+        start=option_start,
+        multi=re.escape(SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE),
+    )
+    match = re.match(
+        r'^(?P<encoded>.*?)(?P<options>(?:{})*)$'.format(option),
+        value,
+        re.DOTALL
+    )
+    options = {}
+    for item in re.findall(option, match.group('options')):
+        name, opt_value = item[len(SEPARATOR_LOOKUP_COMPLEX_VALUE):].split(
+            SEPARATOR_LOOKUP_COMPLEX_MULTIPLE_VALUE, 1
+        )
+        options[name] = opt_value
+    return match.group('encoded'), options
+
+
+def flatten_points(coordinates):
+    """Flatten (possibly nested) GeoJSON coordinates into a list of points.
+
+    :param coordinates: GeoJSON coordinates.
+    :type coordinates: list
+    :return: List of points.
+    :rtype: list
+    :raise ValueError: If the coordinates are not (nested) lists of points.
+    """
+    points = []
+    stack = [coordinates]
+    while stack:
+        item = stack.pop()
+        if not isinstance(item, (list, tuple)):
+            raise ValueError("GeoJSON coordinates shall be lists of points")
+        if item and isinstance(item[0], (list, tuple)):
+            stack.extend(reversed(item))
+        elif item:
+            if not _is_point(item):
+                raise ValueError(
+                    "Each point shall consist of (at least) two numbers"
+                )
+            points.append(item)
+    return points
@@ -0,0 +1,375 @@
+"""
+Hedged searches.
+
+A single slow shard copy dominates the tail latency. If a search has not
+completed after a delay (a percentile of the recent latencies of the
+connection), a duplicate is sent with a different `preference` (thus,
+likely, hitting other shard copies) and the response arriving first is
+used. Number of duplicates is limited to a fraction of the searches (see
+`HedgedSearchMixin.hedge_budget`).
+
+Requests are sent from a shared pool of threads, only if a worker is idle:
+requests never queue (which would add to their latency and trigger hedges
+of its own). If all workers are busy, searches are executed in the calling
+thread, not hedged.
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import threading
+import time
+import uuid
+
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.connections import get_connection
+
+from .coalescing import get_connection_key
+from .utils import Registry
+
+__title__ = 'django_elasticsearch_dsl_drf.hedging'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'clear_hedge_trackers',
+    'execute_hedged',
+    'get_hedge_preference',
+    'get_hedge_tracker',
+    'HedgedSearch',
+    'HedgedSearchMixin',
+    'HedgeTracker',
+)
+
+# Hedge trackers, key is the connection key (see `get_connection_key`).
+HEDGE_TRACKERS = Registry()
+
+# Executor of the hedged searches (created on first use) and its lock
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+# Max number of the hedged searches in-flight
+MAX_WORKERS = 64
+
+# Idle workers of the executor
+_IDLE_WORKERS = threading.BoundedSemaphore(MAX_WORKERS)
+
+
+def get_executor():
+    """Get executor of the hedged searches.
+
+    :return:
+    :rtype: concurrent.futures.ThreadPoolExecutor
+    """
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=MAX_WORKERS,
+                    thread_name_prefix='hedged-search'
+                )
+    return _EXECUTOR
+
+
+def _submit(func, *args):
+    """Submit the function to the executor, if a worker is idle.
+
+    :return: Future or None if all workers are busy.
+    :rtype: concurrent.futures.Future
+    """
+    if not _IDLE_WORKERS.acquire(blocking=False):
+        return None
+    try:
+        __future = get_executor().submit(func, *args)
+    except Exception:
+        _IDLE_WORKERS.release()
+        raise
+    __future.add_done_callback(lambda __f: _IDLE_WORKERS.release())
+    return __future
+
+
+class HedgeTracker(object):
+    """Latencies and the hedge budget of a connection.
+
+    The hedge delay is the `percentile` of the last `window` latencies
+    (recomputed every `refresh_every` latencies), no less than `min_delay`.
+    Searches are not hedged until `min_samples` latencies are recorded.
+
+    Every search adds `budget` to the hedge tokens (up to `max_tokens`),
+    every hedge takes a token, thus no more than the `budget` fraction of
+    the searches are hedged.
+    """
+
+    def __init__(self,
+                 percentile=95,
+                 window=1000,
+                 min_samples=20,
+                 min_delay=0.005,
+                 budget=0.05,
+                 max_tokens=10,
+                 refresh_every=50):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.budget = budget
+        self.max_tokens = max_tokens
+        self.refresh_every = refresh_every
+        self._latencies = deque(maxlen=window)
+        self._delay = None
+        self._recorded = 0
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency):
+        """Record latency of a search.
+
+        :param latency: Latency (in seconds).
+        :type latency: float
+        """
+        with self._lock:
+            self._latencies.append(latency)
+            self._recorded += 1
+            if self._recorded >= self.refresh_every:
+                self._delay = None
+
+    def get_delay(self):
+        """Get the hedge delay.
+
+        :return: Delay (in seconds) or None if not enough latencies are
+            recorded.
+        :rtype: float
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            if self._delay is None:
+                __latencies = sorted(self._latencies)
+                __index = min(
+                    len(__latencies) - 1,
+                    int(len(__latencies) * self.percentile / 100.0)
+                )
+                self._delay = max(self.min_delay, __latencies[__index])
+                self._recorded = 0
+            return self._delay
+
+    def add_tokens(self):
+        """Add hedge tokens (once per search)."""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.budget)
+
+    def acquire_token(self):
+        """Take a hedge token.
+
+        :return: Whether a token is taken (the search can be hedged).
+        :rtype: bool
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+def get_hedge_tracker(using, operation='search', **options):
+    """Get hedge tracker of the connection.
+
+    :param using: Connection alias or client.
+    :param operation: Operation (API) latencies of which are tracked.
+    :param options: Options of the `HedgeTracker` (used when the tracker
+        is created).
+    :type using: str or elasticsearch.Elasticsearch
+    :type operation: str
+    :return:
+    :rtype: django_elasticsearch_dsl_drf.hedging.HedgeTracker
+    """
+    return HEDGE_TRACKERS.get_or_create(
+        (get_connection_key(using), operation),
+        lambda: HedgeTracker(**options)
+    )
+
+
+def clear_hedge_trackers():
+    """Clear hedge trackers (forget latencies)."""
+    HEDGE_TRACKERS.remove()
+
+
+def get_hedge_preference(preference=None):
+    """Get preference of the duplicate request.
+
+    :param preference: Preference of the request.
+    :type preference: str
+    :return:
+    :rtype: str
+    """
+    if preference:
+        return '{}-hedge'.format(preference)
+    return 'hedge-{}'.format(uuid.uuid4().hex[:8])
+
+
+def _execute_timed(func, preference, tracker=None):
+    """Execute the request, recording the latency.
+
+    :return: Raw response.
+    :rtype: dict
+    """
+    __start = time.monotonic()
+    __raw = func(preference)
+    if tracker is not None:
+        tracker.record(time.monotonic() - __start)
+    return __raw
+
+
+def execute_hedged(tracker, func, preference=None):
+    """Execute the request, hedged if slow.
+
+    :param tracker: Hedge tracker of the connection.
+    :param func: Function executing the request with the `preference`
+        given, returning the raw response.
+    :param preference: Preference of the request.
+    :type tracker: django_elasticsearch_dsl_drf.hedging.HedgeTracker
+    :type func: callable
+    :type preference: str
+    :return: Raw response.
+    :rtype: dict
+    """
+    tracker.add_tokens()
+    __delay = tracker.get_delay()
+    __primary = None
+    if __delay is not None:
+        __primary = _submit(_execute_timed, func, preference, tracker)
+    if __primary is None:
+        # Not enough latencies recorded (or all workers are busy)
+        return _execute_timed(func, preference, tracker)
+
+    __done, __pending = wait([__primary], timeout=__delay)
+    if __done or not tracker.acquire_token():
+        return __primary.result()
+
+    __hedge = _submit(_execute_timed, func, get_hedge_preference(preference))
+    if __hedge is None:
+        return __primary.result()
+
+    __pending = {__primary, __hedge}
+    __error = None
+    while __pending:
+        __done, __pending = wait(__pending, return_when=FIRST_COMPLETED)
+        for __future in __done:
+            if __future.exception() is None:
+                for __other in __pending:
+                    __other.cancel()
+                return __future.result()
+            if __future is __primary or __error is None:
+                __error = __future.exception()
+
+    raise __error
+
+
+class HedgedSearchMixin(object):
+    """Hedged search mixin.
+
+    If the search has not completed after the `hedge_percentile` latency of
+    the connection, it is sent again with a different `preference`. The
+    response arriving first is used, the other one is discarded (in-flight
+    requests can't be cancelled). No more than `hedge_budget` fraction of
+    the searches are hedged.
+    """
+
+    hedge_percentile = 95
+
+    hedge_budget = 0.05
+
+    hedge_min_samples = 20
+
+    hedge_min_delay = 0.005
+
+    def get_hedge_tracker(self, operation='search'):
+        """Get hedge tracker of the connection of the search.
+
+        :param operation: Operation (API) latencies of which are tracked.
+        :type operation: str
+        :return:
+        :rtype: django_elasticsearch_dsl_drf.hedging.HedgeTracker
+        """
+        return get_hedge_tracker(
+            self._using,
+            operation,
+            percentile=self.hedge_percentile,
+            budget=self.hedge_budget,
+            min_samples=self.hedge_min_samples,
+            min_delay=self.hedge_min_delay
+        )
+
+    def _execute_raw_preferred(self, preference=None):
+        """Execute the search (not hedged).
+
+        :param preference: Preference of the search. If not given, the
+            preference of the search (if any) is used.
+        :type preference: str
+        :return: Raw response.
+        :rtype: dict
+        """
+        __search = self.params(preference=preference) if preference \
+            else self._clone()
+        return super(HedgedSearchMixin, __search).execute(
+            ignore_cache=True
+        ).to_dict()
+
+    def execute(self, ignore_cache=False):
+        """Execute the search, hedged if slow.
+
+        :param ignore_cache: If set to True, response of the previous
+            execution of this search is ignored.
+        :type ignore_cache: bool
+        :return:
+        :rtype: elasticsearch_dsl.response.Response
+        """
+        if not ignore_cache and hasattr(self, '_response'):
+            return self._response
+
+        self._response = self._response_class(
+            self,
+            execute_hedged(
+                self.get_hedge_tracker(),
+                self._execute_raw_preferred,
+                self._params.get('preference')
+            )
+        )
+        return self._response
+
+    def execute_get(self, **kwargs):
+        """Get a document (GET API), hedged if slow.
+
+        :param kwargs: Arguments of the GET API (`index`, `id`, etc).
+        :return: Raw response.
+        :rtype: dict
+        """
+        __client = get_connection(self._using)
+        __preference = kwargs.pop('preference', None)
+
+        def __get(preference):
+            if preference:
+                return __client.get(preference=preference, **kwargs)
+            return __client.get(**kwargs)
+
+        return execute_hedged(
+            self.get_hedge_tracker('get'),
+            __get,
+            __preference
+        )
+
+
+class HedgedSearch(HedgedSearchMixin, Search):
+    """Hedged search.
+
+    Example:
+
+        >>> from django_elasticsearch_dsl_drf.hedging import HedgedSearch
+        >>> from django_elasticsearch_dsl_drf.viewsets import (
+        >>>     DocumentViewSet
+        >>> )
+        >>>
+        >>> class BookDocumentViewSet(DocumentViewSet):
+        >>>
+        >>>     document = BookDocument
+        >>>     search_class = HedgedSearch
+    """
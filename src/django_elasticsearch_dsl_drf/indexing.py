@@ -0,0 +1,538 @@
+"""
+Indexing helpers.
+
+Bulk indexing pipeline: the queryset of the document is streamed in
+PK-ordered chunks (keyset pagination), documents are prepared in a process
+pool and sent in bulk requests, with a bounded number of requests
+in-flight. See the `elasticsearch_bulk_index` management command.
+
+Blue/green reindexing: documents are indexed into a new (versioned) index,
+which is warmed with the search queries given and then atomically swapped
+with the previous index behind the index alias (the index name of the
+document, which is the index the views search). See the
+`elasticsearch_reindex` management command.
+"""
+
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+import datetime
+from itertools import chain, islice
+import multiprocessing
+import time
+
+import django
+from django.db import connections
+
+from elasticsearch.exceptions import TransportError
+from elasticsearch.helpers import bulk
+
+from .conditional import bump_index_generation
+from .suggestion_cache import clear_suggestion_caches
+from .viewsets import clear_view_prototypes
+
+__title__ = 'django_elasticsearch_dsl_drf.indexing'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'AdaptiveChunkSize',
+    'bulk_index',
+    'create_versioned_index',
+    'get_versioned_index_name',
+    'iter_pk_chunks',
+    'reindex',
+    'swap_index_alias',
+    'warm_up_index',
+)
+
+
+class AdaptiveChunkSize(object):
+    """Bulk chunk size tuned by the latency of the bulk requests.
+
+    Chunk size grows while the bulk requests are fast (faster than half of
+    the `target_latency` seconds) and is halved when they are slow.
+    """
+
+    def __init__(self,
+                 chunk_size=500,
+                 min_chunk_size=50,
+                 max_chunk_size=5000,
+                 target_latency=1.0):
+        self.chunk_size = chunk_size
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.target_latency = target_latency
+
+    def update(self, chunk_size, latency):
+        """Update chunk size with the latency of a bulk request.
+
+        :param chunk_size: Size of the chunk sent.
+        :param latency: Latency of the bulk request (in seconds).
+        :type chunk_size: int
+        :type latency: float
+        :return: Updated chunk size.
+        :rtype: int
+        """
+        if latency > self.target_latency:
+            self.chunk_size = max(
+                self.min_chunk_size,
+                min(self.chunk_size, chunk_size) // 2
+            )
+        elif latency < self.target_latency / 2 \
+                and chunk_size >= self.chunk_size:
+            self.chunk_size = min(
+                self.max_chunk_size,
+                self.chunk_size + self.chunk_size // 2
+            )
+        return self.chunk_size
+
+
+def _send_chunk(client, chunk, request_timeout):
+    """Send a chunk of actions in a single bulk request.
+
+    :return: Tuple of number of the actions sent and latency.
+    :rtype: tuple
+    """
+    __start = time.monotonic()
+    bulk(
+        client,
+        chunk,
+        chunk_size=len(chunk),
+        request_timeout=request_timeout
+    )
+    return len(chunk), time.monotonic() - __start
+
+
+def iter_pk_chunks(queryset, chunk_size=1000):
+    """Stream primary keys of the queryset in PK-ordered chunks.
+
+    Keyset pagination (`pk__gt` the last primary key of the previous
+    chunk) is used, thus fetching a chunk costs the same, no matter how
+    deep in the table it is.
+
+    :param queryset: Queryset.
+    :param chunk_size: Number of primary keys in a chunk.
+    :type queryset: django.db.models.QuerySet
+    :type chunk_size: int
+    :return: Generator of lists of primary keys.
+    :rtype: generator
+    """
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        __queryset = queryset
+        if last_pk is not None:
+            __queryset = queryset.filter(pk__gt=last_pk)
+        pks = list(__queryset.values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            return
+
+        yield pks
+
+        if len(pks) < chunk_size:
+            return
+        last_pk = pks[-1]
+
+
+def _init_worker(database_names=None):
+    """Set up Django in the process preparing the documents.
+
+    :param database_names: Names of the databases (by alias) of the
+        process submitting the chunks (which could differ from the ones in
+        the settings, e.g. test databases).
+    :type database_names: dict
+    """
+    django.setup()
+    for __alias, __name in (database_names or {}).items():
+        connections[__alias].settings_dict['NAME'] = __name
+
+
+def _prepare_chunk(document,
+                   pks,
+                   index=None,
+                   select_related=None,
+                   prefetch_related=None):
+    """Prepare index actions for the objects with the primary keys given.
+
+    :return: List of actions.
+    :rtype: list
+    """
+    __document = document()
+    queryset = __document.get_queryset().filter(pk__in=pks).order_by('pk')
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+
+    actions = []
+    for __object in queryset:
+        __action = __document._prepare_action(__object, 'index')
+        if index is not None:
+            __action['_index'] = index
+        actions.append(__action)
+    return actions
+
+
+def _iter_prepared_chunks(document,
+                          pk_chunks,
+                          process_count=0,
+                          **kwargs):
+    """Prepare index actions for the chunks of primary keys.
+
+    Chunks are prepared in a pool of `process_count` processes (in the
+    current process, if `process_count` is 0), up to two chunks per
+    process in-flight. Order of the chunks is kept.
+
+    :return: Generator of lists of actions.
+    :rtype: generator
+    """
+    if not process_count:
+        for __pks in pk_chunks:
+            yield _prepare_chunk(document, __pks, **kwargs)
+        return
+
+    # Processes are spawned (not forked), so that database connections of
+    # the current process are not shared with them.
+    with ProcessPoolExecutor(
+        max_workers=process_count,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(
+            {
+                __connection.alias: __connection.settings_dict['NAME']
+                for __connection in connections.all()
+            },
+        )
+    ) as executor:
+        in_flight = deque()
+        for __pks in pk_chunks:
+            in_flight.append(
+                executor.submit(_prepare_chunk, document, __pks, **kwargs)
+            )
+            if len(in_flight) >= process_count * 2:
+                yield in_flight.popleft().result()
+
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def bulk_index(document,
+               index=None,
+               objects=None,
+               thread_count=4,
+               chunk_size=None,
+               request_timeout=60,
+               process_count=0,
+               queryset_chunk_size=1000,
+               select_related=None,
+               prefetch_related=None,
+               progress=None,
+               refresh=True):
+    """Bulk index the objects of the document.
+
+    If `objects` are not given, the queryset of the document
+    (`get_queryset`) is streamed in PK-ordered chunks of
+    `queryset_chunk_size` objects and the documents are prepared in a pool
+    of `process_count` processes. Otherwise, documents are prepared in the
+    current thread.
+
+    Documents prepared are sent in chunks, up to `thread_count` bulk
+    requests in-flight. Chunk size is tuned by the latency of the bulk
+    requests.
+
+    Once indexed, the index is refreshed (documents become searchable) and
+    its generation is bumped (see `django_elasticsearch_dsl_drf.conditional`).
+
+    :param document: Document class.
+    :param index: Name of the index. If not given, index of the document is
+        used.
+    :param objects: Objects to index. If not given, the queryset of the
+        document is used.
+    :param thread_count: Number of bulk requests in-flight.
+    :param chunk_size: Chunk size.
+    :param request_timeout: Timeout of the bulk requests (in seconds).
+    :param process_count: Number of processes preparing the documents. If
+        0, documents are prepared in the current process.
+    :param queryset_chunk_size: Number of objects fetched at once.
+    :param select_related: Related fields to `select_related` when
+        fetching the objects.
+    :param prefetch_related: Related fields to `prefetch_related` when
+        fetching the objects.
+    :param progress: Function called with the number of the indexed
+        documents and the time elapsed (in seconds) after each bulk request.
+    :param refresh: If set to False, the index is not refreshed (for
+        instance, when it's refreshed by the caller).
+    :type document: django_elasticsearch_dsl.Document
+    :type index: str
+    :type objects: iterable
+    :type thread_count: int
+    :type chunk_size: django_elasticsearch_dsl_drf.indexing.
+        AdaptiveChunkSize
+    :type request_timeout: int
+    :type process_count: int
+    :type queryset_chunk_size: int
+    :type select_related: list
+    :type prefetch_related: list
+    :type progress: callable
+    :type refresh: bool
+    :return: Number of the indexed documents.
+    :rtype: int
+    """
+    __start = time.monotonic()
+    __document = document()
+    client = __document._get_connection()
+    if chunk_size is None:
+        chunk_size = AdaptiveChunkSize()
+
+    if objects is None:
+        actions = chain.from_iterable(
+            _iter_prepared_chunks(
+                document,
+                iter_pk_chunks(
+                    __document.get_queryset(),
+                    queryset_chunk_size
+                ),
+                process_count=process_count,
+                index=index,
+                select_related=select_related,
+                prefetch_related=prefetch_related
+            )
+        )
+    else:
+        actions = __document._get_actions(objects, 'index')
+        if index is not None:
+            actions = (
+                dict(__action, _index=index) for __action in actions
+            )
+
+    count = 0
+    with ThreadPoolExecutor(max_workers=thread_count) as executor:
+        in_flight = set()
+        while True:
+            chunk = list(islice(actions, chunk_size.chunk_size))
+            if chunk:
+                in_flight.add(
+                    executor.submit(
+                        _send_chunk,
+                        client,
+                        chunk,
+                        request_timeout
+                    )
+                )
+            if not in_flight:
+                break
+            if chunk and len(in_flight) < thread_count:
+                continue
+
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for __future in done:
+                __count, __latency = __future.result()
+                chunk_size.update(__count, __latency)
+                count += __count
+            if progress is not None:
+                progress(count, time.monotonic() - __start)
+
+    __index = index or document._index._name
+    # Generation shall be bumped once the changes are searchable, otherwise
+    # ETags of the new generation are given to the responses of the old data
+    if refresh:
+        client.indices.refresh(index=__index)
+    bump_index_generation(__index)
+
+    return count
+
+
+def get_versioned_index_name(name):
+    """Get name of a new version of the index.
+
+    :param name: Index name (alias).
+    :type name: str
+    :return:
+    :rtype: str
+    """
+    return '{}-{}'.format(
+        name,
+        datetime.datetime.utcnow().strftime('%Y%m%d%H%M%S%f')
+    )
+
+
+def create_versioned_index(index, using=None):
+    """Create a new version of the index.
+
+    Refreshing and replicas are disabled while the index is loaded (see
+    `reindex`).
+
+    :param index: Index.
+    :param using: Connection alias.
+    :type index: elasticsearch_dsl.Index
+    :type using: str
+    :return: New index.
+    :rtype: elasticsearch_dsl.Index
+    """
+    new_index = index.clone(name=get_versioned_index_name(index._name))
+    new_index.create(using=using)
+    new_index.put_settings(
+        using=using,
+        body={'index': {'refresh_interval': '-1', 'number_of_replicas': 0}}
+    )
+    return new_index
+
+
+def warm_up_index(client, index, queries):
+    """Warm up the index with the search queries given.
+
+    :param client: Elasticsearch client.
+    :param index: Index name.
+    :param queries: Search bodies.
+    :type client: elasticsearch.Elasticsearch
+    :type index: str
+    :type queries: list
+    :return: Tuple of two lists with succeeded and failed queries.
+    :rtype: tuple
+    """
+    _ok = []
+    _fail = []
+    for __query in queries:
+        try:
+            client.search(index=index, body=__query, request_cache=True)
+        except TransportError:
+            _fail.append(__query)
+        else:
+            _ok.append(__query)
+    return _ok, _fail
+
+
+def swap_index_alias(client, alias, index, delete_old=False):
+    """Point the alias to the index given (atomically).
+
+    If the alias is a concrete index (not yet managed by the aliases), it is
+    removed in the same request.
+
+    :param client: Elasticsearch client.
+    :param alias: Alias name.
+    :param index: Index name.
+    :param delete_old: If set to True, indices the alias pointed to before
+        are deleted.
+    :type client: elasticsearch.Elasticsearch
+    :type alias: str
+    :type index: str
+    :type delete_old: bool
+    :return: Indices the alias pointed to before.
+    :rtype: list
+    """
+    actions = []
+    old_indices = []
+    if client.indices.exists_alias(name=alias):
+        old_indices = [
+            __index for __index in client.indices.get_alias(name=alias)
+            if __index != index
+        ]
+        actions.extend(
+            {'remove': {'index': __index, 'alias': alias}}
+            for __index in old_indices
+        )
+    elif client.indices.exists(index=alias):
+        actions.append({'remove_index': {'index': alias}})
+    actions.append({'add': {'index': index, 'alias': alias}})
+    client.indices.update_aliases(body={'actions': actions})
+
+    if delete_old:
+        for __index in old_indices:
+            client.indices.delete(index=__index, ignore=404)
+
+    clear_view_prototypes()
+    clear_suggestion_caches(alias)
+    bump_index_generation(alias)
+
+    return old_indices
+
+
+def reindex(index,
+            documents,
+            warm_up_queries=None,
+            delete_old=False,
+            thread_count=4,
+            chunk_size=None,
+            request_timeout=60,
+            **options):
+    """Blue/green reindex.
+
+    Documents are indexed into a new version of the index, which is then
+    refreshed, warmed up and swapped with the previous version behind the
+    alias (name of the index). Changes made to the objects while the index
+    is loaded are not in the new version; re-index them (or the documents
+    updated since the start) afterwards.
+
+    :param index: Index.
+    :param documents: Documents of the index.
+    :param warm_up_queries: Search bodies to warm up the index with.
+    :param delete_old: If set to True, previous versions are deleted.
+    :param thread_count: Number of bulk requests in-flight.
+    :param chunk_size: Chunk size.
+    :param request_timeout: Timeout of the bulk requests (in seconds).
+    :param options: Other options of the `bulk_index` (`process_count`,
+        `queryset_chunk_size`, etc).
+    :type index: elasticsearch_dsl.Index
+    :type documents: list
+    :type warm_up_queries: list
+    :type delete_old: bool
+    :type thread_count: int
+    :type chunk_size: django_elasticsearch_dsl_drf.indexing.
+        AdaptiveChunkSize
+    :type request_timeout: int
+    :return: Dictionary with name of the new index, number of the indexed
+        documents, previous indices and failed warm up queries.
+    :rtype: dict
+    """
+    alias = index._name
+    client = index._get_connection()
+    new_index = create_versioned_index(index)
+
+    count = 0
+    try:
+        for __document in documents:
+            count += bulk_index(
+                __document,
+                index=new_index._name,
+                thread_count=thread_count,
+                chunk_size=chunk_size,
+                request_timeout=request_timeout,
+                refresh=False,
+                **options
+            )
+
+        __settings = index.to_dict().get('settings', {})
+        new_index.put_settings(
+            body={
+                'index': {
+                    'refresh_interval': __settings.get('refresh_interval'),
+                    'number_of_replicas': __settings.get(
+                        'number_of_replicas'
+                    ),
+                }
+            }
+        )
+        new_index.refresh()
+    except Exception:
+        # Previous version is still in use
+        new_index.delete(ignore=404)
+        raise
+
+    _ok, _fail = warm_up_index(client, new_index._name, warm_up_queries or [])
+    old_indices = swap_index_alias(
+        client,
+        alias,
+        new_index._name,
+        delete_old=delete_old
+    )
+    return {
+        'index': new_index._name,
+        'count': count,
+        'old_indices': old_indices,
+        'failed_warm_up_queries': _fail,
+    }
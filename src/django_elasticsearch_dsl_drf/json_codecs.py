@@ -0,0 +1,340 @@
+"""
+Pluggable JSON codecs.
+
+Both the Elasticsearch transport (search bodies and responses) and the
+Django REST framework rendering are JSON-heavy. The `orjson` or `ujson`
+codecs (if installed) are considerably faster than the standard library
+`json` module.
+
+Example (Elasticsearch transport):
+
+    >>> from django_elasticsearch_dsl_drf.json_codecs import (
+    >>>     FastJSONSerializer
+    >>> )
+    >>> from django_elasticsearch_dsl_drf.viewsets import DocumentViewSet
+    >>>
+    >>> class BookDocumentView(DocumentViewSet):
+    >>>
+    >>>     transport_serializer = FastJSONSerializer
+
+See `django_elasticsearch_dsl_drf.renderers.FastJSONRenderer` for the
+Django REST framework renderer.
+"""
+
+from collections import OrderedDict
+import copy
+import datetime
+import decimal
+import json
+import uuid
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+
+from elasticsearch.exceptions import SerializationError
+from elasticsearch.serializer import Deserializer, JSONSerializer
+from elasticsearch_dsl.connections import connections
+from elasticsearch_dsl.utils import AttrDict, AttrList
+
+from six import string_types
+
+from .compat import orjson, ujson
+from .utils import Registry, ResponseProxy
+
+__title__ = 'django_elasticsearch_dsl_drf.json_codecs'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'clear_clients',
+    'default',
+    'FastJSONSerializer',
+    'get_client',
+    'get_json_codec',
+    'JSONCodec',
+    'ORJSONCodec',
+    'UJSONCodec',
+)
+
+# Clients with custom transport serializers, key is a tuple of connection
+# alias and serializer class.
+CLIENTS = Registry()
+
+
+def default(obj):
+    """Serialize objects unknown to the JSON codecs.
+
+    Elasticsearch DSL `AttrDict` and `AttrList` (and the `ResponseProxy`)
+    are serialized as the dictionaries and lists they wrap (without
+    copying).
+
+    :param obj:
+    :return: JSON serializable object.
+    :raise TypeError: If object can't be serialized.
+    """
+    if isinstance(obj, (AttrDict, ResponseProxy)):
+        return obj.to_dict()
+    elif isinstance(obj, AttrList):
+        return obj._l_
+    elif isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    elif isinstance(obj, decimal.Decimal):
+        return float(obj)
+    elif isinstance(obj, uuid.UUID):
+        return str(obj)
+    elif isinstance(obj, Promise):
+        return force_str(obj)
+    elif isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    elif hasattr(obj, 'tolist'):
+        return obj.tolist()
+
+    raise TypeError(
+        "Object of type {} is not JSON serializable"
+        "".format(obj.__class__.__name__)
+    )
+
+
+class JSONCodec(object):
+    """Standard library `json` codec.
+
+    Output is compact and not ASCII-escaped.
+    """
+
+    name = 'json'
+
+    # Package (and version) required by the codec
+    requirement = None
+
+    @classmethod
+    def is_available(cls):
+        """Check if the codec can be used.
+
+        :return:
+        :rtype: bool
+        """
+        return True
+
+    def dumps(self, data, default=default, native_datetime=True):
+        """Serialize data to JSON string.
+
+        :param data: Data to serialize.
+        :param default: Function serializing objects unknown to the codec.
+        :param native_datetime: If set to False, dates and times are always
+            serialized by the `default` function.
+        :type default: callable
+        :type native_datetime: bool
+        :return:
+        :rtype: str
+        """
+        return json.dumps(
+            data,
+            default=default,
+            ensure_ascii=False,
+            separators=(',', ':')
+        )
+
+    def dumps_bytes(self, data, default=default, native_datetime=True):
+        """Serialize data to UTF-8 encoded JSON.
+
+        :param data: Data to serialize.
+        :param default: Function serializing objects unknown to the codec.
+        :param native_datetime: If set to False, dates and times are always
+            serialized by the `default` function.
+        :type default: callable
+        :type native_datetime: bool
+        :return:
+        :rtype: bytes
+        """
+        return self.dumps(data, default, native_datetime).encode('utf-8')
+
+    def loads(self, data):
+        """Deserialize JSON.
+
+        :param data: JSON string or bytes.
+        :type data: str|bytes
+        :return:
+        """
+        return json.loads(data)
+
+
+class UJSONCodec(JSONCodec):
+    """The `ujson` codec (requires `ujson>=5.0`)."""
+
+    name = 'ujson'
+
+    requirement = 'ujson>=5.0'
+
+    @classmethod
+    def is_available(cls):
+        # The `default` argument is supported as of `ujson` 5.0
+        if ujson is None:
+            return False
+        try:
+            return int(ujson.__version__.split('.')[0]) >= 5
+        except (AttributeError, ValueError):
+            return False
+
+    def dumps(self, data, default=default, native_datetime=True):
+        return ujson.dumps(
+            data,
+            default=default,
+            ensure_ascii=False,
+            escape_forward_slashes=False
+        )
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+
+class ORJSONCodec(JSONCodec):
+    """The `orjson` codec.
+
+    Dates and times are serialized natively (RFC 3339), unless
+    `native_datetime` is set to False. NaN and infinity are serialized as
+    null.
+    """
+
+    name = 'orjson'
+
+    requirement = 'orjson'
+
+    @classmethod
+    def is_available(cls):
+        return orjson is not None
+
+    def dumps(self, data, default=default, native_datetime=True):
+        return self.dumps_bytes(data, default, native_datetime).decode('utf-8')
+
+    def dumps_bytes(self, data, default=default, native_datetime=True):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if not native_datetime:
+            option |= orjson.OPT_PASSTHROUGH_DATETIME
+        return orjson.dumps(data, default=default, option=option)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+# Codecs, in order of preference
+JSON_CODECS = OrderedDict(
+    (__codec.name, __codec)
+    for __codec
+    in (ORJSONCodec, UJSONCodec, JSONCodec)
+)
+
+
+def get_json_codec(name=None):
+    """Get JSON codec.
+
+    :param name: Name of the codec (`orjson`, `ujson` or `json`). If not
+        given, the fastest codec available is used.
+    :type name: str
+    :return:
+    :rtype: django_elasticsearch_dsl_drf.json_codecs.JSONCodec
+    """
+    if name is None:
+        for __codec in JSON_CODECS.values():
+            if __codec.is_available():
+                return __codec()
+
+    if name not in JSON_CODECS:
+        raise ImproperlyConfigured(
+            "Unknown JSON codec {}, choose from: {}"
+            "".format(name, ', '.join(JSON_CODECS))
+        )
+
+    if not JSON_CODECS[name].is_available():
+        raise ImproperlyConfigured(
+            "JSON codec {} requires the {} package to be installed"
+            "".format(name, JSON_CODECS[name].requirement)
+        )
+
+    return JSON_CODECS[name]()
+
+
+class FastJSONSerializer(JSONSerializer):
+    """Elasticsearch transport serializer using a fast JSON codec.
+
+    Can be given to the Elasticsearch client (`serializer` option in the
+    `ELASTICSEARCH_DSL` settings) or set as the `transport_serializer` of
+    the view.
+    """
+
+    # Name of the JSON codec. If not given, the fastest codec available is
+    # used.
+    codec_name = None
+
+    def __init__(self, codec_name=None):
+        self.codec = get_json_codec(codec_name or self.codec_name)
+
+    def default(self, data):
+        try:
+            return default(data)
+        except TypeError:
+            return super(FastJSONSerializer, self).default(data)
+
+    def loads(self, s):
+        try:
+            return self.codec.loads(s)
+        except (ValueError, TypeError) as err:
+            raise SerializationError(s, err)
+
+    def dumps(self, data):
+        # Strings are not serialized
+        if isinstance(data, string_types):
+            return data
+
+        try:
+            return self.codec.dumps(data, default=self.default)
+        except (ValueError, TypeError) as err:
+            raise SerializationError(data, err)
+
+
+def get_client(alias='default', serializer_class=None):
+    """Get Elasticsearch client, with the custom transport serializer.
+
+    Client shares the connection pool of the connection given. Clients
+    are cached per connection alias and serializer class.
+
+    :param alias: Connection alias.
+    :param serializer_class: Transport serializer class.
+    :type alias: str
+    :type serializer_class: elasticsearch.serializer.Serializer
+    :return:
+    :rtype: elasticsearch.Elasticsearch
+    """
+    client = connections.get_connection(alias)
+    if serializer_class is None:
+        return client
+
+    def create_client():
+        serializer = serializer_class()
+        transport = copy.copy(client.transport)
+        transport.serializer = serializer
+        __serializers = dict(transport.deserializer.serializers)
+        __serializers[serializer.mimetype] = serializer
+        transport.deserializer = Deserializer(
+            __serializers,
+            transport.deserializer.default.mimetype
+        )
+
+        # Namespaced clients (`indices`, etc.) are not used by the views
+        # and stay bound to the original client.
+        __client = copy.copy(client)
+        __client.transport = transport
+        return __client
+
+    return CLIENTS.get_or_create((alias, serializer_class), create_client)
+
+
+def clear_clients(alias=None):
+    """Clear clients with custom transport serializers.
+
+    Shall be called if the connections are re-configured at run time.
+
+    :param alias: Connection alias. If not given, all clients are cleared.
+    :type alias: str
+    """
+    CLIENTS.remove(None if alias is None else lambda key: key[0] == alias)
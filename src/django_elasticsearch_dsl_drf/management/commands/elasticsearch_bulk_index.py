@@ -0,0 +1,107 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django_elasticsearch_dsl.registries import registry
+
+from ...indexing import AdaptiveChunkSize, bulk_index
+from .elasticsearch_reindex import get_models
+
+
+class Command(BaseCommand):
+    help = 'Bulk index the documents: stream the querysets in chunks, ' \
+           'prepare the documents in a process pool and send them in ' \
+           'parallel bulk requests'
+
+    def add_arguments(self, parser):
+        # Named (optional) arguments
+        parser.add_argument(
+            '--models',
+            metavar='app[.model]',
+            nargs='*',
+            dest='models',
+            help='Models (or apps) which documents are indexed',
+        )
+        parser.add_argument(
+            '--process-count',
+            type=int,
+            dest='process_count',
+            default=os.cpu_count() or 1,
+            help='Number of processes preparing the documents (0 to '
+                 'prepare them in the current process)',
+        )
+        parser.add_argument(
+            '--thread-count',
+            type=int,
+            dest='thread_count',
+            default=4,
+            help='Number of bulk requests in-flight',
+        )
+        parser.add_argument(
+            '--queryset-chunk-size',
+            type=int,
+            dest='queryset_chunk_size',
+            default=1000,
+            help='Number of objects fetched from the database at once',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            dest='chunk_size',
+            default=500,
+            help='Initial bulk chunk size',
+        )
+        parser.add_argument(
+            '--max-chunk-size',
+            type=int,
+            dest='max_chunk_size',
+            default=5000,
+            help='Maximum bulk chunk size',
+        )
+        parser.add_argument(
+            '--target-latency',
+            type=float,
+            dest='target_latency',
+            default=1.0,
+            help='Target latency of the bulk requests (in seconds)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            dest='dry_run',
+            default=False,
+            help='Dry-run (print documents, do not index them)',
+        )
+
+    def handle(self, *args, **options):
+        models = get_models(options.get('models'))
+
+        for document in registry.get_documents(models):
+            if options.get('dry_run', False):
+                print("Document {} will be indexed into {}".format(
+                    document.__name__,
+                    document._index._name
+                ))
+                continue
+
+            __start = time.monotonic()
+            count = bulk_index(
+                document,
+                thread_count=options['thread_count'],
+                chunk_size=AdaptiveChunkSize(
+                    chunk_size=options['chunk_size'],
+                    max_chunk_size=options['max_chunk_size'],
+                    target_latency=options['target_latency']
+                ),
+                process_count=options['process_count'],
+                queryset_chunk_size=options['queryset_chunk_size'],
+            )
+            __elapsed = time.monotonic() - __start
+            print("Document {}: {} documents indexed into {} in {:.2f}s "
+                  "({:.0f} documents/s)".format(
+                      document.__name__,
+                      count,
+                      document._index._name,
+                      __elapsed,
+                      count / __elapsed if __elapsed else 0
+                  ))
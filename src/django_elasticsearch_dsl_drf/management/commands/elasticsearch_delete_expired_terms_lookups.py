@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from ...constants import TERMS_LOOKUP_INDEX, TERMS_LOOKUP_TTL
+from ...terms_lookup import delete_expired_terms_lookups
+
+
+class Command(BaseCommand):
+    help = 'Delete the expired terms lookup documents (values of the long ' \
+           '`in` and `exclude` lists). Shall be run periodically.'
+
+    def add_arguments(self, parser):
+        # Named (optional) arguments
+        parser.add_argument(
+            '--using',
+            dest='using',
+            default='default',
+            help='Elasticsearch connection alias',
+        )
+        parser.add_argument(
+            '--index',
+            dest='index',
+            default=TERMS_LOOKUP_INDEX,
+            help='Name of the terms lookup index',
+        )
+        parser.add_argument(
+            '--ttl',
+            type=int,
+            dest='ttl',
+            default=TERMS_LOOKUP_TTL,
+            help='Time (in seconds) the documents are kept',
+        )
+
+    def handle(self, *args, **options):
+        count = delete_expired_terms_lookups(
+            using=options['using'],
+            index=options['index'],
+            ttl=options['ttl']
+        )
+        print("{} expired terms lookup documents deleted from {}".format(
+            count,
+            options['index']
+        ))
@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from ...filter_backends.search.search_template import SearchTemplateBackend
+
+
+def get_view_classes(patterns=None):
+    """Get view classes of the URL patterns.
+
+    :param patterns: URL patterns. If not given, patterns of the root
+        URLconf are used.
+    :type patterns: list
+    :return: List of view classes.
+    :rtype: list
+    """
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+
+    view_classes = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            view_classes.extend(get_view_classes(pattern.url_patterns))
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, 'cls', None)
+            if view_class is not None and view_class not in view_classes:
+                view_classes.append(view_class)
+    return view_classes
+
+
+class Command(BaseCommand):
+    help = 'Register stored search templates of the search template backends'
+
+    def add_arguments(self, parser):
+        # Named (optional) arguments
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            dest='dry_run',
+            default=False,
+            help='Dry-run (print templates, do not register them)',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options.get('dry_run', False)
+        for view_class in get_view_classes():
+            for backend in getattr(view_class, 'filter_backends', []):
+                if not (isinstance(backend, type)
+                        and issubclass(backend, SearchTemplateBackend)):
+                    continue
+
+                view = view_class()
+                search_backend = backend()
+                if dry_run:
+                    for shape in search_backend.get_search_template_shapes(
+                        view
+                    ):
+                        print("{}: {}".format(
+                            search_backend.get_search_template_id(
+                                view,
+                                shape
+                            ),
+                            search_backend.get_search_template_source(
+                                None,
+                                view,
+                                shape
+                            )
+                        ))
+                else:
+                    ids = search_backend.register_search_templates(view)
+                    print("The following search templates are registered: "
+                          "{}".format(ids))
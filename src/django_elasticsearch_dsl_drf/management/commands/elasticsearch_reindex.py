@@ -0,0 +1,161 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django_elasticsearch_dsl.registries import registry
+
+from ...indexing import AdaptiveChunkSize, reindex
+
+
+def get_models(labels=None):
+    """Get registered models matching the labels given.
+
+    :param labels: App labels or model labels (`app.model`). If not given,
+        all registered models are returned.
+    :type labels: list
+    :return:
+    :rtype: set
+    """
+    if not labels:
+        return set(registry.get_models())
+
+    models = set()
+    for label in labels:
+        label = label.lower()
+        match_found = False
+        for model in registry.get_models():
+            if label in (model._meta.app_label.lower(),
+                         model._meta.label_lower):
+                models.add(model)
+                match_found = True
+
+        if not match_found:
+            raise CommandError("No model or app named {}".format(label))
+
+    return models
+
+
+class Command(BaseCommand):
+    help = 'Blue/green reindex: index into a new version of the index, ' \
+           'warm it up and swap the index alias'
+
+    def add_arguments(self, parser):
+        # Named (optional) arguments
+        parser.add_argument(
+            '--models',
+            metavar='app[.model]',
+            nargs='*',
+            dest='models',
+            help='Models (or apps) which indexes are reindexed',
+        )
+        parser.add_argument(
+            '--warm-up-queries',
+            dest='warm_up_queries',
+            default=None,
+            help='JSON file with search bodies to warm up the new indexes '
+                 'with (object of lists of search bodies, keyed by index '
+                 'name)',
+        )
+        parser.add_argument(
+            '--thread-count',
+            type=int,
+            dest='thread_count',
+            default=4,
+            help='Number of bulk requests in-flight',
+        )
+        parser.add_argument(
+            '--process-count',
+            type=int,
+            dest='process_count',
+            default=0,
+            help='Number of processes preparing the documents (0 to '
+                 'prepare them in the current process)',
+        )
+        parser.add_argument(
+            '--queryset-chunk-size',
+            type=int,
+            dest='queryset_chunk_size',
+            default=1000,
+            help='Number of objects fetched from the database at once',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            dest='chunk_size',
+            default=500,
+            help='Initial bulk chunk size',
+        )
+        parser.add_argument(
+            '--max-chunk-size',
+            type=int,
+            dest='max_chunk_size',
+            default=5000,
+            help='Maximum bulk chunk size',
+        )
+        parser.add_argument(
+            '--target-latency',
+            type=float,
+            dest='target_latency',
+            default=1.0,
+            help='Target latency of the bulk requests (in seconds)',
+        )
+        parser.add_argument(
+            '--delete-old',
+            action='store_true',
+            dest='delete_old',
+            default=False,
+            help='Delete previous versions of the indexes',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            dest='dry_run',
+            default=False,
+            help='Dry-run (print indexes, do not reindex them)',
+        )
+
+    def handle(self, *args, **options):
+        models = get_models(options.get('models'))
+
+        warm_up_queries = {}
+        if options.get('warm_up_queries'):
+            with open(options['warm_up_queries']) as warm_up_queries_file:
+                warm_up_queries = json.load(warm_up_queries_file)
+
+        indices = {}
+        for document in registry.get_documents(models):
+            indices.setdefault(
+                document._index._name,
+                (document._index, [])
+            )[1].append(document)
+
+        for name, (index, documents) in sorted(indices.items()):
+            if options.get('dry_run', False):
+                print("Index {} will be reindexed: {}".format(
+                    name,
+                    ', '.join(__d.__name__ for __d in documents)
+                ))
+                continue
+
+            res = reindex(
+                index,
+                documents,
+                warm_up_queries=warm_up_queries.get(name),
+                delete_old=options.get('delete_old', False),
+                thread_count=options['thread_count'],
+                chunk_size=AdaptiveChunkSize(
+                    chunk_size=options['chunk_size'],
+                    max_chunk_size=options['max_chunk_size'],
+                    target_latency=options['target_latency']
+                ),
+                process_count=options['process_count'],
+                queryset_chunk_size=options['queryset_chunk_size'],
+            )
+            print("Index {} is reindexed into {} ({} documents), previous "
+                  "indexes: {}".format(name,
+                                       res['index'],
+                                       res['count'],
+                                       res['old_indices']))
+            if res['failed_warm_up_queries']:
+                print("The following warm up queries failed: {}".format(
+                    res['failed_warm_up_queries']
+                ))
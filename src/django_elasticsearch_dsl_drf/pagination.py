@@ -8,6 +8,8 @@ from __future__ import unicode_literals
 from collections import OrderedDict
 
 from django.core import paginator as django_paginator
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
 
 from elasticsearch_dsl.utils import AttrDict
 
@@ -17,6 +19,7 @@ from rest_framework.response import Response
 
 import six
 
+from .constants import COLLAPSE_COUNT_AGGREGATION
 from .versions import ELASTICSEARCH_GTE_6_0
 
 __title__ = 'django_elasticsearch_dsl_drf.pagination'
@@ -25,11 +28,15 @@ __copyright__ = '2017-2020 Artur Barseghyan'
 __license__ = 'GPL 2.0/LGPL 2.1'
 __all__ = (
     'LimitOffsetPagination',
+    'ModelHydratingPagination',
+    'ModelHydrationMixin',
     'Page',
     'PageNumberPagination',
     'Paginator',
     'QueryFriendlyPageNumberPagination',
     'QueryFriendlyPaginator',
+    'get_page_hits',
+    'trim_response',
 )
 
 
@@ -38,6 +45,12 @@ class GetCountMixin:
     def get_es_count(self, es_response):
         if isinstance(es_response, list):
             return len(es_response)
+        # Collapsed results are counted by the `cardinality` aggregation,
+        # since `hits.total` holds the number of hits before collapsing.
+        __aggregations = getattr(es_response, 'aggregations', None)
+        if __aggregations is not None \
+                and COLLAPSE_COUNT_AGGREGATION in __aggregations:
+            return __aggregations[COLLAPSE_COUNT_AGGREGATION]['value']
         if isinstance(es_response.hits.total, AttrDict):
             return es_response.hits.total.value
         return es_response.hits.total
@@ -52,8 +65,122 @@ class Page(django_paginator.Page, GetCountMixin):
         super(Page, self).__init__(object_list, number, paginator)
 
 
-class Paginator(django_paginator.Paginator):
-    """Paginator for Elasticsearch."""
+def strip_collapse_count(facets):
+    """Strip the collapse count aggregation from the facets.
+
+    :param facets: Facets dictionary.
+    :type facets: dict
+    :return:
+    :rtype: dict
+    """
+    if facets and COLLAPSE_COUNT_AGGREGATION in facets:
+        facets = dict(facets)
+        facets.pop(COLLAPSE_COUNT_AGGREGATION)
+    return facets
+
+
+def trim_response(response, size):
+    """Trim hits of the response to the size given.
+
+    Total, aggregations and the rest of the response are kept.
+
+    :param response: Response.
+    :param size: Number of hits to keep.
+    :type response: elasticsearch_dsl.response.Response
+    :type size: int
+    :return:
+    :rtype: elasticsearch_dsl.response.Response
+    """
+    __data = response.to_dict()
+    if len(__data['hits']['hits']) <= size:
+        return response
+
+    return response.__class__(
+        response._search,
+        dict(
+            __data,
+            hits=dict(__data['hits'], hits=__data['hits']['hits'][:size])
+        ),
+        doc_class=response._doc_class
+    )
+
+
+def get_page_hits(response, view=None):
+    """Get hits of the response (page).
+
+    If `proxy_hits` of the view is set, the raw hits are proxied
+    (`get_hit_proxy` of the view) and no documents are built. Otherwise,
+    hits are the documents.
+
+    :param response: Response (or list of hits).
+    :param view: View.
+    :type response: elasticsearch_dsl.response.Response
+    :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+    :return: List of hits.
+    :rtype: list
+    """
+    if not getattr(view, 'proxy_hits', False) \
+            or not isinstance(response, AttrDict):
+        return list(response)
+
+    __proxy = view.get_hit_proxy
+    __hits = []
+    for __hit in response.to_dict()['hits']['hits']:
+        __source = __hit.get('_source', {})
+        if 'fields' in __hit:
+            __source = dict(__source, **__hit['fields'])
+        __hits.append(__proxy(__hit, __source))
+    return __hits
+
+
+class Paginator(django_paginator.Paginator, GetCountMixin):
+    """Paginator for Elasticsearch.
+
+    A page is fetched in a single request: the total number of objects is
+    taken from the response (`hits.total`) and the page number is validated
+    after the search is executed. Orphans are fetched along with the page.
+    """
+
+    # Pages ending beyond the `index.max_result_window` can't be fetched;
+    # number of such pages is validated before the search is executed.
+    max_result_window = 10000
+
+    @cached_property
+    def count(self):
+        """Return the total number of objects, across all pages.
+
+        Collapsed searches are counted using the collapse count
+        aggregation, since the `count` API ignores collapsing.
+
+        :return:
+        """
+        if getattr(self.object_list, '_extra', {}).get('collapse'):
+            return int(
+                self.get_es_count(self.object_list.extra(size=0).execute())
+            )
+        return super(Paginator, self).count
+
+    def validate_number_format(self, number):
+        """Validate the given 1-based page number, not checking the upper
+        bound (which requires the count).
+
+        :param number:
+        :return:
+        :rtype: int
+        """
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise django_paginator.PageNotAnInteger(
+                _('That page number is not an integer')
+            )
+        if number < 1:
+            raise django_paginator.EmptyPage(
+                _('That page number is less than 1')
+            )
+        return number
 
     def page(self, number):
         """Returns a Page object for the given 1-based page number.
@@ -61,12 +188,19 @@ class Paginator(django_paginator.Paginator):
         :param number:
         :return:
         """
-        number = self.validate_number(number)
+        number = self.validate_number_format(number)
         bottom = (number - 1) * self.per_page
         top = bottom + self.per_page
-        if top + self.orphans >= self.count:
-            top = self.count
-        object_list = self.object_list[bottom:top].execute()
+        if top + self.orphans > self.max_result_window:
+            number = self.validate_number(number)
+
+        object_list = self.object_list[bottom:top + self.orphans].execute()
+        self.count = int(self.get_es_count(object_list))
+        number = self.validate_number(number)
+        if top + self.orphans < self.count:
+            # Orphans are not absorbed by this page
+            object_list = trim_response(object_list, self.per_page)
+
         __facets = getattr(object_list, 'aggregations', None)
         return self._get_page(object_list, number, self, facets=__facets)
 
@@ -82,27 +216,12 @@ class Paginator(django_paginator.Paginator):
 
 
 class QueryFriendlyPaginator(Paginator, GetCountMixin):
-    """Paginator for Elasticsearch."""
+    """Paginator for Elasticsearch.
 
-    def page(self, number):
-        """Returns a Page object for the given 1-based page number.
-
-        :param number:
-        :return:
-        """
-        bottom = (number - 1) * self.per_page
-        top = bottom + self.per_page
-        object_list = self.object_list[bottom:top].execute()
-        self.count = int(self.get_es_count(object_list))
-        if self.count > top and self.count - top <= self.orphans:
-            # Fetch the additional orphaned nodes
-            object_list = (
-                list(object_list) +
-                list(self.object_list[top:self.count].execute())
-            )
-        number = self.validate_number(number)
-        __facets = getattr(object_list, 'aggregations', None)
-        return self._get_page(object_list, number, self, facets=__facets)
+    The page and the orphans are fetched in a single request; orphans not
+    absorbed by the page are trimmed off the response, which keeps the
+    aggregations (facets).
+    """
 
 
 class PageNumberPagination(pagination.PageNumberPagination, GetCountMixin):
@@ -141,7 +260,7 @@ class PageNumberPagination(pagination.PageNumberPagination, GetCountMixin):
             page = self.page
 
         if hasattr(page, 'facets') and hasattr(page.facets, '_d_'):
-            return page.facets._d_
+            return strip_collapse_count(page.facets._d_)
 
     def paginate_queryset(self, queryset, request, view=None):
         """Paginate a queryset.
@@ -203,7 +322,7 @@ class PageNumberPagination(pagination.PageNumberPagination, GetCountMixin):
             self.display_page_controls = True
 
         self.request = request
-        return list(self.page)
+        return get_page_hits(self.page.object_list, view)
 
     def get_paginated_response_context(self, data):
         """Get paginated response data.
@@ -318,7 +437,7 @@ class QueryFriendlyPageNumberPagination(PageNumberPagination):
             self.display_page_controls = True
 
         self.request = request
-        return list(self.page)
+        return get_page_hits(self.page.object_list, view)
 
 
 class LimitOffsetPagination(pagination.LimitOffsetPagination, GetCountMixin):
@@ -386,7 +505,7 @@ class LimitOffsetPagination(pagination.LimitOffsetPagination, GetCountMixin):
 
         if self.count == 0 or self.offset > self.count:
             return []
-        return list(resp)
+        return get_page_hits(resp, view)
 
     def get_facets(self, facets=None):
         """Get facets.
@@ -401,7 +520,7 @@ class LimitOffsetPagination(pagination.LimitOffsetPagination, GetCountMixin):
             return None
 
         if hasattr(facets, '_d_'):
-            return facets._d_
+            return strip_collapse_count(facets._d_)
 
     def get_paginated_response_context(self, data):
         """Get paginated response data.
@@ -431,3 +550,138 @@ class LimitOffsetPagination(pagination.LimitOffsetPagination, GetCountMixin):
         :return:
         """
         return Response(OrderedDict(self.get_paginated_response_context(data)))
+
+
+class ModelHydrationMixin(object):
+    """Model hydration mixin.
+
+    Hits of the page are replaced by the Django model instances, loaded in
+    a single query (`in_bulk`), in order of the hits. Meta of the hit
+    (`score`, `highlight`, etc.) is attached to the instance as `meta`.
+    Hits of the objects not found in the database (deleted since indexed)
+    are skipped.
+
+    The model is taken from the queryset (see `get_queryset` of the
+    `BaseDocumentViewSet`) or from the document of the view. Related
+    objects to be loaded along are given in `hydrate_select_related` and
+    `hydrate_prefetch_related` of the view (or of the pagination class).
+    """
+
+    hydrate_select_related = None
+
+    hydrate_prefetch_related = None
+
+    hydrate_meta_attribute = 'meta'
+
+    def get_model(self, queryset, view=None):
+        """Get Django model of the hits.
+
+        :param queryset: Search.
+        :param view: View.
+        :type queryset: elasticsearch_dsl.Search
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :return: Django model or None if unknown.
+        :rtype: django.db.models.Model
+        """
+        __model = getattr(queryset, 'model', None)
+        if __model is None and getattr(view, 'document', None) is not None:
+            # Filter backends clone the queryset, dropping the model
+            __model = view.document.Django.model
+        return __model
+
+    def get_hydration_queryset(self, model, view=None):
+        """Get queryset the instances are loaded from.
+
+        :param model: Django model.
+        :param view: View.
+        :type model: django.db.models.Model
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :return:
+        :rtype: django.db.models.QuerySet
+        """
+        __queryset = model._default_manager.all()
+        __select_related = getattr(
+            view,
+            'hydrate_select_related',
+            self.hydrate_select_related
+        )
+        if __select_related:
+            __queryset = __queryset.select_related(*__select_related)
+        __prefetch_related = getattr(
+            view,
+            'hydrate_prefetch_related',
+            self.hydrate_prefetch_related
+        )
+        if __prefetch_related:
+            __queryset = __queryset.prefetch_related(*__prefetch_related)
+        return __queryset
+
+    def hydrate(self, hits, model, view=None):
+        """Load the model instances of the hits.
+
+        :param hits: Hits.
+        :param model: Django model.
+        :param view: View.
+        :type hits: list
+        :type model: django.db.models.Model
+        :type view: rest_framework.viewsets.ReadOnlyModelViewSet
+        :return: Model instances, in order of the hits.
+        :rtype: list
+        """
+        __pk = model._meta.pk
+        __ids = [__pk.to_python(__hit.meta.id) for __hit in hits]
+        __objects = self.get_hydration_queryset(model, view).in_bulk(__ids)
+
+        __instances = []
+        for __hit, __id in zip(hits, __ids):
+            __instance = __objects.get(__id)
+            if __instance is None:
+                continue
+            setattr(__instance, self.hydrate_meta_attribute, __hit.meta)
+            __instances.append(__instance)
+        return __instances
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Paginate a queryset, hydrating the hits of the page.
+
+        :param queryset:
+        :param request:
+        :param view:
+        :return:
+        """
+        __page = super(ModelHydrationMixin, self).paginate_queryset(
+            queryset,
+            request,
+            view
+        )
+        __model = self.get_model(queryset, view)
+        # Suggestions are not hydrated
+        if __model is None or not isinstance(__page, list):
+            return __page
+        return self.hydrate(__page, __model, view)
+
+
+class ModelHydratingPagination(ModelHydrationMixin, PageNumberPagination):
+    """Page number pagination, hydrating the hits into model instances.
+
+    Example:
+
+        >>> class BookSerializer(serializers.ModelSerializer):
+        >>>
+        >>>     score = serializers.SerializerMethodField()
+        >>>
+        >>>     class Meta:
+        >>>         model = Book
+        >>>         fields = ('id', 'title', 'publisher', 'score')
+        >>>
+        >>>     def get_score(self, obj):
+        >>>         return obj.meta.score
+        >>>
+        >>> class BookDocumentViewSet(DocumentViewSet):
+        >>>
+        >>>     document = BookDocument
+        >>>     serializer_class = BookSerializer
+        >>>     pagination_class = ModelHydratingPagination
+        >>>     hydrate_select_related = ['publisher']
+        >>>     hydrate_prefetch_related = ['authors', 'tags']
+    """
@@ -0,0 +1,121 @@
+"""
+Query params parsed once per request.
+
+Filter backends (filtering, nested filtering, suggesters, ordering, etc.)
+read the query params of the same request. Instead of copying and
+re-splitting them in every backend, they are parsed once (field name,
+lookup and cleaned values of every query param) and cached on the request.
+"""
+
+from collections import OrderedDict
+
+from .constants import SEPARATOR_LOOKUP_FILTER
+
+__title__ = 'django_elasticsearch_dsl_drf.query_params'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'get_query_params',
+    'ParsedQueryParams',
+)
+
+# Name of the request attribute holding the parsed query params
+QUERY_PARAMS_ATTR = '_parsed_query_params'
+
+
+class ParsedQueryParams(object):
+    """Parsed query params.
+
+    Iterating yields tuples of query param, field name, lookup (None if not
+    given) and values (stripped, empty values skipped), in order of the
+    query params.
+
+    Example:
+
+        >>> params = ParsedQueryParams(
+        >>>     QueryDict('title__prefix=py&state=published&state=')
+        >>> )
+        >>> list(params)
+        [('title__prefix', 'title', 'prefix', ['py']),
+         ('state', 'state', None, ['published'])]
+        >>> params.lookups('title')
+        OrderedDict([('prefix', ('title__prefix', ['py']))])
+    """
+
+    __slots__ = ('query_params', 'fields', '_parsed')
+
+    def __init__(self, query_params):
+        self.query_params = query_params
+        self.fields = OrderedDict()
+        self._parsed = []
+        for __query_param, __values in query_params.lists():
+            __parts = __query_param.split(SEPARATOR_LOOKUP_FILTER, 1)
+            __lookup = __parts[1] if len(__parts) > 1 else None
+            __values = [
+                __value.strip()
+                for __value in __values
+                if __value.strip() != ''
+            ]
+            self.fields.setdefault(__parts[0], OrderedDict())[__lookup] = (
+                __query_param,
+                __values
+            )
+            self._parsed.append(
+                (__query_param, __parts[0], __lookup, __values)
+            )
+
+    def __iter__(self):
+        return iter(self._parsed)
+
+    def __contains__(self, query_param):
+        return query_param in self.query_params
+
+    def lookups(self, field_name):
+        """Lookups of the field given.
+
+        :param field_name: Field name.
+        :type field_name: str
+        :return: Dictionary of tuples of query param and values, keyed by
+            lookup.
+        :rtype: collections.OrderedDict
+        """
+        return self.fields.get(field_name, OrderedDict())
+
+    def get(self, query_param, default=None):
+        """Get the (last) raw value of the query param.
+
+        :param query_param: Query param.
+        :param default: Default value.
+        :type query_param: str
+        :return:
+        :rtype: str
+        """
+        return self.query_params.get(query_param, default)
+
+    def getlist(self, query_param):
+        """Get raw values of the query param.
+
+        :param query_param: Query param.
+        :type query_param: str
+        :return:
+        :rtype: list
+        """
+        return self.query_params.getlist(query_param, [])
+
+
+def get_query_params(request):
+    """Get query params of the request, parsed once per request.
+
+    :param request: Django REST framework request.
+    :type request: rest_framework.request.Request
+    :return:
+    :rtype: django_elasticsearch_dsl_drf.query_params.ParsedQueryParams
+    """
+    __query_params = request.query_params
+    __parsed = request.__dict__.get(QUERY_PARAMS_ATTR)
+    # Re-parsed if the query params are replaced
+    if __parsed is None or __parsed.query_params is not __query_params:
+        __parsed = ParsedQueryParams(__query_params)
+        request.__dict__[QUERY_PARAMS_ATTR] = __parsed
+    return __parsed
@@ -0,0 +1,92 @@
+"""
+Renderers.
+"""
+
+from rest_framework.renderers import JSONRenderer
+
+from .json_codecs import AttrDict, AttrList, get_json_codec
+from .utils import ResponseProxy
+
+__title__ = 'django_elasticsearch_dsl_drf.renderers'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = ('FastJSONRenderer',)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON renderer using a fast JSON codec (`orjson` or `ujson`).
+
+    Output is the same as of the `JSONRenderer` (objects unknown to the
+    codec are serialized by the `encoder_class`). Indented output (for
+    instance, in the browsable API) and the non-default `UNICODE_JSON` and
+    `COMPACT_JSON` settings are rendered by the `JSONRenderer`. Unlike the
+    `JSONRenderer` with `STRICT_JSON` enabled, `orjson` renders NaN and
+    infinity as null.
+
+    Example:
+
+        >>> from django_elasticsearch_dsl_drf.renderers import (
+        >>>     FastJSONRenderer
+        >>> )
+        >>> from django_elasticsearch_dsl_drf.viewsets import DocumentViewSet
+        >>> from rest_framework.renderers import BrowsableAPIRenderer
+        >>>
+        >>> class BookDocumentView(DocumentViewSet):
+        >>>
+        >>>     renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    """
+
+    # Name of the JSON codec. If not given, the fastest codec available is
+    # used.
+    json_codec = None
+
+    def __init__(self):
+        self.codec = get_json_codec(self.json_codec)
+        self.encoder = self.encoder_class()
+
+    def default(self, obj):
+        """Serialize objects unknown to the codec.
+
+        :param obj:
+        :return: JSON serializable object.
+        """
+        if isinstance(obj, (AttrDict, ResponseProxy)):
+            return obj.to_dict()
+        elif isinstance(obj, AttrList):
+            return obj._l_
+        return self.encoder.default(obj)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render `data` into JSON, returning a bytestring.
+
+        :param data:
+        :param accepted_media_type:
+        :param renderer_context:
+        :return:
+        :rtype: bytes
+        """
+        if data is None:
+            return b''
+
+        if self.ensure_ascii \
+                or not self.compact \
+                or self.get_indent(
+                    accepted_media_type,
+                    renderer_context or {}
+                ) is not None:
+            return super(FastJSONRenderer, self).render(
+                data,
+                accepted_media_type,
+                renderer_context
+            )
+
+        ret = self.codec.dumps_bytes(
+            data,
+            default=self.default,
+            native_datetime=False
+        )
+
+        # Fully escape   and  , as the `JSONRenderer` does.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028') \
+            .replace(b'\xe2\x80\xa9', b'\\u2029')
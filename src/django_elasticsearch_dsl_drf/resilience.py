@@ -0,0 +1,315 @@
+"""
+Stale-while-revalidate fallback when Elasticsearch is slow or unavailable.
+
+Failing searches are counted by a circuit breaker per connection. Once the
+breaker opens, searches are no longer sent to Elasticsearch: the last good
+response of the same search is served from the Django cache instead
+(marked stale). After `reset_timeout` seconds the breaker half-opens and a
+single search is sent (in the background, if a stale response can be
+served meanwhile) to find out whether Elasticsearch has recovered.
+"""
+
+import threading
+import time
+
+from django.core.cache import caches
+
+from elasticsearch.exceptions import ConnectionError, TransportError
+from elasticsearch_dsl import Search
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .coalescing import get_connection_key, get_search_key
+from .utils import Registry
+
+__title__ = 'django_elasticsearch_dsl_drf.resilience'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'CircuitBreaker',
+    'clear_circuit_breakers',
+    'get_circuit_breaker',
+    'is_stale',
+    'reset_stale',
+    'ResilientSearch',
+    'ResilientSearchMixin',
+    'ServiceUnavailable',
+)
+
+# Circuit breakers, key is the connection key (see `get_connection_key`).
+CIRCUIT_BREAKERS = Registry()
+
+# Status codes of the responses counted as failures
+FAILURE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Whether a stale response has been served in the current thread (request)
+_STATE = threading.local()
+
+
+class ServiceUnavailable(APIException):
+    """Elasticsearch is unavailable and no stale response is cached."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Search is temporarily unavailable, try again later.'
+    default_code = 'service_unavailable'
+
+
+class CircuitBreaker(object):
+    """Circuit breaker.
+
+    Closed: requests are allowed. Opens once `failure_threshold` requests
+    fail in a row. Open: requests are not allowed. Half-open (once
+    `reset_timeout` seconds have passed since the breaker opened): a single
+    trial request is allowed, which either closes or re-opens the breaker.
+    """
+
+    CLOSED = 'closed'
+
+    OPEN = 'open'
+
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """Whether a request is allowed.
+
+        :return:
+        :rtype: bool
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN \
+                    and time.monotonic() - self.opened_at \
+                    >= self.reset_timeout:
+                # Trial request
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        """Record a successful request."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        """Record a failed request."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN \
+                    or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+def get_circuit_breaker(using, failure_threshold=5, reset_timeout=30):
+    """Get circuit breaker of the connection.
+
+    :param using: Connection alias or client.
+    :param failure_threshold: Number of failures in a row opening the
+        breaker (used when the breaker is created).
+    :param reset_timeout: Number of seconds the breaker stays open (used
+        when the breaker is created).
+    :type using: str or elasticsearch.Elasticsearch
+    :type failure_threshold: int
+    :type reset_timeout: int
+    :return:
+    :rtype: django_elasticsearch_dsl_drf.resilience.CircuitBreaker
+    """
+    return CIRCUIT_BREAKERS.get_or_create(
+        get_connection_key(using),
+        lambda: CircuitBreaker(
+            failure_threshold=failure_threshold,
+            reset_timeout=reset_timeout
+        )
+    )
+
+
+def clear_circuit_breakers():
+    """Clear circuit breakers (close them)."""
+    CIRCUIT_BREAKERS.remove()
+
+
+def is_stale():
+    """Whether a stale response has been served in the current thread
+    since the last `reset_stale` call.
+
+    :return:
+    :rtype: bool
+    """
+    return getattr(_STATE, 'stale', False)
+
+
+def reset_stale():
+    """Reset the stale flag of the current thread."""
+    _STATE.stale = False
+
+
+def is_failure(err):
+    """Whether the exception is a failure of Elasticsearch (unavailable or
+    overloaded), rather than an error of the request.
+
+    :param err: Exception.
+    :type err: Exception
+    :return:
+    :rtype: bool
+    """
+    if isinstance(err, ConnectionError):
+        return True
+    return isinstance(err, TransportError) \
+        and err.status_code in FAILURE_STATUS_CODES
+
+
+class ResilientSearchMixin(object):
+    """Resilient search mixin.
+
+    Responses are stored in the `resilience_cache` (a Django cache alias)
+    for `stale_timeout` seconds and served (marked stale, see `is_stale`)
+    while the circuit breaker of the connection is open or if the search
+    fails. If no stale response is cached, `ServiceUnavailable` is raised
+    while the breaker is open, failures are raised as is.
+    """
+
+    resilience_cache = 'default'
+
+    stale_timeout = 3600
+
+    failure_threshold = 5
+
+    reset_timeout = 30
+
+    resilience_key_prefix = 'django_elasticsearch_dsl_drf.resilience'
+
+    def get_circuit_breaker(self):
+        """Get circuit breaker of the connection of the search.
+
+        :return:
+        :rtype: django_elasticsearch_dsl_drf.resilience.CircuitBreaker
+        """
+        return get_circuit_breaker(
+            self._using,
+            failure_threshold=self.failure_threshold,
+            reset_timeout=self.reset_timeout
+        )
+
+    def _execute_raw_guarded(self, breaker, cache_key):
+        """Execute the search, record the outcome and cache the response.
+
+        :param breaker: Circuit breaker.
+        :param cache_key: Cache key of the response.
+        :type breaker: django_elasticsearch_dsl_drf.resilience.CircuitBreaker
+        :type cache_key: str
+        :return: Raw response.
+        :rtype: dict
+        """
+        try:
+            __raw = super(ResilientSearchMixin, self).execute(
+                ignore_cache=True
+            ).to_dict()
+        except Exception as err:
+            if is_failure(err):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+
+        breaker.record_success()
+        caches[self.resilience_cache].set(
+            cache_key,
+            __raw,
+            self.stale_timeout
+        )
+        return __raw
+
+    def _revalidate(self, breaker, cache_key):
+        """Trial request in the background (errors are recorded only).
+
+        :param breaker: Circuit breaker.
+        :param cache_key: Cache key of the response.
+        :type breaker: django_elasticsearch_dsl_drf.resilience.CircuitBreaker
+        :type cache_key: str
+        """
+        try:
+            self._execute_raw_guarded(breaker, cache_key)
+        except Exception:
+            pass
+
+    def execute(self, ignore_cache=False):
+        """Execute the search, falling back to the stale response.
+
+        :param ignore_cache: If set to True, response of the previous
+            execution of this search is ignored.
+        :type ignore_cache: bool
+        :return:
+        :rtype: elasticsearch_dsl.response.Response
+        """
+        if not ignore_cache and hasattr(self, '_response'):
+            return self._response
+
+        __breaker = self.get_circuit_breaker()
+        __cache_key = '{}.{}'.format(
+            self.resilience_key_prefix,
+            get_search_key(self)
+        )
+
+        __stale = None
+        __allowed = __breaker.allow_request()
+        if not __allowed or __breaker.state == __breaker.HALF_OPEN:
+            __stale = caches[self.resilience_cache].get(__cache_key)
+            if __allowed and __stale is not None:
+                # Revalidate in the background, serve the stale response
+                threading.Thread(
+                    target=self._clone()._revalidate,
+                    args=(__breaker, __cache_key),
+                    daemon=True
+                ).start()
+                __allowed = False
+
+        if __allowed:
+            try:
+                __raw = self._execute_raw_guarded(__breaker, __cache_key)
+            except Exception as err:
+                if not is_failure(err):
+                    raise
+                __stale = caches[self.resilience_cache].get(__cache_key)
+                if __stale is None:
+                    raise
+            else:
+                self._response = self._response_class(self, __raw)
+                return self._response
+
+        if __stale is None:
+            raise ServiceUnavailable()
+
+        _STATE.stale = True
+        self._response = self._response_class(self, __stale)
+        return self._response
+
+
+class ResilientSearch(ResilientSearchMixin, Search):
+    """Resilient search.
+
+    Example:
+
+        >>> from django_elasticsearch_dsl_drf.resilience import (
+        >>>     ResilientSearch
+        >>> )
+        >>> from django_elasticsearch_dsl_drf.viewsets import (
+        >>>     DocumentViewSet
+        >>> )
+        >>>
+        >>> class BookDocumentViewSet(DocumentViewSet):
+        >>>
+        >>>     document = BookDocument
+        >>>     search_class = ResilientSearch
+    """
@@ -0,0 +1,284 @@
+"""
+In-process cache of completion suggestions for short prefixes.
+
+Most of the suggest traffic goes to the first few characters typed. Those
+short prefixes are few, thus the top-K completions of each of them can be
+held in memory and served without a round-trip to Elasticsearch.
+
+Type-ahead clients send a new prefix on each keystroke, which (mostly)
+extends the previous one. Once the suggestions for a prefix are complete
+(fewer options than requested), suggestions for any extension of it are
+obtained by filtering those options locally.
+"""
+
+from collections import OrderedDict
+import re
+import string
+import threading
+import time
+
+from django.db.models.signals import post_delete, post_save
+
+from .utils import Registry
+
+__title__ = 'django_elasticsearch_dsl_drf.suggestion_cache'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'clear_suggestion_caches',
+    'get_suggestion_cache',
+    'SuggestionCache',
+)
+
+# Registry of caches, key is a tuple of index name, field and options.
+SUGGESTION_CACHES = Registry()
+
+
+class SuggestionCache(object):
+    """Completion suggestions cache for short prefixes.
+
+    Holds the completion suggester options (as returned by Elasticsearch)
+    per lower-cased prefix. The cache is warmed on first use, in a single
+    request holding a suggester per each of the `warm_prefixes`, re-warmed
+    when `timeout` seconds have passed (or when the cache is invalidated,
+    see `clear_suggestion_caches`) and filled for the other short prefixes
+    as they are requested.
+
+    Suggestions for the longer prefixes are remembered for `recent_timeout`
+    seconds (up to `max_recent` prefixes), so that the prefixes typed next
+    can be answered from them (see `get_extension`).
+    """
+
+    # Prefixes to warm the cache with
+    default_warm_prefixes = tuple(string.ascii_lowercase + string.digits)
+
+    def __init__(self,
+                 max_prefix_length=2,
+                 timeout=300,
+                 warm_prefixes=None,
+                 recent_timeout=30,
+                 max_recent=1000):
+        self.max_prefix_length = max_prefix_length
+        self.timeout = timeout
+        self.recent_timeout = recent_timeout
+        self.max_recent = max_recent
+        self.warm_prefixes = tuple(
+            self.default_warm_prefixes
+            if warm_prefixes is None
+            else warm_prefixes
+        )
+        self._suggestions = {}
+        self._recent = OrderedDict()
+        self._warmed_at = None
+        self._lock = threading.Lock()
+        self._recent_lock = threading.Lock()
+
+    @classmethod
+    def normalize(cls, prefix):
+        """Normalize the prefix.
+
+        Completion suggester analyzes the prefix with the `simple` analyzer
+        by default, which lower-cases the input and splits it on non-letter
+        characters. Approximated here by lower-casing and collapsing
+        non-word characters into a single space.
+
+        :param prefix:
+        :type prefix: str
+        :return:
+        :rtype: str
+        """
+        return re.sub(r'\W+', ' ', prefix.lower())
+
+    def is_cacheable(self, prefix):
+        """Check if suggestions for the prefix given can be cached.
+
+        :param prefix:
+        :type prefix: str
+        :return:
+        :rtype: bool
+        """
+        return 0 < len(prefix) <= self.max_prefix_length
+
+    def is_stale(self):
+        """Check if the cache shall be (re-)warmed.
+
+        :return:
+        :rtype: bool
+        """
+        return self._warmed_at is None \
+            or time.time() - self._warmed_at > self.timeout
+
+    def get(self, prefix):
+        """Get suggester options for the prefix given.
+
+        :param prefix:
+        :type prefix: str
+        :return: List of options or None if prefix is not cached.
+        :rtype: list
+        """
+        prefix = self.normalize(prefix)
+        if prefix in self._suggestions:
+            return self._suggestions[prefix]
+
+        __recent = self._recent.get(prefix)
+        if __recent is not None \
+                and time.time() - __recent[0] <= self.recent_timeout:
+            return __recent[1]
+
+        return None
+
+    def get_extension(self, prefix, size):
+        """Get suggester options by filtering those of a shorter prefix.
+
+        The closest shorter prefix known is used. If it has got fewer
+        than `size` options, all possible completions are known, thus
+        the ones matching the prefix given are returned.
+
+        :param prefix:
+        :param size: Number of options requested.
+        :type prefix: str
+        :type size: int
+        :return: List of options or None if prefix can't be answered.
+        :rtype: list
+        """
+        prefix = self.normalize(prefix)
+        for __length in range(len(prefix) - 1, 0, -1):
+            __options = self.get(prefix[:__length])
+            if __options is None:
+                continue
+
+            # A shorter prefix would have at least as many options
+            if len(__options) >= size:
+                return None
+
+            return [
+                __option
+                for __option
+                in __options
+                if self.normalize(__option.get('text', '')).startswith(prefix)
+            ]
+
+        return None
+
+    def set(self, prefix, options):
+        """Set suggester options for the prefix given.
+
+        :param prefix:
+        :param options: Suggester options.
+        :type prefix: str
+        :type options: list
+        """
+        self._suggestions[self.normalize(prefix)] = list(options)
+
+    def remember(self, prefix, options):
+        """Remember suggester options for the (longer) prefix given.
+
+        :param prefix:
+        :param options: Suggester options.
+        :type prefix: str
+        :type options: list
+        """
+        prefix = self.normalize(prefix)
+        with self._recent_lock:
+            self._recent.pop(prefix, None)
+            self._recent[prefix] = (time.time(), list(options))
+            while len(self._recent) > self.max_recent:
+                self._recent.popitem(last=False)
+
+    def warm(self, fetch):
+        """Warm the cache, unless it's warmed already.
+
+        :param fetch: Callable, which is given a list of prefixes and
+            returns suggester options per prefix.
+        :type fetch: callable
+        """
+        with self._lock:
+            # Checked again, since another thread might have warmed the
+            # cache while we were waiting for the lock.
+            if not self.is_stale():
+                return
+
+            suggestions = dict(
+                (self.normalize(__prefix), list(__options))
+                for __prefix, __options
+                in fetch(list(self.warm_prefixes)).items()
+            )
+            self._suggestions = suggestions
+            self._warmed_at = time.time()
+
+    def clear(self):
+        """Clear the cache."""
+        self._suggestions = {}
+        self._recent = OrderedDict()
+        self._warmed_at = None
+
+
+def get_suggestion_cache(index, field, model=None, **options):
+    """Get (or create) the suggestion cache.
+
+    :param index: Index name.
+    :param field: Completion field.
+    :param model: Django model of the document, changes of which clear
+        the cache.
+    :param options: Suggester options (`size`, `skip_duplicates`) and
+        cache options (`max_prefix_length`, `timeout`, `warm_prefixes`,
+        `recent_timeout`, `max_recent`).
+    :type index: str
+    :type field: str
+    :type model: django.db.models.Model
+    :return:
+    :rtype: django_elasticsearch_dsl_drf.suggestion_cache.SuggestionCache
+    """
+    __key = (index, field, tuple(sorted(
+        (__name, tuple(__value) if isinstance(__value, list) else __value)
+        for __name, __value
+        in options.items()
+    )))
+
+    def create_cache():
+        if model is not None:
+            __uid = 'django_elasticsearch_dsl_drf.suggestion_cache.{}' \
+                    ''.format(model._meta.label)
+            post_save.connect(
+                _clear_suggestion_caches,
+                sender=model,
+                dispatch_uid=__uid
+            )
+            post_delete.connect(
+                _clear_suggestion_caches,
+                sender=model,
+                dispatch_uid=__uid
+            )
+
+        return SuggestionCache(
+            max_prefix_length=options.get('max_prefix_length', 2),
+            timeout=options.get('timeout', 300),
+            warm_prefixes=options.get('warm_prefixes'),
+            recent_timeout=options.get('recent_timeout', 30),
+            max_recent=options.get('max_recent', 1000)
+        )
+
+    return SUGGESTION_CACHES.get_or_create(__key, create_cache)
+
+
+def clear_suggestion_caches(index=None):
+    """Clear suggestion caches.
+
+    :param index: Index name. If not given, all caches are cleared.
+    :type index: str
+    """
+    for __key, __cache in list(SUGGESTION_CACHES.items()):
+        if index is None or __key[0] == index:
+            __cache.clear()
+
+
+def _clear_suggestion_caches(sender, **kwargs):
+    """Clear suggestion caches of the indexes the model is indexed in.
+
+    :param sender: Django model.
+    """
+    from django_elasticsearch_dsl.registries import registry
+
+    for __document in registry.get_documents([sender]):
+        clear_suggestion_caches(__document._index._name)
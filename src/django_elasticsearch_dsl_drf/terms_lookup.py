@@ -0,0 +1,184 @@
+"""
+Terms lookup.
+
+Long lists of values (`in` and `exclude` lookups) are stored in a document
+of the terms lookup index and referenced by the `terms` query (terms
+lookup), instead of being sent (and parsed) with every search. Documents
+are keyed by the hash of the values, thus the same list of values is
+stored only once.
+
+Note, that the searches (read requests) then write to Elasticsearch: every
+new list of values is indexed. Documents expire `TERMS_LOOKUP_TTL` seconds
+after they were (last) stored and shall be deleted periodically, using the
+`delete_expired_terms_lookups` (or the
+`elasticsearch_delete_expired_terms_lookups` management command). Lists
+still in use are stored again by the processes using them after half of
+that time, thus they are never deleted while in use.
+"""
+
+import hashlib
+import time
+
+from elasticsearch_dsl.connections import connections
+
+from .constants import TERMS_LOOKUP_INDEX, TERMS_LOOKUP_TTL
+from .utils import Registry
+from .versions import ELASTICSEARCH_GTE_7_0
+
+__title__ = 'django_elasticsearch_dsl_drf.terms_lookup'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'clear_terms_lookups',
+    'delete_expired_terms_lookups',
+    'get_terms_lookup',
+)
+
+# Mapping type of the terms lookup documents (Elasticsearch 6)
+TERMS_LOOKUP_DOC_TYPE = 'doc'
+
+# Terms lookup documents stored, key is a tuple of connection alias, index
+# name and document id, value is the (monotonic) time they were stored.
+TERMS_LOOKUPS = Registry()
+
+# Maximum number of the terms lookup documents remembered
+TERMS_LOOKUPS_MAX_SIZE = 10000
+
+
+def _get_mappings():
+    """Get mappings of the terms lookup index.
+
+    Values are only read from the source, not indexed. Time of storing is
+    indexed (see `delete_expired_terms_lookups`).
+
+    :rtype: dict
+    """
+    __mapping = {
+        'dynamic': False,
+        'properties': {
+            'created': {'type': 'date'},
+        },
+    }
+    if not ELASTICSEARCH_GTE_7_0:
+        return {TERMS_LOOKUP_DOC_TYPE: __mapping}
+    return __mapping
+
+
+def get_terms_lookup(values,
+                     using='default',
+                     index=TERMS_LOOKUP_INDEX,
+                     ttl=TERMS_LOOKUP_TTL):
+    """Get terms lookup for the values given.
+
+    Values are stored in a document of the terms lookup index (created if
+    it does not exist), unless already stored by the current process in
+    the last `ttl / 2` seconds. Terms lookup uses the real-time get API,
+    thus no refresh is required.
+
+    Example:
+
+        >>> from elasticsearch_dsl.query import Q
+        >>> from django_elasticsearch_dsl_drf.terms_lookup import (
+        >>>     get_terms_lookup
+        >>> )
+        >>>
+        >>> query = Q('terms', id=get_terms_lookup(ids))
+
+    :param values: Values.
+    :param using: Connection alias.
+    :param index: Name of the terms lookup index.
+    :param ttl: Time (in seconds) the documents are kept. If None, they
+        are stored once per process.
+    :type values: list
+    :type using: str
+    :type index: str
+    :type ttl: int
+    :return: Terms lookup (`index`, `id` and `path` of the values).
+    :rtype: dict
+    """
+    __values = sorted(set(values))
+    __id = hashlib.sha1(
+        '\n'.join(__values).encode('utf-8')
+    ).hexdigest()
+
+    __key = (using, index, __id)
+    __now = time.monotonic()
+    __stored = TERMS_LOOKUPS.get(__key)
+    if __stored is None \
+            or (ttl is not None and __now - __stored > ttl / 2.0):
+        client = connections.get_connection(using)
+        __kwargs = {}
+        if not ELASTICSEARCH_GTE_7_0:
+            __kwargs['doc_type'] = TERMS_LOOKUP_DOC_TYPE
+        if (using, index, None) not in TERMS_LOOKUPS:
+            client.indices.create(
+                index=index,
+                body={'mappings': _get_mappings()},
+                ignore=400
+            )
+        client.index(
+            index=index,
+            id=__id,
+            body={
+                'values': __values,
+                'created': int(time.time() * 1000),
+            },
+            **__kwargs
+        )
+
+        with TERMS_LOOKUPS.lock:
+            if len(TERMS_LOOKUPS) >= TERMS_LOOKUPS_MAX_SIZE:
+                TERMS_LOOKUPS.clear()
+            TERMS_LOOKUPS[(using, index, None)] = __now
+            TERMS_LOOKUPS[__key] = __now
+
+    __lookup = {'index': index, 'id': __id, 'path': 'values'}
+    if not ELASTICSEARCH_GTE_7_0:
+        __lookup['type'] = TERMS_LOOKUP_DOC_TYPE
+    return __lookup
+
+
+def delete_expired_terms_lookups(using='default',
+                                 index=TERMS_LOOKUP_INDEX,
+                                 ttl=TERMS_LOOKUP_TTL):
+    """Delete the expired terms lookup documents.
+
+    Shall be called periodically (for instance, daily).
+
+    :param using: Connection alias.
+    :param index: Name of the terms lookup index.
+    :param ttl: Time (in seconds) the documents are kept.
+    :type using: str
+    :type index: str
+    :type ttl: int
+    :return: Number of documents deleted.
+    :rtype: int
+    """
+    client = connections.get_connection(using)
+    __response = client.delete_by_query(
+        index=index,
+        body={
+            'query': {
+                'range': {
+                    'created': {'lt': 'now-{}s'.format(int(ttl))},
+                },
+            },
+        },
+        conflicts='proceed',
+        ignore=404
+    )
+    return __response.get('deleted', 0)
+
+
+def clear_terms_lookups(using=None):
+    """Forget the terms lookup documents stored.
+
+    Shall be called if the terms lookup index is deleted.
+
+    :param using: Connection alias. If not given, all are cleared.
+    :type using: str
+    """
+    TERMS_LOOKUPS.remove(
+        None if using is None else lambda key: key[0] == using
+    )
@@ -0,0 +1,203 @@
+"""
+Test geo grid aggregation backend.
+"""
+
+from __future__ import absolute_import
+
+import unittest
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from elasticsearch_dsl import Search
+
+import mock
+
+import pytest
+
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+import factories
+
+from search_indexes.viewsets import PublisherDocumentViewSet
+
+from ..constants import (
+    GEO_GRID_AGGREGATION_GEOHASH,
+    GEO_GRID_AGGREGATION_GEOTILE,
+    SEPARATOR_LOOKUP_COMPLEX_VALUE,
+)
+from ..filter_backends import GeoGridAggregationBackend
+from ..filter_backends.aggregations import bucket_aggregations
+from .base import BaseRestFrameworkTestCase
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_aggregations_geo_grid'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestAggregationsGeoGrid',
+    'TestGeoGridAggregationBackend',
+)
+
+
+@pytest.mark.django_db
+class TestAggregationsGeoGrid(BaseRestFrameworkTestCase):
+    """Test geo grid aggregation."""
+
+    pytestmark = pytest.mark.django_db
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up."""
+        super(TestAggregationsGeoGrid, cls).setUpClass()
+        cls.geo_grid_url = reverse('publisherdocument-geo-grid', kwargs={})
+
+    def _create_publishers(self):
+        """Create publishers in two clusters (and one outside the viewport).
+
+        :return:
+        """
+        factories.PublisherFactory.create_batch(
+            3,
+            **{
+                'latitude': 48.8549,
+                'longitude': 2.3000,
+            }
+        )
+        factories.PublisherFactory.create_batch(
+            2,
+            **{
+                'latitude': 45.7640,
+                'longitude': 4.8357,
+            }
+        )
+        factories.PublisherFactory.create(
+            **{
+                'latitude': 52.3676,
+                'longitude': 4.9041,
+            }
+        )
+
+        call_command('search_index', '--rebuild', '-f')
+        self.sleep()
+
+    @pytest.mark.webtest
+    def test_geo_grid(self):
+        """Test geo grid.
+
+        Example:
+
+            http://localhost:8000/search/publishers/geo_grid/
+            ?location__geo_grid=49.5,1.5__45.0,5.5__zoom,8
+
+        :return:
+        """
+        self.authenticate()
+        self._create_publishers()
+
+        __params = '{top_left}{sep}{bottom_right}{sep}zoom,8'.format(
+            top_left='49.5,1.5',
+            bottom_right='45.0,5.5',
+            sep=SEPARATOR_LOOKUP_COMPLEX_VALUE
+        )
+        response = self.client.get(
+            self.geo_grid_url,
+            {'location__geo_grid': __params}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        buckets = response.data['location']
+        self.assertEqual(len(buckets), 2)
+        self.assertEqual(
+            sorted(__bucket['count'] for __bucket in buckets),
+            [2, 3]
+        )
+        for __bucket in buckets:
+            self.assertIn('key', __bucket)
+            self.assertIsNotNone(__bucket['lat'])
+            self.assertIsNotNone(__bucket['lon'])
+
+    @pytest.mark.webtest
+    def test_geo_grid_no_params_fail(self):
+        """Test geo grid without the viewport given.
+
+        :return:
+        """
+        self.authenticate()
+        response = self.client.get(self.geo_grid_url, {})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @pytest.mark.webtest
+    def test_geo_grid_malformed_params_fail(self):
+        """Test geo grid with a malformed viewport given.
+
+        :return:
+        """
+        self.authenticate()
+        response = self.client.get(
+            self.geo_grid_url,
+            {'location__geo_grid': '49.5,1.5__zoom,8'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@pytest.mark.django_db
+class TestGeoGridAggregationBackend(unittest.TestCase):
+    """Test geo grid aggregation backend."""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.backend = GeoGridAggregationBackend()
+
+    def get_body(self, value):
+        """Get the search body produced by the geo grid backend."""
+        request = Request(
+            self.factory.get('/', {'location__geo_grid': value})
+        )
+        return self.backend.filter_queryset(
+            request,
+            Search(),
+            PublisherDocumentViewSet()
+        ).to_dict()
+
+    def test_geo_grid_aggregation(self):
+        """Test default aggregation type per Elasticsearch version."""
+        for __gte_7_0, __aggregation, __precision in (
+            (True, GEO_GRID_AGGREGATION_GEOTILE, 8),
+            (False, GEO_GRID_AGGREGATION_GEOHASH, 4),
+        ):
+            with mock.patch.object(
+                bucket_aggregations,
+                'ELASTICSEARCH_GTE_7_0',
+                __gte_7_0
+            ):
+                body = self.get_body('49.5,1.5__45.0,5.5__zoom,8')
+            aggregation = body['aggs']['_geo_grid_location']
+            self.assertEqual(
+                aggregation[__aggregation],
+                {
+                    'field': 'location',
+                    'precision': __precision,
+                    'size': GeoGridAggregationBackend.default_size,
+                }
+            )
+
+    def test_geo_grid_malformed(self):
+        """Test malformed values give a validation error."""
+        for __value in (
+            '49.5,1.5',
+            '49.5,1.5__zoom,8',
+            'a,b__c,d',
+            '49.5,1.5__45.0,5.5__zoom,x',
+            '49.5,1.5__45.0,5.5__zoom,-1',
+            '100,1.5__45.0,5.5__zoom,8',
+            '49.5,1.5__45.0,5.5__46.0,5.0',
+        ):
+            with self.assertRaises(ValidationError):
+                self.get_body(__value)
+
+
+if __name__ == '__main__':
+    unittest.main()
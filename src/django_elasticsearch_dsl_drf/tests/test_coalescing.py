@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Test coalescing of identical concurrent searches.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import unittest
+
+from django.core.cache import caches
+
+import pytest
+
+from ..coalescing import CoalescingSearch, SingleFlight, get_search_key
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_coalescing'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestCoalescing',
+)
+
+
+class FakeClient(object):
+    """Client answering searches once released."""
+
+    def __init__(self):
+        self.calls = []
+        self.released = threading.Event()
+
+    def search(self, index=None, body=None, **kwargs):
+        self.calls.append(body)
+        self.released.wait(5)
+        return {
+            'hits': {
+                'total': {'value': 1, 'relation': 'eq'},
+                'hits': [{'_id': '1', '_source': {'title': 'Python'}}],
+            },
+        }
+
+
+@pytest.mark.django_db
+class TestCoalescing(unittest.TestCase):
+    """Test coalescing of identical concurrent searches."""
+
+    def setUp(self):
+        self.client = FakeClient()
+
+    def get_search(self, title='Python'):
+        """Get search."""
+        return CoalescingSearch(using=self.client, index='books') \
+            .query('match', title=title)
+
+    def test_single_flight(self):
+        """Test single-flight."""
+        single_flight = SingleFlight()
+        started = threading.Event()
+
+        def func():
+            started.set()
+            self.client.released.wait(5)
+            return 42
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            leader = executor.submit(single_flight.do, 'key', func)
+            started.wait(5)
+            followers = [
+                executor.submit(single_flight.do, 'key', func)
+                for __i in range(3)
+            ]
+            self.client.released.set()
+
+            self.assertEqual(leader.result(), (42, False))
+            for __follower in followers:
+                self.assertEqual(__follower.result()[0], 42)
+
+        # Nothing in-flight, thus executed again
+        self.assertEqual(single_flight.do('key', lambda: 43), (43, False))
+
+    def test_search_key(self):
+        """Test search key."""
+        self.assertEqual(
+            get_search_key(self.get_search()),
+            get_search_key(self.get_search())
+        )
+        self.assertNotEqual(
+            get_search_key(self.get_search()),
+            get_search_key(self.get_search('Django'))
+        )
+        self.assertNotEqual(
+            get_search_key(self.get_search()),
+            get_search_key(self.get_search()[10:20])
+        )
+
+    def test_coalesced(self):
+        """Test identical concurrent searches are coalesced."""
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(self.get_search().execute)
+                for __i in range(4)
+            ]
+            futures.append(
+                executor.submit(self.get_search('Django').execute)
+            )
+            # Let all the searches start
+            time.sleep(0.2)
+            self.client.released.set()
+            responses = [__future.result() for __future in futures]
+
+        # One request per distinct search
+        self.assertEqual(len(self.client.calls), 2)
+        for __response in responses:
+            self.assertEqual(__response.hits[0].title, 'Python')
+            self.assertEqual(__response.hits.total.value, 1)
+
+        # Not coalesced once completed
+        self.get_search().execute()
+        self.assertEqual(len(self.client.calls), 3)
+
+    def test_coalesced_across_processes(self):
+        """Test searches are coalesced using the cache."""
+        search = self.get_search()
+        search.coalesce_cache = 'default'
+        search.coalesce_timeout = 1
+        cache = caches['default']
+        key = get_search_key(search)
+
+        # Search is in-flight in another process
+        cache.set(
+            '{}.lock.{}'.format(search.coalesce_key_prefix, key),
+            1
+        )
+        cache.set(
+            '{}.result.{}'.format(search.coalesce_key_prefix, key),
+            {'hits': {'total': 7, 'hits': []}}
+        )
+        try:
+            self.assertEqual(search.execute().hits.total, 7)
+            self.assertEqual(self.client.calls, [])
+        finally:
+            cache.clear()
+
+        # Executed in this process, lock released
+        self.client.released.set()
+        self.assertEqual(search.execute(ignore_cache=True).hits.total.value,
+                         1)
+        self.assertEqual(len(self.client.calls), 1)
+        self.assertTrue(
+            cache.add(
+                '{}.lock.{}'.format(search.coalesce_key_prefix, key),
+                1
+            )
+        )
+        cache.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
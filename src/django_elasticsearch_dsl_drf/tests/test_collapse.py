@@ -0,0 +1,94 @@
+"""
+Test collapse backend.
+"""
+
+from __future__ import absolute_import
+
+import unittest
+
+from django.core.management import call_command
+from django.urls import reverse
+
+import pytest
+
+from rest_framework import status
+
+from books.models import Book
+
+import factories
+
+from ..constants import COLLAPSE_COUNT_AGGREGATION
+from .base import BaseRestFrameworkTestCase
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_collapse'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestCollapse',
+)
+
+
+@pytest.mark.django_db
+class TestCollapse(BaseRestFrameworkTestCase):
+    """Test collapse."""
+
+    pytestmark = pytest.mark.django_db
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestCollapse, cls).setUpClass()
+        cls.books_count = 20
+        cls.books = factories.BookFactory.create_batch(
+            cls.books_count,
+        )
+        cls.states_count = Book.objects.values('state').distinct().count()
+
+        cls.sleep()
+        call_command('search_index', '--rebuild', '-f')
+
+    def _list_results_with_collapse(self, url):
+        """List results with collapse."""
+        self.authenticate()
+
+        # Make request
+        no_args_response = self.client.get(url, {})
+        self.assertEqual(no_args_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(no_args_response.data['count'], self.books_count)
+
+        # Make request
+        response = self.client.get(url, {'collapse': 'state'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Should contain one result per state
+        self.assertEqual(response.data['count'], self.states_count)
+        self.assertEqual(len(response.data['results']), self.states_count)
+        self.assertEqual(
+            len(set(__r['state'] for __r in response.data['results'])),
+            self.states_count
+        )
+        self.assertNotIn(
+            COLLAPSE_COUNT_AGGREGATION,
+            response.data.get('facets') or {}
+        )
+
+    @pytest.mark.webtest
+    def test_list_results_with_collapse(self):
+        """Test list results with collapse."""
+        return self._list_results_with_collapse(
+            reverse('bookdocument-list', kwargs={})
+        )
+
+    @pytest.mark.webtest
+    def test_list_results_with_collapse_query_friendly_pagination(self):
+        """Test list results with collapse (query friendly pagination)."""
+        return self._list_results_with_collapse(
+            reverse(
+                'bookdocument_query_friendly_pagination-list',
+                kwargs={}
+            )
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Test concurrent functional suggestions.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import threading
+import unittest
+
+from elasticsearch_dsl import Search
+
+import mock
+
+import pytest
+
+from rest_framework.test import APIRequestFactory
+
+from search_indexes.viewsets import PublisherDocumentViewSet
+
+from ..viewsets import get_suggest_executor
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_concurrent_suggest'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestConcurrentSuggest',
+)
+
+
+@pytest.mark.django_db
+class TestConcurrentSuggest(unittest.TestCase):
+    """Test concurrent functional suggestions."""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view = PublisherDocumentViewSet.as_view({'get': 'suggest'})
+
+    def suggest(self, native, functional):
+        """GET suggestions."""
+        with mock.patch.object(PublisherDocumentViewSet,
+                               'filter_queryset',
+                               side_effect=native), \
+                mock.patch.object(PublisherDocumentViewSet,
+                                  'get_functional_suggestions',
+                                  side_effect=functional):
+            return self.view(
+                self.factory.get('/publishers/suggest/?name_suggest=Ad')
+            )
+
+    def test_executor(self):
+        """Test functional suggestions are executed in a shared pool."""
+        threads = []
+
+        def functional():
+            threads.append(threading.current_thread())
+            return {'name_suggest': [{'options': []}]}
+
+        for __i in range(2):
+            response = self.suggest(lambda queryset: Search(), functional)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                response.data,
+                {'functional_suggest': {'name_suggest': [{'options': []}]}}
+            )
+
+        self.assertIs(get_suggest_executor(), get_suggest_executor())
+        self.assertTrue(
+            all(
+                __thread.name.startswith('functional-suggest')
+                for __thread in threads
+            )
+        )
+
+    def test_native_error(self):
+        """Test errors of the native suggestions are not replaced by the
+        errors of the functional ones."""
+
+        def native(queryset):
+            raise ValueError("Native")
+
+        def functional():
+            raise RuntimeError("Functional")
+
+        with self.assertRaises(ValueError):
+            self.suggest(native, functional)
+
+        # Errors of the functional suggestions are raised otherwise
+        with self.assertRaises(RuntimeError):
+            self.suggest(lambda queryset: Search(), functional)
+
+
+if __name__ == '__main__':
+    unittest.main()
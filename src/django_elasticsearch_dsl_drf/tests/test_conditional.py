@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Test conditional GET.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import unittest
+
+from django.apps import apps
+from django.core.cache import caches
+from django.test.utils import override_settings
+
+import elasticsearch
+
+import mock
+
+import pytest
+
+from rest_framework.test import APIRequestFactory
+
+from books.models import Book, Publisher
+
+import factories
+
+from search_indexes.documents import BookDocument
+from search_indexes.viewsets import BookDocumentViewSet
+
+from ..conditional import (
+    WATCHED_MODELS,
+    bump_index_generation,
+    get_index_generation,
+    watch_document,
+)
+from ..indexing import bulk_index
+from ..viewsets import ConditionalGetMixin
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_conditional'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestConditional',
+)
+
+
+class ConditionalBookDocumentViewSet(ConditionalGetMixin,
+                                     BookDocumentViewSet):
+    """Book document view set with conditional GET."""
+
+
+@pytest.mark.django_db
+class TestConditional(unittest.TestCase):
+    """Test conditional GET."""
+
+    def setUp(self):
+        caches['default'].clear()
+        self.index = BookDocument._index._name
+        self.factory = APIRequestFactory()
+        self.view = ConditionalBookDocumentViewSet.as_view({'get': 'list'})
+        self.requests = []
+
+    def tearDown(self):
+        caches['default'].clear()
+
+    def perform_request(self, method, url, headers=None, params=None,
+                        body=None):
+        """Fake transport request."""
+        self.requests.append(url)
+        return {
+            'hits': {'total': {'value': 0, 'relation': 'eq'}, 'hits': []},
+        }
+
+    def get(self, query_string='', **headers):
+        """GET books."""
+        with mock.patch.object(elasticsearch.Transport,
+                               'perform_request',
+                               self.perform_request):
+            return self.view(
+                self.factory.get('/books/?{}'.format(query_string), **headers)
+            )
+
+    def test_index_generation(self):
+        """Test index generation."""
+        generation = get_index_generation(self.index)
+        self.assertEqual(get_index_generation(self.index), generation)
+        bump_index_generation(self.index)
+        self.assertGreater(get_index_generation(self.index), generation)
+
+    def test_documents_watched(self):
+        """Test documents are watched when the app is ready."""
+        self.assertIn(self.index, WATCHED_MODELS[Book])
+
+    def test_watch_documents_setting(self):
+        """Test documents are watched only if enabled in the settings."""
+        config = apps.get_app_config('django_elasticsearch_dsl_drf')
+        with mock.patch(
+            'django_elasticsearch_dsl_drf.conditional.watch_documents'
+        ) as watch_documents:
+            with override_settings(
+                ELASTICSEARCH_DSL_DRF_WATCH_DOCUMENTS=False
+            ):
+                config.ready()
+            watch_documents.assert_not_called()
+
+            with override_settings(
+                ELASTICSEARCH_DSL_DRF_WATCH_DOCUMENTS=True
+            ):
+                config.ready()
+            watch_documents.assert_called_once_with()
+
+    def test_generation_bumped_on_save(self):
+        """Test generation is bumped when (related) models are saved."""
+        generation = get_index_generation(self.index)
+        with override_settings(ELASTICSEARCH_DSL_AUTOSYNC=False):
+            factories.PublisherFactory()
+        self.assertEqual(get_index_generation(self.index), generation)
+
+        with override_settings(ELASTICSEARCH_DSL_AUTOSYNC=False):
+            factories.BookWithUniqueTitleFactory()
+        __generation = get_index_generation(self.index)
+        self.assertGreater(__generation, generation)
+
+        # Related model
+        watch_document(BookDocument, [Publisher])
+        with override_settings(ELASTICSEARCH_DSL_AUTOSYNC=False):
+            factories.PublisherFactory()
+        self.assertGreater(get_index_generation(self.index), __generation)
+
+    def test_generation_bumped_on_bulk_index(self):
+        """Test generation is bumped once the bulk indexed documents are
+        searchable."""
+        with override_settings(ELASTICSEARCH_DSL_AUTOSYNC=False):
+            book = factories.BookWithUniqueTitleFactory()
+        generation = get_index_generation(self.index)
+        generations = []
+
+        def perform_request(transport, method, url, headers=None,
+                            params=None, body=None):
+            generations.append((url, get_index_generation(self.index)))
+            if url.endswith('_bulk'):
+                return {
+                    'took': 1,
+                    'errors': False,
+                    'items': [{'index': {'_id': str(book.pk), 'status': 201}}],
+                }
+            return {'_shards': {'total': 1, 'successful': 1, 'failed': 0}}
+
+        with mock.patch.object(elasticsearch.Transport,
+                               'perform_request',
+                               perform_request):
+            bulk_index(BookDocument, objects=[book])
+
+        self.assertEqual(
+            generations,
+            [
+                ('/_bulk', generation),
+                ('/{}/_refresh'.format(self.index), generation),
+            ]
+        )
+        self.assertGreater(get_index_generation(self.index), generation)
+
+    def test_not_modified(self):
+        """Test not modified responses."""
+        response = self.get('search=Python')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.requests), 1)
+        etag = response['ETag']
+        # HTTP dates are not precise enough to validate the responses
+        self.assertNotIn('Last-Modified', response)
+
+        # Not touching Elasticsearch
+        response = self.get('search=Python', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(self.requests), 1)
+
+        # Other query
+        response = self.get('search=Django', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(self.requests), 2)
+
+        # Index changed
+        bump_index_generation(self.index)
+        response = self.get('search=Python', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(self.requests), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -158,6 +158,53 @@ class TestFacetedSearch(BaseRestFrameworkTestCase):
         """Test list results with facets."""
         return self._list_results_with_facets()
 
+    def test_list_results_with_composite_facets(self):
+        """Test list results with paginated (composite) facets."""
+        self.authenticate()
+
+        url = reverse('bookdocument-list', kwargs={})
+        data = {}
+
+        # First page of facet buckets
+        response = self.client.get(url + '?facet=state_composite', data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        facet = response.data['facets']['_filter_state_composite'][
+            'state_composite'
+        ]
+        self.assertEqual(
+            facet['buckets'],
+            [
+                {
+                    'key': {
+                        'value': constants.BOOK_PUBLISHING_STATUS_NOT_PUBLISHED
+                    },
+                    'doc_count': self.not_published_count,
+                }
+            ]
+        )
+
+        # Next page of facet buckets
+        response = self.client.get(
+            url + '?facet=state_composite&facet_after=state_composite:{}'
+                  ''.format(facet['after_key']['value']),
+            data
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        facet = response.data['facets']['_filter_state_composite'][
+            'state_composite'
+        ]
+        self.assertEqual(
+            facet['buckets'],
+            [
+                {
+                    'key': {
+                        'value': constants.BOOK_PUBLISHING_STATUS_PUBLISHED
+                    },
+                    'doc_count': self.published_count,
+                }
+            ]
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
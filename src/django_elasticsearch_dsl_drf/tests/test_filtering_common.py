@@ -12,9 +12,11 @@ from django.urls import reverse
 import pytest
 
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 
 from books import constants
 import factories
+from search_indexes.documents import BookDocument
 from search_indexes.viewsets import BookDocumentViewSet
 
 from ..constants import (
@@ -249,6 +251,28 @@ class TestFilteringCommon(BaseRestFrameworkTestCase,
             self.prefix_count
         )
 
+    def test_field_filter_in_max_values(self):
+        """Test filter in, limited number of values."""
+        with self.assertRaises(ValidationError):
+            self.backend.apply_query_in(
+                BookDocument.search(),
+                {'field': 'id', 'max_values': 2},
+                '1__2__3'
+            )
+
+    def test_field_filter_in_terms_lookup(self):
+        """Test filter in, values stored for a terms lookup."""
+        __ids = [str(__b.id) for __b in self.prefixed]
+        search = self.backend.apply_query_in(
+            BookDocument.search(),
+            {'field': 'id', 'terms_lookup_threshold': 1},
+            SEPARATOR_LOOKUP_COMPLEX_VALUE.join(__ids)
+        )
+        self.assertIn('index', search.to_dict()['query']['bool']['filter'][0][
+            'terms'
+        ]['id'])
+        self.assertEqual(search.count(), self.prefix_count)
+
     def _field_filter_terms_list(self, field_name, in_values, count):
         """Field filter terms.
 
@@ -345,6 +369,22 @@ class TestFilteringCommon(BaseRestFrameworkTestCase,
             self.all_count - self.published_count
         )
 
+    def test_field_filter_exclude_multiple_values(self):
+        """Test filter exclude, multiple values.
+
+        Example:
+
+            http://localhost:8000/api/articles/?state__exclude=published__in_progress
+        """
+        return self._field_filter_value(
+            'state__exclude',
+            SEPARATOR_LOOKUP_COMPLEX_VALUE.join([
+                constants.BOOK_PUBLISHING_STATUS_PUBLISHED,
+                constants.BOOK_PUBLISHING_STATUS_IN_PROGRESS,
+            ]),
+            self.all_count - self.published_count - self.in_progress_count
+        )
+
     def test_field_filter_isnull_true(self):
         """Test filter isnull true.
 
@@ -9,14 +9,23 @@ import unittest
 
 from django.core.management import call_command
 
+from elasticsearch_dsl.query import Q
+
+import mock
+
 import pytest
 
 from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
 
 from search_indexes.viewsets import AddressDocumentViewSet
 
 from ..constants import SEPARATOR_LOOKUP_COMPLEX_VALUE
-from ..filter_backends import NestedFilteringFilterBackend
+from ..filter_backends import (
+    FilteringFilterBackend,
+    NestedFilteringFilterBackend,
+)
 from .base import (
     BaseRestFrameworkTestCase,
     CORE_API_AND_CORE_SCHEMA_ARE_INSTALLED,
@@ -356,6 +365,82 @@ class TestFilteringNested(BaseRestFrameworkTestCase, AddressesMixin):
             self.all_addresses_count - self.addresses_in_yeovil_count
         )
 
+    def test_field_filter_same_path(self):
+        """Test filters on the same path."""
+        url = self.base_url[:]
+        response = self.client.get(
+            url + '?continent_country_city__in=Yeovil{}Dublin'
+                  '&continent_country_city__exclude=Dublin'
+                  ''.format(SEPARATOR_LOOKUP_COMPLEX_VALUE),
+            {}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            len(response.data['results']),
+            self.addresses_in_yeovil_count
+        )
+
+    def test_nested_filters_grouped_per_path(self):
+        """Test nested filters are grouped per path, in filter context."""
+        request = Request(
+            APIRequestFactory().get(
+                '/?continent_country=Netherlands'
+                '&continent_country_city=Amsterdam'
+                '&continent_country_city_id__gte=1'
+            )
+        )
+        view = AddressDocumentViewSet(request=request, action='list')
+        query = self.backend.filter_queryset(
+            request,
+            view.search,
+            view
+        ).to_dict()['query']
+
+        self.assertEqual(list(query), ['bool'])
+        self.assertEqual(list(query['bool']), ['filter'])
+        self.assertEqual(
+            [__f['nested']['path'] for __f in query['bool']['filter']],
+            ['continent.country', 'continent.country.city']
+        )
+        for __filter in query['bool']['filter']:
+            self.assertEqual(__filter['nested']['score_mode'], 'none')
+        self.assertEqual(
+            len(query['bool']['filter'][1]['nested']['query']['bool'][
+                'filter'
+            ]),
+            2
+        )
+
+    def test_nested_filters_connection(self):
+        """Test nested filters are collected on the connection of the view
+        (used by the terms lookups, for instance)."""
+        request = Request(
+            APIRequestFactory().get('/?continent_country=Netherlands')
+        )
+        view = AddressDocumentViewSet(request=request, action='list')
+        queryset = view.search.using('other').filter('term', id=1)
+        searches = []
+
+        def filter_queryset(backend, request, queryset, view):
+            searches.append(queryset)
+            return queryset.filter(
+                'nested',
+                path='continent.country',
+                query=Q('term', **{'continent.country.name': 'Netherlands'})
+            )
+
+        with mock.patch.object(FilteringFilterBackend,
+                               'filter_queryset',
+                               filter_queryset):
+            search = self.backend.filter_queryset(request, queryset, view)
+
+        self.assertEqual(searches[0]._using, 'other')
+        self.assertEqual(searches[0]._index, queryset._index)
+        self.assertEqual(searches[0].to_dict(), {})
+        self.assertEqual(search._using, 'other')
+        self.assertEqual(len(search.to_dict()['query']['bool']['filter']), 2)
+
     # def test_field_filter_isnull_true(self):
     #     """Test filter isnull true.
     #
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+Test geo helpers.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import json
+import unittest
+
+import elasticsearch
+from elasticsearch_dsl import Search
+
+import mock
+
+import pytest
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIRequestFactory
+
+from search_indexes.viewsets import PublisherDocumentViewSet
+
+from ..filter_backends import GeoSpatialFilteringFilterBackend
+from ..geo_helpers import (
+    close_ring,
+    decode_polyline,
+    flatten_points,
+    parse_geojson,
+    parse_lat_lon_pairs,
+    simplify_points,
+    split_encoded_value,
+    validate_lat_lon,
+)
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_geo_helpers'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestGeoHelpers',
+)
+
+
+@pytest.mark.django_db
+class TestGeoHelpers(unittest.TestCase):
+    """Test geo helpers."""
+
+    # Example from the encoded polyline algorithm format documentation
+    polyline = '_p~iF~ps|U_ulLnnqC_mqNvxq`@'
+    polyline_points = [
+        [38.5, -120.2],
+        [40.7, -120.95],
+        [43.252, -126.453],
+    ]
+
+    def test_parse_lat_lon_pairs(self):
+        """Test `parse_lat_lon_pairs`."""
+        self.assertEqual(
+            parse_lat_lon_pairs(['40,-70', '30,-80', '20,-90']),
+            [[40.0, -70.0], [30.0, -80.0], [20.0, -90.0]]
+        )
+        with self.assertRaises(ValueError):
+            parse_lat_lon_pairs(['40,-70', '30'])
+        with self.assertRaises(ValueError):
+            parse_lat_lon_pairs(['40,-70', 'a,b'])
+        with self.assertRaises(ValueError):
+            parse_lat_lon_pairs(['40,-70', '30,-80'], max_vertices=1)
+        # Misaligned values are not re-paired
+        with self.assertRaises(ValueError):
+            parse_lat_lon_pairs(['1,2,3', '4'])
+
+    def test_validate_lat_lon(self):
+        """Test `validate_lat_lon`."""
+        self.assertEqual(validate_lat_lon([[90, 180]]), [[90, 180]])
+        with self.assertRaises(ValueError):
+            validate_lat_lon([[91, 0]])
+        with self.assertRaises(ValueError):
+            validate_lat_lon([[0, -181]])
+        with self.assertRaises(ValueError):
+            validate_lat_lon([[40, 120]], lon_first=True)
+        with self.assertRaises(ValueError):
+            validate_lat_lon([[float('nan'), 1.0]])
+        with self.assertRaises(ValueError):
+            validate_lat_lon([[0, float('inf')]])
+
+    def test_decode_polyline(self):
+        """Test `decode_polyline`."""
+        self.assertEqual(
+            decode_polyline(self.polyline),
+            self.polyline_points
+        )
+        with self.assertRaises(ValueError):
+            decode_polyline(self.polyline[:-1])
+        with self.assertRaises(ValueError):
+            decode_polyline(self.polyline, max_vertices=2)
+
+    def test_split_encoded_value(self):
+        """Test `split_encoded_value`."""
+        self.assertEqual(
+            split_encoded_value(
+                'polyline:ab_c___name,my_name'
+                '__validation_method,IGNORE_MALFORMED',
+                ('_name', 'validation_method')
+            ),
+            (
+                'polyline:ab_c',
+                {'_name': 'my_name', 'validation_method': 'IGNORE_MALFORMED'}
+            )
+        )
+        self.assertEqual(
+            split_encoded_value('polyline:a__b', ('_name',)),
+            ('polyline:a__b', {})
+        )
+
+    def test_simplify_points(self):
+        """Test `simplify_points`."""
+        line = [[0, 0], [1, 0.1], [2, -0.1], [3, 5], [4, 6], [5, 7],
+                [6, 8.1], [7, 9], [8, 9], [9, 9]]
+        self.assertEqual(
+            simplify_points(line, 1),
+            [[0, 0], [2, -0.1], [3, 5], [7, 9], [9, 9]]
+        )
+        self.assertEqual(simplify_points(line, 0), line)
+
+        ring = close_ring([[0, 0], [0, 1], [0.01, 2], [0, 3], [3, 3], [3, 0]])
+        simplified = simplify_points(ring, 0.1)
+        self.assertEqual(simplified[0], simplified[-1])
+        self.assertNotIn([0.01, 2], simplified)
+
+    def test_flatten_points(self):
+        """Test `flatten_points`."""
+        self.assertEqual(flatten_points([1, 2]), [[1, 2]])
+        self.assertEqual(
+            flatten_points([[[1, 2], [3, 4]], [[5, 6]]]),
+            [[1, 2], [3, 4], [5, 6]]
+        )
+        self.assertEqual(flatten_points([]), [])
+        for coordinates in (5, [[1, 2], 3], [[None, 1]], [[1]], [['a', 1]]):
+            with self.assertRaises(ValueError):
+                flatten_points(coordinates)
+
+    def test_parse_geojson(self):
+        """Test `parse_geojson`."""
+        geometry = {'type': 'Point', 'coordinates': [6.37, 48.98]}
+        feature = {'type': 'Feature', 'geometry': geometry}
+        self.assertEqual(parse_geojson(json.dumps(feature)), geometry)
+        for value in (
+            '[1, 2]',
+            '{"type": "Feature", "geometry": 5}',
+            '{"type": 5, "coordinates": [6.37, 48.98]}',
+            '{"type": "Polygon", "coordinates": 5}',
+            '{"type": "Polygon", "coordinates": [[6.37, 48.98]]}',
+            '{"type": "Point", "coordinates": [[6.37, 48.98]]}',
+            '{"type": "Point", "coordinates": [true, false]}',
+            '[' * 100000,
+        ):
+            with self.assertRaises(ValueError):
+                parse_geojson(value)
+
+    def test_geo_polygon_params(self):
+        """Test `geo_polygon` params in all supported encodings."""
+        backend = GeoSpatialFilteringFilterBackend
+        expected = {
+            'location': {
+                'points': [
+                    {'lat': 38.5, 'lon': -120.2},
+                    {'lat': 40.7, 'lon': -120.95},
+                    {'lat': 43.252, 'lon': -126.453},
+                ]
+            },
+            '_name': 'myname',
+        }
+        self.assertEqual(
+            backend.get_geo_polygon_params(
+                '38.5,-120.2__40.7,-120.95__43.252,-126.453___name,myname',
+                'location'
+            ),
+            expected
+        )
+        self.assertEqual(
+            backend.get_geo_polygon_params(
+                'polyline:{}___name,myname'.format(self.polyline),
+                'location'
+            ),
+            expected
+        )
+        self.assertEqual(
+            backend.get_geo_polygon_params(
+                '{"type": "Polygon", "coordinates": [[[-120.2, 38.5], '
+                '[-120.95, 40.7], [-126.453, 43.252]]]}___name,myname',
+                'location'
+            ),
+            expected
+        )
+        # Out of range
+        self.assertEqual(
+            backend.get_geo_polygon_params('40,-70__30,-80__200,-90', 'loc'),
+            {}
+        )
+        # Vertex limit
+        self.assertEqual(
+            backend.get_geo_polygon_params(
+                '40,-70__30,-80__20,-90',
+                'loc',
+                {'max_vertices': 2}
+            ),
+            {}
+        )
+
+    def test_malformed_values(self):
+        """Test malformed (or out of range) values of the lookups."""
+        backend = GeoSpatialFilteringFilterBackend
+        for method, value in (
+            (backend.apply_query_geo_polygon, '40,-70__30,-80__200,-90'),
+            (backend.apply_query_geo_polygon, '40,-70__nan,-80__20,-90'),
+            (backend.apply_query_geo_polygon, 'polyline:_p~iF~ps|U_'),
+            (backend.apply_query_geo_polygon, '{"type": "Polygon"'),
+            (backend.apply_query_geo_polygon, '___name,myname'),
+            (backend.apply_query_geo_bounding_box, '40.73,-74.1'),
+            (backend.apply_query_geo_bounding_box, '40.73,-74.1__91,-71.12'),
+            (backend.apply_query_geo_shape, '48.98,6.37__relation,within'),
+            (backend.apply_query_geo_shape, '48.98,a__relation,within'),
+            (
+                backend.apply_query_geo_shape,
+                'geojson:{"type": 5, "coordinates": [6.37, 48.98]}'
+                '__relation,within'
+            ),
+            (
+                backend.apply_query_geo_shape,
+                'geojson:{"type": "Polygon", "coordinates": 5}'
+                '__relation,within'
+            ),
+            (
+                backend.apply_query_geo_polygon,
+                'geojson:{"type": "Polygon", "coordinates": 5}'
+            ),
+            (
+                backend.apply_query_geo_polygon,
+                'geojson:{"type": "Polygon", "coordinates": '
+                '[[[null, 1], [2, 3], [4, 5]]]}'
+            ),
+            (
+                backend.apply_query_geo_bounding_box,
+                'geojson:{"type": "MultiPoint", "coordinates": '
+                '[[1, "a"], [2, 3]]}'
+            ),
+        ):
+            with self.assertRaises(ValidationError):
+                method(Search(), {'field': 'location'}, value)
+
+    def test_malformed_values_response(self):
+        """Test malformed values result in a `400 Bad Request`."""
+        view = PublisherDocumentViewSet.as_view({'get': 'list'})
+        for query, message in (
+            (
+                {'location__geo_bounding_box': '44.87,40.07__93.87,41.11'},
+                'Latitude'
+            ),
+            (
+                {
+                    'location__geo_polygon':
+                        'geojson:{"type": "Polygon", "coordinates": '
+                        '[[[null, 1], [2, 3], [4, 5]]]}'
+                },
+                'GeoJSON'
+            ),
+        ):
+            with mock.patch.object(elasticsearch.Transport,
+                                   'perform_request') as perform_request:
+                response = view(
+                    APIRequestFactory().get('/publishers/', query)
+                )
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(message, str(response.data))
+            self.assertFalse(perform_request.called)
+
+    def test_geo_shape_params(self):
+        """Test `geo_shape` params in GeoJSON encoding."""
+        params = GeoSpatialFilteringFilterBackend.get_geo_shape_params(
+            'geojson:{"type": "Polygon", "coordinates": '
+            '[[[6.37, 48.98], [6.47, 48.98], [6.47, 48.90]]]}'
+            '__relation,within',
+            'location'
+        )
+        self.assertEqual(
+            params,
+            {
+                'location': {
+                    'shape': {
+                        'type': 'polygon',
+                        'coordinates': [[
+                            [6.37, 48.98],
+                            [6.47, 48.98],
+                            [6.47, 48.90],
+                            [6.37, 48.98],
+                        ]],
+                    },
+                    'relation': 'within',
+                }
+            }
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Test hedged searches.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import threading
+import time
+import unittest
+
+import elasticsearch
+from elasticsearch_dsl import Search
+
+import mock
+
+import pytest
+
+from rest_framework.test import APIRequestFactory
+
+from search_indexes.viewsets import BookDocumentViewSet
+
+from .. import hedging
+from ..coalescing import CoalescingSearchMixin
+from ..hedging import (
+    HedgedSearch,
+    HedgedSearchMixin,
+    HedgeTracker,
+    clear_hedge_trackers,
+    get_hedge_tracker,
+)
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_hedging'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestHedging',
+)
+
+
+class FakeClient(object):
+    """Client, slow unless hedged."""
+
+    def __init__(self, slow=0.5):
+        self.slow = slow
+        self.preferences = []
+        self.threads = []
+        self._lock = threading.Lock()
+
+    def request(self, preference):
+        with self._lock:
+            self.preferences.append(preference)
+            self.threads.append(threading.current_thread())
+        time.sleep(0.01 if 'hedge' in (preference or '') else self.slow)
+
+    def search(self, index=None, body=None, preference=None, **kwargs):
+        self.request(preference)
+        return {'hits': {'total': 1, 'hits': []}, 'preference': preference}
+
+    def get(self, index=None, id=None, preference=None, **kwargs):
+        self.request(preference)
+        return {'_id': id, 'found': True, 'preference': preference}
+
+
+class HedgedBookDocumentViewSet(BookDocumentViewSet):
+    """Book document view set, hedging every search."""
+
+    search_class = type(
+        'FakeHedgedSearch',
+        (HedgedSearch,),
+        {'hedge_budget': 1}
+    )
+
+
+class FakeHedgedSearch(HedgedSearch):
+    """Hedged search, hedging every search."""
+
+    hedge_budget = 1
+
+
+@pytest.mark.django_db
+class TestHedging(unittest.TestCase):
+    """Test hedged searches."""
+
+    def setUp(self):
+        clear_hedge_trackers()
+
+    def tearDown(self):
+        clear_hedge_trackers()
+
+    def warm_up(self, client, latency=0.01, count=20, operation='search'):
+        """Record latencies of the connection."""
+        tracker = get_hedge_tracker(
+            client,
+            operation,
+            budget=1,
+            min_delay=0.001
+        )
+        for __i in range(count):
+            tracker.record(latency)
+        return tracker
+
+    def test_tracker(self):
+        """Test delay and budget of the tracker."""
+        tracker = HedgeTracker(min_samples=10, budget=0.5, max_tokens=1)
+        self.assertIsNone(tracker.get_delay())
+        for __i in range(1, 101):
+            tracker.record(__i / 1000.0)
+        self.assertAlmostEqual(tracker.get_delay(), 0.096)
+
+        # One hedge per two searches
+        self.assertFalse(tracker.acquire_token())
+        tracker.add_tokens()
+        self.assertFalse(tracker.acquire_token())
+        tracker.add_tokens()
+        self.assertTrue(tracker.acquire_token())
+        self.assertFalse(tracker.acquire_token())
+
+        # Tokens are capped
+        for __i in range(10):
+            tracker.add_tokens()
+        self.assertTrue(tracker.acquire_token())
+        self.assertFalse(tracker.acquire_token())
+
+    def test_not_hedged_without_latencies(self):
+        """Test searches are not hedged until latencies are recorded."""
+        client = FakeClient(slow=0.05)
+        FakeHedgedSearch(using=client, index='books').execute()
+        self.assertEqual(client.preferences, [None])
+
+    def test_hedged(self):
+        """Test slow search is hedged."""
+        client = FakeClient()
+        self.warm_up(client)
+
+        start = time.monotonic()
+        response = FakeHedgedSearch(using=client, index='books').execute()
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertTrue(response.preference.startswith('hedge-'))
+        self.assertEqual(len(client.preferences), 2)
+        self.assertIsNone(client.preferences[0])
+
+        # Given preference is kept distinct
+        response = FakeHedgedSearch(using=client, index='books') \
+            .params(preference='user-1') \
+            .execute()
+        self.assertEqual(response.preference, 'user-1-hedge')
+
+    def test_budget(self):
+        """Test searches are not hedged beyond the budget."""
+        client = FakeClient(slow=0.05)
+        tracker = self.warm_up(client)
+        tracker.budget = 0
+
+        response = FakeHedgedSearch(using=client, index='books').execute()
+        self.assertIsNone(response.preference)
+        self.assertEqual(client.preferences, [None])
+
+    def test_busy_workers(self):
+        """Test searches are executed in the calling thread (not hedged) if
+        all workers are busy."""
+        client = FakeClient(slow=0.05)
+        self.warm_up(client)
+
+        with mock.patch.object(hedging,
+                               '_IDLE_WORKERS',
+                               threading.Semaphore(0)):
+            response = FakeHedgedSearch(using=client, index='books').execute()
+        self.assertIsNone(response.preference)
+        self.assertEqual(client.preferences, [None])
+        self.assertEqual(client.threads, [threading.current_thread()])
+
+    def test_get(self):
+        """Test slow GET is hedged."""
+        client = FakeClient()
+        self.warm_up(client, operation='get')
+
+        start = time.monotonic()
+        response = FakeHedgedSearch(using=client, index='books') \
+            .execute_get(index='books', id='1')
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(response['_id'], '1')
+        self.assertTrue(response['preference'].startswith('hedge-'))
+
+        # Latencies of searches are tracked separately
+        clear_hedge_trackers()
+        client = FakeClient(slow=0.05)
+        self.warm_up(client)
+        response = FakeHedgedSearch(using=client, index='books') \
+            .execute_get(index='books', id='1')
+        self.assertEqual(client.preferences, [None])
+
+    def test_get_object(self):
+        """Test GET of the detail views is hedged."""
+        preferences = []
+
+        def perform_request(transport, method, url, headers=None,
+                            params=None, body=None):
+            __preference = (params or {}).get('preference')
+            if isinstance(__preference, bytes):
+                __preference = __preference.decode('utf-8')
+            preferences.append(__preference)
+            time.sleep(0.01 if __preference else 0.5)
+            return {
+                '_index': 'book',
+                '_id': '1',
+                'found': True,
+                '_source': {'id': 1, 'title': __preference},
+            }
+
+        self.warm_up(
+            HedgedBookDocumentViewSet().search._using,
+            operation='get'
+        )
+        with mock.patch.object(elasticsearch.Transport,
+                               'perform_request',
+                               perform_request):
+            response = HedgedBookDocumentViewSet.as_view(
+                {'get': 'retrieve'}
+            )(APIRequestFactory().get('/books/1/'), id='1')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['title'].startswith('hedge-'))
+        self.assertEqual(len(preferences), 2)
+
+    def test_combined(self):
+        """Test hedging combined with coalescing."""
+
+        class CombinedSearch(HedgedSearchMixin,
+                             CoalescingSearchMixin,
+                             Search):
+
+            hedge_budget = 1
+
+        client = FakeClient()
+        self.warm_up(client)
+
+        response = CombinedSearch(using=client, index='books').execute()
+        self.assertTrue(response.preference.startswith('hedge-'))
+
+
+if __name__ == '__main__':
+    unittest.main()
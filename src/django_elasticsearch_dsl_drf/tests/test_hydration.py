@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Test hydration of the model instances from hits.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import unittest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+import elasticsearch
+
+import mock
+
+import pytest
+
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+
+from books.models import Book
+
+import factories
+
+from search_indexes.viewsets import BookDocumentViewSet
+
+from ..pagination import ModelHydratingPagination
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_hydration'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestHydration',
+)
+
+
+class BookModelSerializer(serializers.ModelSerializer):
+    """Book model serializer."""
+
+    publisher = serializers.CharField(source='publisher.name')
+    tags = serializers.SerializerMethodField()
+    score = serializers.SerializerMethodField()
+    highlight = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Book
+        fields = ('id', 'title', 'publisher', 'tags', 'score', 'highlight')
+
+    def get_tags(self, obj):
+        return [__tag.title for __tag in obj.tags.all()]
+
+    def get_score(self, obj):
+        return obj.meta.score
+
+    def get_highlight(self, obj):
+        if 'highlight' in obj.meta:
+            return obj.meta.highlight.to_dict()
+
+
+class HydratingBookDocumentViewSet(BookDocumentViewSet):
+    """Book document view set, hydrating the hits."""
+
+    serializer_class = BookModelSerializer
+    pagination_class = ModelHydratingPagination
+    hydrate_select_related = ['publisher']
+    hydrate_prefetch_related = ['tags']
+
+
+@pytest.mark.django_db
+class TestHydration(unittest.TestCase):
+    """Test hydration of the model instances from hits."""
+
+    def setUp(self):
+        with override_settings(ELASTICSEARCH_DSL_AUTOSYNC=False):
+            self.books = factories.BookWithUniqueTitleFactory.create_batch(5)
+        self.factory = APIRequestFactory()
+        self.view = HydratingBookDocumentViewSet.as_view({'get': 'list'})
+
+    def perform_request(self, method, url, headers=None, params=None,
+                        body=None):
+        """Fake transport request: books in reverse order and a book not
+        in the database."""
+        hits = [
+            {
+                '_index': 'book',
+                '_id': str(__book.pk),
+                '_score': float(__index),
+                '_source': {'title': 'Indexed title'},
+            }
+            for __index, __book in enumerate(self.books)
+        ]
+        hits.reverse()
+        hits[0]['highlight'] = {'title': ['<em>Python</em>']}
+        hits.insert(1, {'_index': 'book', '_id': '999999', '_score': 1.0})
+        return {
+            'hits': {
+                'total': {'value': len(hits), 'relation': 'eq'},
+                'hits': hits,
+            },
+        }
+
+    def test_hydration(self):
+        """Test hits are hydrated in a single query, in order of hits."""
+        with mock.patch.object(elasticsearch.Transport,
+                               'perform_request',
+                               self.perform_request):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.view(self.factory.get('/books/'))
+                response.render()
+
+        # Books (with publishers) and tags
+        self.assertEqual(len(queries), 2)
+
+        results = response.data['results']
+        self.assertEqual(
+            [__result['id'] for __result in results],
+            [__book.pk for __book in reversed(self.books)]
+        )
+        self.assertEqual(results[0]['title'], self.books[-1].title)
+        self.assertEqual(
+            results[0]['publisher'],
+            self.books[-1].publisher.name
+        )
+        self.assertEqual(results[0]['score'], 4.0)
+        self.assertEqual(
+            results[0]['highlight'],
+            {'title': ['<em>Python</em>']}
+        )
+        self.assertIsNone(results[1]['highlight'])
+        self.assertEqual(response.data['count'], 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Test indexing helpers.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+import mock
+
+import pytest
+
+from books.models import Book
+
+import factories
+
+from search_indexes.documents import BookDocument
+
+from ..indexing import (
+    AdaptiveChunkSize,
+    _iter_prepared_chunks,
+    get_versioned_index_name,
+    iter_pk_chunks,
+)
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_indexing'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestIndexing',
+)
+
+
+@pytest.mark.django_db
+class TestIndexing(unittest.TestCase):
+    """Test indexing helpers."""
+
+    def setUp(self):
+        # Objects are indexed by the tests, not upon save
+        with override_settings(ELASTICSEARCH_DSL_AUTOSYNC=False):
+            self.books = factories.BookWithUniqueTitleFactory.create_batch(7)
+
+    def test_adaptive_chunk_size(self):
+        """Test chunk size tuned by the latency."""
+        chunk_size = AdaptiveChunkSize(
+            chunk_size=100,
+            min_chunk_size=10,
+            max_chunk_size=200,
+            target_latency=1.0
+        )
+
+        # Fast requests
+        self.assertEqual(chunk_size.update(100, 0.1), 150)
+        self.assertEqual(chunk_size.update(150, 0.1), 200)
+        self.assertEqual(chunk_size.update(200, 0.1), 200)
+
+        # Requests of the smaller (earlier) chunks do not grow it
+        self.assertEqual(chunk_size.update(100, 0.1), 200)
+
+        # Requests within the target latency
+        self.assertEqual(chunk_size.update(200, 0.7), 200)
+
+        # Slow requests
+        self.assertEqual(chunk_size.update(200, 2.0), 100)
+        self.assertEqual(chunk_size.update(200, 2.0), 50)
+        self.assertEqual(chunk_size.update(50, 2.0), 25)
+        self.assertEqual(chunk_size.update(25, 2.0), 12)
+        self.assertEqual(chunk_size.update(12, 2.0), 10)
+
+    def test_iter_pk_chunks(self):
+        """Test streaming primary keys in PK-ordered chunks."""
+        pks = sorted(__book.pk for __book in self.books)
+        queryset = Book.objects.filter(pk__in=pks).order_by('-title')
+        self.assertEqual(
+            list(iter_pk_chunks(queryset, 3)),
+            [pks[:3], pks[3:6], pks[6:]]
+        )
+        self.assertEqual(list(iter_pk_chunks(queryset, 7)), [pks])
+        self.assertEqual(list(iter_pk_chunks(queryset.none(), 3)), [])
+
+    def test_prepare_chunks(self):
+        """Test preparing the actions in chunks."""
+        pks = sorted(__book.pk for __book in self.books)
+        chunks = _iter_prepared_chunks(
+            BookDocument,
+            iter_pk_chunks(Book.objects.filter(pk__in=pks), 4),
+            index='book-v2'
+        )
+
+        # Related objects are fetched in a constant number of queries per
+        # chunk
+        with CaptureQueriesContext(connection) as queries:
+            actions = next(chunks)
+        self.assertLessEqual(len(queries), 4)
+
+        actions += next(chunks)
+        self.assertEqual(list(chunks), [])
+        self.assertEqual([__a['_id'] for __a in actions], pks)
+        self.assertEqual({__a['_index'] for __a in actions}, {'book-v2'})
+        self.assertEqual(
+            actions[0]['_source']['title'],
+            Book.objects.get(pk=pks[0]).title
+        )
+
+    def test_prepare_chunks_in_processes(self):
+        """Test preparing the actions in a process pool."""
+        pks = sorted(__book.pk for __book in self.books)
+        with tempfile.TemporaryDirectory() as __dir:
+            # Processes are spawned, thus the (in-memory) test database is
+            # copied to a file they connect to
+            name = os.path.join(__dir, 'test.db')
+            connection.ensure_connection()
+            database = sqlite3.connect(name)
+            database.executescript(
+                '\n'.join(connection.connection.iterdump())
+            )
+            database.close()
+
+            with mock.patch.dict(connection.settings_dict, {'NAME': name}):
+                chunks = list(
+                    _iter_prepared_chunks(
+                        BookDocument,
+                        iter_pk_chunks(Book.objects.filter(pk__in=pks), 3),
+                        process_count=1,
+                        index='book-v2'
+                    )
+                )
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(
+            [__a['_id'] for __chunk in chunks for __a in __chunk],
+            pks
+        )
+        self.assertEqual(
+            chunks[0][0]['_source']['title'],
+            Book.objects.get(pk=pks[0]).title
+        )
+
+    def test_get_versioned_index_name(self):
+        """Test versioned index names."""
+        name = get_versioned_index_name('book')
+        self.assertTrue(name.startswith('book-'))
+        self.assertNotEqual(name, get_versioned_index_name('book'))
+
+
+if __name__ == '__main__':
+    unittest.main()
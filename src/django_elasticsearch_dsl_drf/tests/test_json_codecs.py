@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Test JSON codecs.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import datetime
+import decimal
+import json
+import unittest
+import uuid
+
+from django.core.exceptions import ImproperlyConfigured
+
+from elasticsearch.exceptions import SerializationError
+from elasticsearch_dsl.connections import connections
+from elasticsearch_dsl.utils import AttrDict
+
+import mock
+
+import pytest
+
+from rest_framework.renderers import JSONRenderer
+
+from search_indexes.viewsets import BookFastJSONDocumentViewSet
+
+from .. import json_codecs
+from ..json_codecs import (
+    FastJSONSerializer,
+    JSON_CODECS,
+    UJSONCodec,
+    get_client,
+    get_json_codec,
+)
+from ..renderers import FastJSONRenderer
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_json_codecs'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestJSONCodecs',
+)
+
+
+@pytest.mark.django_db
+class TestJSONCodecs(unittest.TestCase):
+    """Test JSON codecs."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data = {
+            'title': 'Ünïcode title',
+            'url': 'http://localhost/books/',
+            'price': decimal.Decimal('9.99'),
+            'uuid': uuid.UUID('12345678123456781234567812345678'),
+            'publication_date': datetime.date(2020, 1, 31),
+            'created': datetime.datetime(2020, 1, 31, 12, 30, 15),
+            'tags': ('lorem', 'ipsum'),
+            'meta': AttrDict({'score': 1.5, 'highlight': {'title': ['a']}}),
+            'separators': '  ',
+        }
+
+    def _codecs(self):
+        """Available codecs."""
+        return [
+            __codec() for __codec in JSON_CODECS.values()
+            if __codec.is_available()
+        ]
+
+    def test_codecs(self):
+        """Test codecs output the same data."""
+        data = dict(self.data)
+        data.pop('meta')
+        expected = json.loads(
+            json.dumps(data, cls=JSONRenderer.encoder_class)
+        )
+        expected['created'] = '2020-01-31T12:30:15'
+        expected['meta'] = self.data['meta'].to_dict()
+        for codec in self._codecs():
+            self.assertEqual(
+                codec.loads(codec.dumps(self.data)),
+                expected,
+                codec.name
+            )
+            self.assertEqual(
+                codec.loads(codec.dumps_bytes(self.data)),
+                expected,
+                codec.name
+            )
+
+    def test_get_json_codec(self):
+        """Test getting codecs."""
+        self.assertEqual(get_json_codec('json').name, 'json')
+        self.assertTrue(get_json_codec().is_available())
+        with self.assertRaises(ImproperlyConfigured):
+            get_json_codec('simplejson')
+
+    def test_ujson_version(self):
+        """Test `ujson` older than 5.0 is not used."""
+        for __version, __available in (('1.35', False), ('5.1.0', True)):
+            with mock.patch.object(
+                json_codecs,
+                'ujson',
+                mock.Mock(__version__=__version)
+            ):
+                self.assertEqual(UJSONCodec.is_available(), __available)
+
+        with mock.patch.object(
+            json_codecs,
+            'ujson',
+            mock.Mock(__version__='1.35')
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                get_json_codec('ujson')
+
+    def test_renderer(self):
+        """Test renderer output is the same as of the `JSONRenderer`."""
+        data = dict(self.data)
+        data.pop('meta')
+        self.assertEqual(
+            FastJSONRenderer().render(data),
+            JSONRenderer().render(data)
+        )
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+        self.assertEqual(
+            json.loads(FastJSONRenderer().render({'meta': self.data['meta']})),
+            {'meta': self.data['meta'].to_dict()}
+        )
+
+    def test_transport_serializer(self):
+        """Test transport serializer."""
+        serializer = FastJSONSerializer()
+        self.assertEqual(serializer.dumps('{"a": 1}'), '{"a": 1}')
+        self.assertEqual(
+            serializer.loads(serializer.dumps(self.data))['meta'],
+            {'score': 1.5, 'highlight': {'title': ['a']}}
+        )
+        with self.assertRaises(SerializationError):
+            serializer.loads('{')
+        with self.assertRaises(SerializationError):
+            serializer.dumps({'a': object()})
+
+    def test_get_client(self):
+        """Test clients with custom transport serializer."""
+        alias = BookFastJSONDocumentViewSet.document._get_using()
+        client = connections.get_connection(alias)
+        self.assertIs(get_client(alias), client)
+
+        fast_client = get_client(alias, FastJSONSerializer)
+        self.assertIs(get_client(alias, FastJSONSerializer), fast_client)
+        self.assertIsNot(fast_client, client)
+        self.assertIs(
+            fast_client.transport.connection_pool,
+            client.transport.connection_pool
+        )
+        self.assertIsInstance(
+            fast_client.transport.serializer,
+            FastJSONSerializer
+        )
+        self.assertIsInstance(
+            fast_client.transport.deserializer.default,
+            FastJSONSerializer
+        )
+        self.assertNotIsInstance(client.transport.serializer,
+                                 FastJSONSerializer)
+        self.assertIs(BookFastJSONDocumentViewSet().client, fast_client)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,8 @@ import unittest
 
 from django.core.management import call_command
 
+from elasticsearch_dsl.connections import connections
+
 import pytest
 
 from ..elasticsearch_helpers import delete_all_indices, get_all_indices
@@ -51,6 +53,38 @@ class TestManagementCommands(BaseTestCase):
 
         self.assertSetEqual(res, expected)
 
+    def _bulk_index(self):
+        """Bulk index."""
+        client = connections.get_connection()
+        count = client.count(index='test_book')['count']
+
+        call_command(
+            'elasticsearch_bulk_index',
+            '--models', 'books.book',
+            '--process-count', '0'
+        )
+
+        client.indices.refresh(index='test_book')
+        self.assertEqual(client.count(index='test_book')['count'], count)
+
+    def _reindex(self):
+        """Blue/green reindex."""
+        client = connections.get_connection()
+        count = client.count(index='test_book')['count']
+
+        call_command('elasticsearch_reindex', '--models', 'books.book')
+        call_command(
+            'elasticsearch_reindex',
+            '--models', 'books.book',
+            '--delete-old'
+        )
+
+        indices = list(client.indices.get_alias(name='test_book'))
+        self.assertEqual(len(indices), 1)
+        self.assertTrue(indices[0].startswith('test_book-'))
+        self.assertNotIn('test_book', get_all_indices())
+        self.assertEqual(client.count(index='test_book')['count'], count)
+
     def _delete_all_indices(self):
         """Delete all indices."""
         call_command('elasticsearch_remove_indexes', '--with-protected')
@@ -62,6 +96,8 @@ class TestManagementCommands(BaseTestCase):
     def test_all(self):
         """Filter by field."""
         self._get_all_indices()
+        self._bulk_index()
+        self._reindex()
         self._delete_all_indices()
 
 
@@ -9,6 +9,8 @@ import unittest
 from django.core.management import call_command
 from django.urls import reverse
 
+from elasticsearch.connection.base import Connection
+
 import pytest
 
 from rest_framework import status
@@ -25,6 +27,18 @@ __all__ = (
     'TestPagination',
 )
 
+old_log_request_success = Connection.log_request_success
+es_call_count = 0
+
+
+def patched_log_request_success(self, *args, **kwargs):
+    global es_call_count
+    es_call_count += 1
+    old_log_request_success(self, *args, **kwargs)
+
+
+Connection.log_request_success = patched_log_request_success
+
 
 @pytest.mark.django_db
 class TestPagination(BaseRestFrameworkTestCase):
@@ -52,11 +66,26 @@ class TestPagination(BaseRestFrameworkTestCase):
 
         invalid_page_url = books_url + '?page=3&page_size=30'
 
+        last_es_call_count = es_call_count
         invalid_response = self.client.get(invalid_page_url, data)
         self.assertEqual(
             invalid_response.status_code,
             status.HTTP_404_NOT_FOUND
         )
+        # Page number is validated without a separate count request
+        self.assertEqual(es_call_count - last_es_call_count, 1)
+
+        last_es_call_count = es_call_count
+        valid_response = self.client.get(
+            books_url + '?page=2&page_size=30',
+            data
+        )
+        self.assertEqual(valid_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(valid_response.data['results']), 10)
+        self.assertEqual(valid_response.data['count'], 40)
+        self.assertIsNone(valid_response.data['next'])
+        self.assertIsNotNone(valid_response.data['previous'])
+        self.assertEqual(es_call_count - last_es_call_count, 1)
 
         valid_page_url = publishers_url + '?limit=5&offset=8'
 
@@ -76,6 +76,11 @@ class TestQueryFriendlyPagination(BaseRestFrameworkTestCase):
 
         # Check totals
         self.assertEqual(len(valid_response.data['results']), 43)
+        self.assertEqual(valid_response.data['count'], 43)
+        self.assertIsNone(valid_response.data['next'])
+
+        # Facets are kept
+        self.assertIn('publisher', valid_response.data['facets'])
 
     def _test_pagination_orphans_over(self):
         """Test pagination when orphaned nodes fall into next page"""
@@ -87,6 +92,7 @@ class TestQueryFriendlyPagination(BaseRestFrameworkTestCase):
 
         # Check totals
         self.assertEqual(len(valid_response.data['results']), 40)
+        self.assertIsNotNone(valid_response.data['next'])
 
         valid_page_url = self.books_url + '?page=2&page_size=40&orphans=2'
 
@@ -121,12 +127,12 @@ class TestQueryFriendlyPagination(BaseRestFrameworkTestCase):
 
         last_es_call_count = es_call_count
         self._test_pagination_orphans()
-        # Only in case of orphaned nodes, we need 1 more fallback ES call
-        self.assertEqual(es_call_count - last_es_call_count, 2)
+        # Orphaned nodes are fetched along with the page
+        self.assertEqual(es_call_count - last_es_call_count, 1)
 
         last_es_call_count = es_call_count
         self._test_pagination_orphans_over()
-        # Here are two requests
+        # Here are two requests (one per page)
         self.assertEqual(es_call_count - last_es_call_count, 2)
 
         last_es_call_count = es_call_count
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Test query params parsing.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import unittest
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+import pytest
+
+from ..filter_backends import FilteringFilterBackend
+from ..query_params import ParsedQueryParams, get_query_params
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_query_params'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestQueryParams',
+)
+
+
+@pytest.mark.django_db
+class TestQueryParams(unittest.TestCase):
+    """Test query params parsing."""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+    def get_request(self, query_string):
+        """Get DRF request."""
+        return Request(self.factory.get('/books/?{}'.format(query_string)))
+
+    def test_parse(self):
+        """Test parsing."""
+        params = ParsedQueryParams(
+            self.get_request(
+                'title__prefix=py&state=published&state=+&id__in=1__2'
+            ).query_params
+        )
+        self.assertEqual(
+            list(params),
+            [
+                ('title__prefix', 'title', 'prefix', ['py']),
+                ('state', 'state', None, ['published']),
+                ('id__in', 'id', 'in', ['1__2']),
+            ]
+        )
+        self.assertEqual(
+            dict(params.lookups('title')),
+            {'prefix': ('title__prefix', ['py'])}
+        )
+        self.assertEqual(dict(params.lookups('isbn')), {})
+        self.assertIn('state', params)
+        self.assertNotIn('isbn', params)
+        self.assertEqual(params.getlist('state'), ['published', ' '])
+        self.assertEqual(params.getlist('isbn'), [])
+        self.assertEqual(params.get('title__prefix'), 'py')
+
+    def test_parsed_once(self):
+        """Test query params are parsed once per request."""
+        request = self.get_request('title=Python&ordering=-id')
+        params = get_query_params(request)
+        self.assertIs(get_query_params(request), params)
+        self.assertIsNot(
+            get_query_params(self.get_request('title=Python')),
+            params
+        )
+
+    def test_filter_query_params(self):
+        """Test filter query params of a backend."""
+        view = type(
+            'View',
+            (object,),
+            {
+                'filter_fields': {'title': 'title.raw', 'state': 'state.raw'},
+                'mapping': 'book',
+            }
+        )()
+        request = self.get_request('title__wildcard=*py*&state=&page=2')
+        res = FilteringFilterBackend().get_filter_query_params(request, view)
+
+        self.assertEqual(list(res), ['title__wildcard'])
+        self.assertEqual(res['title__wildcard']['lookup'], 'wildcard')
+        self.assertEqual(res['title__wildcard']['values'], ['*py*'])
+        self.assertEqual(res['title__wildcard']['field'], 'title.raw')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Test compiled search query templates.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import json
+import unittest
+
+import pytest
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from search_indexes.viewsets import (
+    BookMultiMatchOptionsPhasePrefixSearchFilterBackendDocumentViewSet,
+    BookSimpleQueryStringBoostSearchFilterBackendDocumentViewSet,
+    CityCompoundSearchBackendDocumentViewSet,
+)
+
+from ..filter_backends import (
+    CompoundSearchFilterBackend,
+    MultiMatchSearchFilterBackend,
+    SimpleQueryStringSearchFilterBackend,
+)
+from ..filter_backends.search.query_templates import (
+    QUERY_TEMPLATES,
+    clear_query_templates,
+)
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_query_templates'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestQueryTemplates',
+)
+
+
+@pytest.mark.django_db
+class TestQueryTemplates(unittest.TestCase):
+    """Test compiled search query templates."""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        clear_query_templates()
+
+    def tearDown(self):
+        clear_query_templates()
+
+    def _search_body(self, view_class, search_backend, search_terms,
+                     compile_search_queries):
+        """Get search body, built with or without query templates."""
+        request = Request(
+            self.factory.get(
+                '/',
+                {search_backend.search_param: search_terms}
+            )
+        )
+        view = view_class()
+        view.request = request
+        view.compile_search_queries = compile_search_queries
+        queryset = search_backend().filter_queryset(
+            request,
+            view_class.document.search(),
+            view
+        )
+        return json.dumps(queryset.to_dict(), sort_keys=True)
+
+    def _test_compiled(self, view_class, search_backend):
+        """Test that compiled queries match the constructed ones."""
+        for search_terms in (
+            ['lorem'],
+            ['Lorem "ipsum" \\ dolor ñ'],
+            ['title:lorem'],
+            ['title,summary:lorem', 'ipsum'],
+            ['country:Armenia'],
+        ):
+            expected = self._search_body(
+                view_class,
+                search_backend,
+                search_terms,
+                False
+            )
+            # Compiled and cached
+            for __i in range(2):
+                self.assertEqual(
+                    self._search_body(
+                        view_class,
+                        search_backend,
+                        search_terms,
+                        True
+                    ),
+                    expected
+                )
+
+    def test_compound_search(self):
+        """Test compound search (match and nested queries)."""
+        self._test_compiled(
+            CityCompoundSearchBackendDocumentViewSet,
+            CompoundSearchFilterBackend
+        )
+
+    def test_multi_match_search(self):
+        """Test multi match search."""
+        self._test_compiled(
+            BookMultiMatchOptionsPhasePrefixSearchFilterBackendDocumentViewSet,
+            MultiMatchSearchFilterBackend
+        )
+
+    def test_simple_query_string_search(self):
+        """Test simple query string search."""
+        self._test_compiled(
+            BookSimpleQueryStringBoostSearchFilterBackendDocumentViewSet,
+            SimpleQueryStringSearchFilterBackend
+        )
+
+    def test_templates_cache(self):
+        """Test that templates are compiled once per shape."""
+        view_class = CityCompoundSearchBackendDocumentViewSet
+        for search_terms in (['lorem'], ['ipsum'], ['name:lorem']):
+            self._search_body(
+                view_class,
+                CompoundSearchFilterBackend,
+                search_terms,
+                True
+            )
+        self.assertEqual(len(QUERY_TEMPLATES), 2)
+
+        clear_query_templates(view_class)
+        self.assertEqual(len(QUERY_TEMPLATES), 0)
+
+    def test_not_compiled(self):
+        """Test that templates are not compiled unless enabled."""
+        self._search_body(
+            CityCompoundSearchBackendDocumentViewSet,
+            CompoundSearchFilterBackend,
+            ['lorem'],
+            False
+        )
+        self.assertEqual(len(QUERY_TEMPLATES), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
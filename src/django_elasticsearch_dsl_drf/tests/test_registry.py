@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Test registry.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import unittest
+
+from ..utils import Registry
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_registry'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestRegistry',
+)
+
+
+class TestRegistry(unittest.TestCase):
+    """Test registry."""
+
+    def test_get_or_create(self):
+        """Test objects are created once."""
+        registry = Registry()
+        created = []
+        barrier = threading.Barrier(8)
+
+        def create():
+            created.append(object())
+            return created[-1]
+
+        def get(key):
+            barrier.wait()
+            return registry.get_or_create(key, create)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            objects = list(executor.map(get, ['a'] * 8))
+
+        self.assertEqual(len(created), 1)
+        self.assertTrue(all(__object is created[0] for __object in objects))
+        self.assertEqual(registry, {'a': created[0]})
+
+    def test_remove(self):
+        """Test removing objects."""
+        registry = Registry({('a', 1): 1, ('a', 2): 2, ('b', 1): 3})
+        registry.remove(lambda key: key[0] == 'a')
+        self.assertEqual(registry, {('b', 1): 3})
+        registry.remove()
+        self.assertEqual(registry, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
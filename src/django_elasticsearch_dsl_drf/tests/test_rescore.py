@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Test rescore backend.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import unittest
+
+from elasticsearch_dsl import Search
+
+import pytest
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from search_indexes.viewsets import (
+    BookRescoreCompoundSearchBackendDocumentViewSet,
+)
+
+from ..filter_backends import RescoreBackend
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_rescore'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestRescore',
+)
+
+
+class WideRescoreViewSet(BookRescoreCompoundSearchBackendDocumentViewSet):
+    """Rescore window exceeding the maximum window size."""
+
+    rescore_options = {
+        'window_size': 5000,
+    }
+
+
+@pytest.mark.django_db
+class TestRescore(unittest.TestCase):
+    """Test rescore backend."""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.backend = RescoreBackend()
+
+    def get_body(self, queryset,
+                 view_class=BookRescoreCompoundSearchBackendDocumentViewSet,
+                 url='/books/?search=python'):
+        """Get the search body produced by the rescore backend."""
+        view = view_class()
+        request = Request(self.factory.get(url))
+        return self.backend.filter_queryset(
+            request,
+            queryset,
+            view
+        ).to_dict()
+
+    def test_rescore(self):
+        """Test rescore clause."""
+        body = self.get_body(Search().sort('_score'))
+        self.assertEqual(
+            body['rescore'],
+            {
+                'window_size': 200,
+                'query': {
+                    'query_weight': 0.7,
+                    'rescore_query_weight': 1.2,
+                    'score_mode': 'total',
+                    'rescore_query': {
+                        'bool': {
+                            'should': [
+                                {
+                                    'match_phrase': {
+                                        'title': {
+                                            'query': 'python',
+                                            'boost': 4,
+                                        }
+                                    }
+                                },
+                                {
+                                    'match_phrase': {
+                                        'summary': {
+                                            'query': 'python',
+                                            'boost': 2,
+                                        }
+                                    }
+                                },
+                                {
+                                    'match_phrase': {
+                                        'description': {
+                                            'query': 'python',
+                                        }
+                                    }
+                                },
+                            ]
+                        }
+                    },
+                },
+            }
+        )
+
+    def test_rescore_unsorted(self):
+        """Test rescore clause without explicit sorting."""
+        body = self.get_body(Search())
+        self.assertEqual(body['rescore']['window_size'], 200)
+
+    def test_rescore_score_sort_order(self):
+        """Test rescore clause with explicit `_score` sort order."""
+        body = self.get_body(Search().sort({'_score': {'order': 'desc'}}))
+        self.assertEqual(body['rescore']['window_size'], 200)
+
+    def test_max_window_size(self):
+        """Test window size is capped at the maximum window size."""
+        body = self.get_body(Search(), view_class=WideRescoreViewSet)
+        self.assertEqual(
+            body['rescore']['window_size'],
+            RescoreBackend.max_window_size
+        )
+        self.assertEqual(body['rescore']['query']['query_weight'], 1.0)
+
+    def test_no_rescore_sorted(self):
+        """Test no rescore clause when sorted by another field."""
+        for __sort in ('title', {'price': {'order': 'desc'}}):
+            body = self.get_body(Search().sort('_score', __sort))
+            self.assertNotIn('rescore', body)
+
+    def test_no_rescore_collapsed(self):
+        """Test no rescore clause when results are collapsed."""
+        body = self.get_body(Search().extra(collapse={'field': 'state'}))
+        self.assertNotIn('rescore', body)
+
+    def test_no_rescore_without_search(self):
+        """Test no rescore clause without search terms."""
+        body = self.get_body(Search(), url='/books/')
+        self.assertNotIn('rescore', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
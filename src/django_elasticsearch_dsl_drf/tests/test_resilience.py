@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Test stale-while-revalidate fallback.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import time
+import unittest
+
+from django.core.cache import caches
+
+from elasticsearch.exceptions import ConnectionError, TransportError
+
+import pytest
+
+from ..resilience import (
+    CircuitBreaker,
+    ResilientSearch,
+    ServiceUnavailable,
+    clear_circuit_breakers,
+    get_circuit_breaker,
+    is_stale,
+    reset_stale,
+)
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_resilience'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestResilience',
+)
+
+
+class FakeClient(object):
+    """Client failing while `error` is set."""
+
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+        self.total = 1
+
+    def search(self, index=None, body=None, **kwargs):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return {'hits': {'total': self.total, 'hits': []}}
+
+
+class FakeResilientSearch(ResilientSearch):
+    """Resilient search, opening the breaker on the second failure."""
+
+    failure_threshold = 2
+
+    reset_timeout = 60
+
+
+@pytest.mark.django_db
+class TestResilience(unittest.TestCase):
+    """Test stale-while-revalidate fallback."""
+
+    def setUp(self):
+        clear_circuit_breakers()
+        caches['default'].clear()
+        reset_stale()
+        self.client = FakeClient()
+
+    def tearDown(self):
+        clear_circuit_breakers()
+        caches['default'].clear()
+
+    def get_search(self):
+        """Get search."""
+        return FakeResilientSearch(using=self.client, index='books') \
+            .query('match', title='Python')
+
+    def test_circuit_breaker(self):
+        """Test circuit breaker."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, breaker.CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, breaker.OPEN)
+        self.assertFalse(breaker.allow_request())
+
+        time.sleep(0.05)
+        # Single trial request
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, breaker.OPEN)
+
+        time.sleep(0.05)
+        self.assertTrue(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(breaker.state, breaker.CLOSED)
+        self.assertEqual(breaker.failures, 0)
+
+    def test_stale_fallback(self):
+        """Test stale response is served while the breaker is open."""
+        self.assertEqual(self.get_search().execute().hits.total, 1)
+        self.assertFalse(is_stale())
+
+        self.client.error = ConnectionError('N/A', 'Timeout', None)
+        self.client.total = 2
+
+        # Failed, stale response served
+        self.assertEqual(self.get_search().execute().hits.total, 1)
+        self.assertTrue(is_stale())
+        self.assertEqual(self.client.calls, 2)
+
+        # Breaker opens
+        self.get_search().execute()
+        breaker = get_circuit_breaker(self.client)
+        self.assertEqual(breaker.state, breaker.OPEN)
+
+        # Not sent while the breaker is open
+        self.assertEqual(self.get_search().execute().hits.total, 1)
+        self.assertEqual(self.client.calls, 3)
+
+        # Never executed, thus nothing to serve
+        with self.assertRaises(ServiceUnavailable):
+            self.get_search().query('match', title='Django').execute()
+
+        # Half-open: revalidated in the background
+        self.client.error = None
+        breaker.opened_at -= 60
+        self.assertEqual(self.get_search().execute().hits.total, 1)
+        for __i in range(100):
+            if breaker.state == breaker.CLOSED:
+                break
+            time.sleep(0.01)
+        self.assertEqual(breaker.state, breaker.CLOSED)
+
+        reset_stale()
+        self.assertEqual(self.get_search().execute().hits.total, 2)
+        self.assertFalse(is_stale())
+
+    def test_request_errors(self):
+        """Test errors of the request are not counted as failures."""
+        self.client.error = TransportError(400, 'search_phase_execution')
+        for __i in range(3):
+            with self.assertRaises(TransportError):
+                self.get_search().execute()
+
+        breaker = get_circuit_breaker(self.client)
+        self.assertEqual(breaker.state, breaker.CLOSED)
+
+        # No stale response
+        self.client.error = TransportError(503, 'unavailable')
+        with self.assertRaises(TransportError):
+            self.get_search().execute()
+        self.assertEqual(breaker.failures, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
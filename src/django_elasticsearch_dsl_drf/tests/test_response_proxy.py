@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+Test response proxy.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import copy
+import datetime
+import pickle
+import unittest
+
+import elasticsearch
+
+from elasticsearch_dsl import Date, Document, InnerDoc, Nested, Object, Text
+
+import mock
+
+import pytest
+
+from rest_framework.test import APIRequestFactory
+
+from search_indexes.documents import BookDocument
+from search_indexes.viewsets import (
+    BookDocumentViewSet,
+    BookIgnoreIndexErrorsDocumentViewSet,
+)
+
+from ..utils import (
+    DictionaryProxy,
+    ResponseProxy,
+    get_deserialized_fields,
+)
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_response_proxy'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestResponseProxy',
+    'TestResponseProxyViews',
+)
+
+
+class EventDate(InnerDoc):
+    """Event date."""
+
+    date = Date()
+    note = Text()
+
+
+class EventDocument(Document):
+    """Event document."""
+
+    name = Text()
+    date = Date()
+    place = Object(properties={'name': Text()})
+    dates = Nested(EventDate)
+
+
+class ProxyHitsBookDocumentViewSet(BookDocumentViewSet):
+    """Book document view set, proxying the hits of the list pages."""
+
+    proxy_hits = True
+
+
+@pytest.mark.django_db
+class TestResponseProxy(unittest.TestCase):
+    """Test response proxy."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.mapping = {
+            'title': 'Lorem ipsum',
+            'publication_date': datetime.datetime(2020, 1, 31),
+            'created': datetime.datetime(
+                2020, 1, 31, 12, 30, tzinfo=datetime.timezone.utc
+            ),
+            'publisher': {'name': 'Lorem'},
+            'tags': ['lorem', 'ipsum'],
+        }
+
+    def test_access(self):
+        """Test attribute and item access."""
+        proxy = ResponseProxy(self.mapping, meta={'id': 1})
+        self.assertIs(DictionaryProxy, ResponseProxy)
+        self.assertEqual(proxy.meta, {'id': 1})
+        self.assertEqual(proxy.title, 'Lorem ipsum')
+        self.assertEqual(proxy['title'], 'Lorem ipsum')
+        self.assertIs(proxy.publisher, self.mapping['publisher'])
+        self.assertIs(proxy.tags, self.mapping['tags'])
+        self.assertIsNone(proxy.summary)
+        self.assertIsNone(proxy.get('summary'))
+        self.assertIn('title', proxy)
+        self.assertNotIn('summary', proxy)
+        with self.assertRaises(KeyError):
+            proxy['summary']
+        with self.assertRaises(AttributeError):
+            proxy.__html__
+
+    def test_dates(self):
+        """Test naive datetimes are converted to dates."""
+        proxy = ResponseProxy(self.mapping)
+        self.assertEqual(proxy.publication_date, datetime.date(2020, 1, 31))
+        self.assertEqual(
+            proxy['publication_date'],
+            datetime.date(2020, 1, 31)
+        )
+        self.assertEqual(proxy.created, self.mapping['created'])
+        self.assertEqual(
+            dict(proxy.items())['publication_date'],
+            datetime.date(2020, 1, 31)
+        )
+
+    def test_deserialized_fields(self):
+        """Test raw values are deserialized on access."""
+        fields = get_deserialized_fields(EventDocument)
+        self.assertEqual(sorted(fields), ['date', 'dates'])
+        self.assertIs(get_deserialized_fields(EventDocument), fields)
+
+        mapping = {
+            'name': 'Lorem',
+            'date': '2020-01-31',
+            'place': {'name': 'Ipsum'},
+            'dates': [{'date': '2020-02-01T12:30:00', 'note': 'Dolor'}],
+        }
+        proxy = ResponseProxy(mapping, fields=fields)
+        self.assertEqual(proxy.date, datetime.date(2020, 1, 31))
+        self.assertEqual(proxy['date'], datetime.date(2020, 1, 31))
+        self.assertEqual(
+            proxy.dates,
+            [{'date': datetime.datetime(2020, 2, 1, 12, 30), 'note': 'Dolor'}]
+        )
+        self.assertIs(proxy.place, mapping['place'])
+        # Nothing is copied
+        self.assertIs(proxy.to_dict(), mapping)
+        self.assertEqual(mapping['date'], '2020-01-31')
+
+    def test_read_only(self):
+        """Test proxy is read-only and converted back without copying."""
+        proxy = ResponseProxy(self.mapping)
+        self.assertIs(proxy.to_dict(), self.mapping)
+        with self.assertRaises(AttributeError):
+            proxy.title = 'Dolor sit'
+        with self.assertRaises(TypeError):
+            iter(proxy)
+
+    def test_copy(self):
+        """Test copying and pickling."""
+        proxy = ResponseProxy(self.mapping, meta={'id': 1})
+        for __proxy in (copy.copy(proxy),
+                        copy.deepcopy(proxy),
+                        pickle.loads(pickle.dumps(proxy))):
+            self.assertEqual(__proxy.to_dict(), self.mapping)
+            self.assertEqual(__proxy.meta, {'id': 1})
+
+
+@pytest.mark.django_db
+class TestResponseProxyViews(unittest.TestCase):
+    """Test views serialize the proxied raw hits."""
+
+    source = {
+        'title': 'Lorem ipsum',
+        'publication_date': '2020-01-31',
+        'tags': ['lorem', 'ipsum'],
+    }
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.requests = []
+
+    def perform_request(self, method, url, headers=None, params=None,
+                        body=None):
+        """Fake transport request."""
+        self.requests.append((method, url))
+        if method == 'GET' and '/_doc/' in url:
+            if url.endswith('/404'):
+                return {'_index': 'book', '_id': '404', 'found': False}
+            return {
+                '_index': 'book',
+                '_id': '1',
+                '_version': 1,
+                'found': True,
+                '_source': dict(self.source, id=1),
+            }
+        return {
+            'hits': {
+                'total': {'value': 2, 'relation': 'eq'},
+                'hits': [
+                    {
+                        '_index': 'book',
+                        '_id': str(__id),
+                        '_score': 1.0,
+                        '_source': dict(self.source, id=__id),
+                    }
+                    for __id in (1, 2)
+                ],
+            },
+        }
+
+    def get(self, view_class, actions, url, **kwargs):
+        """GET the view."""
+        with mock.patch.object(elasticsearch.Transport,
+                               'perform_request',
+                               self.perform_request), \
+                mock.patch.object(BookDocument,
+                                  'from_es',
+                                  side_effect=AssertionError) as from_es:
+            response = view_class.as_view(actions)(
+                self.factory.get(url),
+                **kwargs
+            )
+        self.assertFalse(from_es.called)
+        return response
+
+    def test_detail(self):
+        """Test `_source` fetched by id is proxied."""
+        response = self.get(
+            BookDocumentViewSet,
+            {'get': 'retrieve'},
+            '/books/1/',
+            id='1'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['id'], 1)
+        self.assertEqual(response.data['title'], 'Lorem ipsum')
+        self.assertEqual(response.data['tags'], ['lorem', 'ipsum'])
+        self.assertEqual(
+            response.data['publication_date'],
+            datetime.date(2020, 1, 31)
+        )
+        self.assertEqual(
+            self.requests,
+            [('GET', '/{}/_doc/1'.format(BookDocument._index._name))]
+        )
+
+        response = self.get(
+            BookIgnoreIndexErrorsDocumentViewSet,
+            {'get': 'retrieve'},
+            '/books/404/',
+            id='404'
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_detail_doc_type(self):
+        """Test documents are fetched by id and type before ES 7."""
+        with mock.patch(
+            'django_elasticsearch_dsl_drf.viewsets.ELASTICSEARCH_GTE_7_0',
+            False
+        ), mock.patch.object(
+            elasticsearch.Elasticsearch,
+            'get',
+            return_value={
+                '_index': 'book',
+                '_type': 'doc',
+                '_id': '1',
+                'found': True,
+                '_source': dict(self.source, id=1),
+            }
+        ) as get:
+            response = BookDocumentViewSet.as_view({'get': 'retrieve'})(
+                self.factory.get('/books/1/'),
+                id='1'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['id'], 1)
+        get.assert_called_once_with(
+            index=BookDocument._index._name,
+            id='1',
+            doc_type=BookDocument._doc_type.mapping.properties.name
+        )
+
+    def test_list(self):
+        """Test hits of the list pages are proxied."""
+        response = self.get(
+            ProxyHitsBookDocumentViewSet,
+            {'get': 'list'},
+            '/books/'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(
+            [__result['id'] for __result in response.data['results']],
+            [1, 2]
+        )
+        self.assertEqual(
+            response.data['results'][0]['publication_date'],
+            datetime.date(2020, 1, 31)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -110,6 +110,7 @@ class TestSearch(BaseRestFrameworkTestCase):
 
         cls.sleep()
         call_command('search_index', '--rebuild', '-f')
+        call_command('elasticsearch_register_search_templates')
 
         # Testing coreapi and coreschema
         cls.backend = SearchFilterBackend()
@@ -318,6 +319,34 @@ class TestSearch(BaseRestFrameworkTestCase):
         url = reverse('bookdocument_compound_search_backend-list', kwargs={})
         return self.test_search_by_field_multi_terms(url=url)
 
+    def test_rescore_compound_search_by_field(self):
+        url = reverse(
+            'bookdocument_compound_search_backend_rescore-list',
+            kwargs={}
+        )
+        self.test_search_by_field(url=url)
+
+    def test_rescore_compound_search_by_field_multi_terms(self):
+        url = reverse(
+            'bookdocument_compound_search_backend_rescore-list',
+            kwargs={}
+        )
+        return self.test_search_by_field_multi_terms(url=url)
+
+    def test_search_template_by_field(self):
+        url = reverse(
+            'bookdocument_search_template_backend-list',
+            kwargs={}
+        )
+        self.test_search_by_field(url=url)
+
+    def test_search_template_by_field_multi_terms(self):
+        url = reverse(
+            'bookdocument_search_template_backend-list',
+            kwargs={}
+        )
+        return self.test_search_by_field_multi_terms(url=url)
+
     def test_search_by_nested_field(self, url=None):
         """Search by field."""
         self._search_by_nested_field(
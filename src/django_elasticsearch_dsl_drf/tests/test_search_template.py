@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+Test search template backend.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import json
+import re
+import unittest
+
+import elasticsearch
+
+import mock
+
+import pytest
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from search_indexes.viewsets import BookSearchTemplateBackendDocumentViewSet
+
+from .. import coalescing
+from ..coalescing import CoalescingSearch, CoalescingSearchMixin
+from ..filter_backends import SearchTemplateBackend
+from ..filter_backends.search.search_template import (
+    TemplatedSearch,
+    get_templated_search_class,
+)
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_search_template'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestSearchTemplate',
+)
+
+
+def render_template(source, params):
+    """Render the (subset of) mustache used by the search templates."""
+    source = re.sub(
+        r'\{\{#(has_\w+)\}\}(.*?)\{\{/\1\}\}',
+        lambda match: match.group(2) if params.get(match.group(1)) else '',
+        source,
+        flags=re.S
+    )
+    source = re.sub(
+        r'\{\{#toJson\}\}(\w+)\{\{/toJson\}\}',
+        lambda match: json.dumps(params[match.group(1)]),
+        source
+    )
+    source = re.sub(
+        r'\{\{(\w+)\}\}',
+        lambda match: json.dumps(params[match.group(1)])[1:-1],
+        source
+    )
+    return json.loads(source)
+
+
+@pytest.mark.django_db
+class TestSearchTemplate(unittest.TestCase):
+    """Test search template backend."""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view_class = BookSearchTemplateBackendDocumentViewSet
+
+    def _filter(self, search_terms, search_class=None):
+        """Filter the queryset using the search template backend."""
+        request = Request(self.factory.get('/', {'search': search_terms}))
+        view = self.view_class()
+        view.request = request
+        queryset = view.document.search()
+        if search_class is not None:
+            queryset = search_class(
+                using=queryset._using,
+                index=queryset._index
+            )
+        queryset = queryset.filter('term', **{'state.raw': 'published'})
+        return SearchTemplateBackend().filter_queryset(
+            request,
+            queryset,
+            view
+        ), view
+
+    def test_search_template(self):
+        """Test search executed through the template."""
+        search, view = self._filter(['Lorem "ipsum"'])
+        self.assertIsInstance(search, TemplatedSearch)
+
+        search = search.sort('-price')[10:20]
+        params = search.get_search_template_params()
+        self.assertEqual(params['search_term_0'], 'Lorem "ipsum"')
+        self.assertEqual(params['from'], 10)
+        self.assertTrue(params['has_sort'])
+        self.assertNotIn('has_aggs', params)
+
+        source = SearchTemplateBackend().get_search_template_source(
+            None,
+            view,
+            (None,)
+        )
+        body = render_template(source, params)
+        self.assertEqual(body['size'], 10)
+        self.assertEqual(body['sort'], [{'price': {'order': 'desc'}}])
+        self.assertEqual(
+            body['query']['bool']['must'][0],
+            {'bool': {'filter': [{'term': {'state.raw': 'published'}}]}}
+        )
+        self.assertEqual(
+            body['query']['bool']['must'][1]['bool']['should'][0],
+            {'match': {'title': {'query': 'Lorem "ipsum"', 'boost': 4}}}
+        )
+
+        # Search query is included on serialization (used for counting)
+        self.assertEqual(
+            len(search.to_dict(count=True)['query']['bool']['should']),
+            3
+        )
+
+    def test_search_template_by_field(self):
+        """Test search by field executed through the template."""
+        search, view = self._filter(['summary:photography'])
+        self.assertEqual(
+            search._search_template['id'],
+            'search_indexes.viewsets.book.search_template.'
+            'BookSearchTemplateBackendDocumentViewSet.'
+            'SearchTemplateBackend.summary'
+        )
+        self.assertEqual(
+            search.get_search_template_params()['search_term_0'],
+            'photography'
+        )
+
+    def test_no_search_template(self):
+        """Test searches, which are not executed through the template."""
+        search, view = self._filter(['lorem', 'ipsum'])
+        self.assertNotIsInstance(search, TemplatedSearch)
+
+        search, view = self._filter(['lorem'])
+        search = search.extra(profile=True)
+        self.assertIsNone(search.get_search_template_params())
+
+    def perform_request(self, method, url, headers=None, params=None,
+                        body=None):
+        """Fake transport request (templates are not registered)."""
+        self.requests.append(url)
+        if url.endswith('/_search/template'):
+            raise elasticsearch.NotFoundError(
+                404,
+                'resource_not_found_exception',
+                {'error': {'type': 'resource_not_found_exception'}}
+            )
+        return {
+            'hits': {'total': {'value': 0, 'relation': 'eq'}, 'hits': []},
+        }
+
+    def test_search_class(self):
+        """Test search class of the view is kept."""
+        search, view = self._filter(['lorem'], CoalescingSearch)
+        self.assertIsInstance(search, TemplatedSearch)
+        self.assertIsInstance(search, CoalescingSearchMixin)
+        self.assertIs(
+            search.__class__,
+            get_templated_search_class(CoalescingSearch)
+        )
+        self.assertIsInstance(search.sort('-price'), CoalescingSearchMixin)
+        self.assertIs(
+            get_templated_search_class(search.__class__),
+            search.__class__
+        )
+
+        # Search is coalesced and sent through the template
+        self.requests = []
+        with mock.patch.object(
+            coalescing.SINGLE_FLIGHT,
+            'do',
+            wraps=coalescing.SINGLE_FLIGHT.do
+        ) as do, mock.patch.object(elasticsearch.Transport,
+                                   'perform_request',
+                                   self.perform_request):
+            search.execute()
+        self.assertTrue(do.called)
+        self.assertEqual(
+            self.requests,
+            [
+                '/{}/_search/template'.format(view.index),
+                '/{}/_search'.format(view.index),
+            ]
+        )
+
+    def test_search_template_not_registered(self):
+        """Test search query is executed if template is not registered."""
+        search, view = self._filter(['lorem'])
+        self.requests = []
+        with mock.patch.object(elasticsearch.Transport,
+                               'perform_request',
+                               self.perform_request):
+            response = search.execute()
+        self.assertEqual(response.hits.total.value, 0)
+        self.assertEqual(
+            self.requests,
+            [
+                '/{}/_search/template'.format(view.index),
+                '/{}/_search'.format(view.index),
+            ]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
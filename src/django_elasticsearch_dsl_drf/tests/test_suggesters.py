@@ -16,6 +16,7 @@ from rest_framework import status
 
 import factories
 
+from ..suggestion_cache import SUGGESTION_CACHES, clear_suggestion_caches
 from ..versions import (
     ELASTICSEARCH_GTE_5_0,
     ELASTICSEARCH_GTE_6_0,
@@ -271,6 +272,75 @@ class TestSuggesters(BaseRestFrameworkTestCase, AddressesMixin):
         }
         self._test_suggesters(test_data, self.authors_url)
 
+    def test_suggesters_completion_cached(self):
+        """Test suggesters completion served from the cache."""
+        clear_suggestion_caches()
+        test_data = {
+            'country_suggest_cached': {
+                'Ar': ['Armenia', 'Argentina'],
+                'Be': ['Belgium', 'Belarus'],
+                'Bel': ['Belgium', 'Belarus'],
+                'Net': ['Netherlands'],
+                'Fr': [],
+            }
+        }
+        # Second round is served from the cache
+        self._test_suggesters(test_data, self.publishers_url)
+        self._test_suggesters(test_data, self.publishers_url)
+
+        __caches = [
+            __cache
+            for __key, __cache
+            in SUGGESTION_CACHES.items()
+            if __key[1] == 'country.suggest'
+        ]
+        self.assertEqual(len(__caches), 1)
+        # Warmed with single character prefixes, filled with short ones
+        self.assertIsNotNone(__caches[0].get('a'))
+        self.assertIsNotNone(__caches[0].get('ar'))
+        # Answered by filtering the (complete) options of 'b'
+        self.assertIsNone(__caches[0].get('bel'))
+
+    def test_suggesters_completion_concurrent_functional(self):
+        """Test native and functional suggesters executed concurrently."""
+        self.authenticate()
+        response = self.client.get(
+            self.publishers_url + '?name_suggest=Ad',
+            {}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('name_suggest', response.data)
+        self.assertIn('functional_suggest', response.data)
+        _options = [
+            __o['text']
+            for __o
+            in response.data['functional_suggest']['name_suggest'][0][
+                'options'
+            ]
+        ]
+        self.assertIn('Addison–Wesley', _options)
+        self.assertIn('Adis International', _options)
+
+    def test_omnisuggest(self):
+        """Test omni-suggest (books, authors and publishers at once)."""
+        self.authenticate()
+        url = reverse('bookdocument-omnisuggest', kwargs={})
+
+        response = self.client.get(url, {'prefix': 'A'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        _options = response.data['options']
+        self.assertLessEqual(len(_options), 10)
+        self.assertIn('title', [__o['suggester'] for __o in _options])
+        self.assertIn('publisher', [__o['suggester'] for __o in _options])
+        for __option in _options:
+            self.assertTrue(__option['text'].lower().startswith('a'))
+        _scores = [__o['_score'] for __o in _options]
+        self.assertEqual(_scores, sorted(_scores, reverse=True))
+
+        # No prefix given
+        response = self.client.get(url, {})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_suggesters_completion_no_args_provided(self):
         """Test suggesters completion with no args provided."""
         data = {}
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Test suggestion cache.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import unittest
+
+import pytest
+
+from ..suggestion_cache import (
+    SuggestionCache,
+    clear_suggestion_caches,
+    get_suggestion_cache,
+)
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_suggestion_cache'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestSuggestionCache',
+)
+
+
+@pytest.mark.django_db
+class TestSuggestionCache(unittest.TestCase):
+    """Test suggestion cache."""
+
+    def setUp(self):
+        self.fetched = []
+
+    def fetch(self, prefixes):
+        """Fetch suggestions (one option per prefix)."""
+        self.fetched.append(prefixes)
+        return dict(
+            (__prefix, [{'text': __prefix.upper()}])
+            for __prefix
+            in prefixes
+        )
+
+    def test_warm(self):
+        """Test warming."""
+        cache = SuggestionCache(max_prefix_length=2, warm_prefixes='ab')
+        self.assertTrue(cache.is_stale())
+        self.assertIsNone(cache.get('a'))
+
+        cache.warm(self.fetch)
+        self.assertFalse(cache.is_stale())
+        self.assertEqual(cache.get('A'), [{'text': 'A'}])
+        self.assertIsNone(cache.get('c'))
+
+        # Warmed already
+        cache.warm(self.fetch)
+        self.assertEqual(self.fetched, [['a', 'b']])
+
+        cache.set('Cd', [{'text': 'CD'}])
+        self.assertEqual(cache.get('cd'), [{'text': 'CD'}])
+
+        cache.clear()
+        self.assertTrue(cache.is_stale())
+        self.assertIsNone(cache.get('cd'))
+
+    def test_timeout(self):
+        """Test re-warming once timeout is passed."""
+        cache = SuggestionCache(timeout=-1, warm_prefixes='a')
+        cache.warm(self.fetch)
+        self.assertTrue(cache.is_stale())
+        cache.warm(self.fetch)
+        self.assertEqual(self.fetched, [['a'], ['a']])
+
+    def test_is_cacheable(self):
+        """Test `is_cacheable`."""
+        cache = SuggestionCache(max_prefix_length=2)
+        self.assertFalse(cache.is_cacheable(''))
+        self.assertTrue(cache.is_cacheable('a'))
+        self.assertTrue(cache.is_cacheable('ab'))
+        self.assertFalse(cache.is_cacheable('abc'))
+
+    def test_get_extension(self):
+        """Test answering extended prefixes from complete options."""
+        cache = SuggestionCache(max_prefix_length=1)
+        cache.set('a', [{'text': 'Armenia'}, {'text': 'Argentina'}])
+        cache.set('b', [{'text': 'Belgium'}, {'text': 'Belarus'}])
+
+        self.assertEqual(
+            cache.get_extension('Arm', 5),
+            [{'text': 'Armenia'}]
+        )
+        self.assertEqual(cache.get_extension('Aus', 5), [])
+        # Options of 'b' might be incomplete
+        self.assertIsNone(cache.get_extension('Bel', 2))
+        self.assertIsNone(cache.get_extension('Cu', 5))
+
+        # Closest prefix is used
+        cache.remember('bel', [{'text': 'Belgium'}])
+        self.assertEqual(cache.get('Bel'), [{'text': 'Belgium'}])
+        self.assertEqual(
+            cache.get_extension('Belg', 2),
+            [{'text': 'Belgium'}]
+        )
+
+    def test_remember(self):
+        """Test remembering options of longer prefixes."""
+        cache = SuggestionCache(max_recent=2)
+        cache.remember('abc', [])
+        cache.remember('abd', [])
+        cache.remember('abe', [])
+        self.assertIsNone(cache.get('abc'))
+        self.assertEqual(cache.get('abd'), [])
+
+        cache = SuggestionCache(recent_timeout=-1)
+        cache.remember('abc', [])
+        self.assertIsNone(cache.get('abc'))
+
+    def test_get_suggestion_cache(self):
+        """Test `get_suggestion_cache` and `clear_suggestion_caches`."""
+        cache = get_suggestion_cache('test_index', 'name.suggest', size=5)
+        self.assertIs(
+            cache,
+            get_suggestion_cache('test_index', 'name.suggest', size=5)
+        )
+        self.assertIsNot(
+            cache,
+            get_suggestion_cache('test_index', 'name.suggest', size=10)
+        )
+
+        cache.set('a', [])
+        clear_suggestion_caches('another_index')
+        self.assertEqual(cache.get('a'), [])
+        clear_suggestion_caches('test_index')
+        self.assertIsNone(cache.get('a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
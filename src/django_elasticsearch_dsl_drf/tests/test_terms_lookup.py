@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Test terms lookup.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import unittest
+
+from django.core.management import call_command
+
+import mock
+
+import pytest
+
+from .. import terms_lookup
+from ..constants import TERMS_LOOKUP_INDEX
+from ..terms_lookup import (
+    clear_terms_lookups,
+    delete_expired_terms_lookups,
+    get_terms_lookup,
+)
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_terms_lookup'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestTermsLookup',
+)
+
+
+@pytest.mark.django_db
+class TestTermsLookup(unittest.TestCase):
+    """Test terms lookup."""
+
+    def setUp(self):
+        clear_terms_lookups()
+        self.client = mock.Mock()
+        self.client.delete_by_query.return_value = {'deleted': 2}
+        self.time = mock.Mock()
+        self.time.monotonic.return_value = 1000.0
+        self.time.time.return_value = 1600000000.0
+        self.patches = [
+            mock.patch.object(
+                terms_lookup.connections,
+                'get_connection',
+                return_value=self.client
+            ),
+            mock.patch.object(terms_lookup, 'time', self.time),
+        ]
+        for __patch in self.patches:
+            __patch.start()
+
+    def tearDown(self):
+        for __patch in self.patches:
+            __patch.stop()
+        clear_terms_lookups()
+
+    def test_get_terms_lookup(self):
+        """Test values are stored once and expire."""
+        lookup = get_terms_lookup(['2', '1', '2'], ttl=100)
+        self.assertEqual(
+            lookup,
+            {
+                'index': TERMS_LOOKUP_INDEX,
+                'id': lookup['id'],
+                'path': 'values',
+            }
+        )
+        self.client.indices.create.assert_called_once_with(
+            index=TERMS_LOOKUP_INDEX,
+            body={
+                'mappings': {
+                    'dynamic': False,
+                    'properties': {'created': {'type': 'date'}},
+                },
+            },
+            ignore=400
+        )
+        self.client.index.assert_called_once_with(
+            index=TERMS_LOOKUP_INDEX,
+            id=lookup['id'],
+            body={'values': ['1', '2'], 'created': 1600000000000}
+        )
+
+        # Stored once (within half of the ttl)
+        self.time.monotonic.return_value = 1050.0
+        self.assertEqual(get_terms_lookup(['1', '2'], ttl=100), lookup)
+        self.assertEqual(self.client.index.call_count, 1)
+
+        # Stored again (documents in use are not deleted)
+        self.time.monotonic.return_value = 1051.0
+        self.assertEqual(get_terms_lookup(['1', '2'], ttl=100), lookup)
+        self.assertEqual(self.client.index.call_count, 2)
+        self.assertEqual(self.client.indices.create.call_count, 1)
+
+    def test_get_terms_lookup_doc_type(self):
+        """Test documents have a mapping type before ES 7."""
+        with mock.patch.object(terms_lookup, 'ELASTICSEARCH_GTE_7_0', False):
+            lookup = get_terms_lookup(['1', '2'])
+        self.assertEqual(lookup['type'], 'doc')
+        self.assertEqual(
+            self.client.indices.create.call_args[1]['body']['mappings'],
+            {
+                'doc': {
+                    'dynamic': False,
+                    'properties': {'created': {'type': 'date'}},
+                },
+            }
+        )
+        self.assertEqual(self.client.index.call_args[1]['doc_type'], 'doc')
+
+    def test_delete_expired_terms_lookups(self):
+        """Test deleting the expired documents."""
+        self.assertEqual(delete_expired_terms_lookups(ttl=3600), 2)
+        self.client.delete_by_query.assert_called_once_with(
+            index=TERMS_LOOKUP_INDEX,
+            body={'query': {'range': {'created': {'lt': 'now-3600s'}}}},
+            conflicts='proceed',
+            ignore=404
+        )
+
+        call_command(
+            'elasticsearch_delete_expired_terms_lookups',
+            ttl=60,
+            stdout=mock.Mock()
+        )
+        self.assertEqual(
+            self.client.delete_by_query.call_args[1]['body'],
+            {'query': {'range': {'created': {'lt': 'now-60s'}}}}
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
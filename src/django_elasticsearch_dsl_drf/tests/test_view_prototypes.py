@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Test view prototypes.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import unittest
+
+import pytest
+
+from search_indexes.viewsets import (
+    BookDocumentViewSet,
+    BookFastJSONDocumentViewSet,
+)
+
+from ..viewsets import VIEW_PROTOTYPES, clear_view_prototypes
+
+__title__ = 'django_elasticsearch_dsl_drf.tests.test_view_prototypes'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2017-2020 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TestViewPrototypes',
+)
+
+
+@pytest.mark.django_db
+class TestViewPrototypes(unittest.TestCase):
+    """Test view prototypes."""
+
+    def setUp(self):
+        clear_view_prototypes()
+
+    def test_prototype(self):
+        """Test prototype is resolved once per view class."""
+        view = BookDocumentViewSet()
+        other_view = BookDocumentViewSet()
+        self.assertIs(view.client, other_view.client)
+        self.assertIs(view.search, other_view.search)
+        self.assertEqual(view.index, BookDocumentViewSet.document._index._name)
+        self.assertEqual(
+            view.mapping,
+            BookDocumentViewSet.document._doc_type.mapping.properties.name
+        )
+
+        # Subclasses have their own prototypes
+        fast_view = BookFastJSONDocumentViewSet()
+        self.assertIsNot(fast_view.client, view.client)
+        self.assertIsNot(fast_view.search, view.search)
+
+        # Querysets are clones of the base search
+        queryset = view.get_queryset()
+        self.assertIsNot(queryset, view.search)
+        self.assertIs(
+            queryset.model,
+            BookDocumentViewSet.document.Django.model
+        )
+        self.assertEqual(view.search.to_dict(), {})
+
+    def test_clear_view_prototypes(self):
+        """Test clearing prototypes."""
+        search = BookDocumentViewSet().search
+        BookFastJSONDocumentViewSet()
+
+        clear_view_prototypes(BookDocumentViewSet)
+        self.assertNotIn(BookDocumentViewSet, VIEW_PROTOTYPES)
+        self.assertIn(BookFastJSONDocumentViewSet, VIEW_PROTOTYPES)
+        self.assertIsNot(BookDocumentViewSet().search, search)
+
+        clear_view_prototypes()
+        self.assertEqual(VIEW_PROTOTYPES, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
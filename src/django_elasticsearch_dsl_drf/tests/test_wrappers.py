@@ -86,6 +86,20 @@ class TestWrappers(unittest.TestCase):
         mapping = obj_to_dict(wrapper)
         self.assertEqual(self.mapping, mapping)
 
+    def test_no_copy(self):
+        """Test wrapper is a read-only proxy of the original mapping."""
+        wrapper = dict_to_obj(self.mapping)
+        self.assertIs(obj_to_dict(wrapper), self.mapping)
+        self.assertIs(
+            wrapper.country.province.as_dict,
+            self.mapping['country']['province']
+        )
+        self.assertEqual(wrapper['country']['name'], 'Netherlands')
+        with self.assertRaises(AttributeError):
+            wrapper.continent
+        with self.assertRaises(AttributeError):
+            wrapper.continent = 'Europe'
+
     def test_wrapper_as_json(self):
         """Test :Wrapper:`as_json` property."""
         wrapper = dict_to_obj(self.mapping)
@@ -100,3 +114,5 @@ class TestWrappers(unittest.TestCase):
                 '"name": "Amsterdam"}}}}'
             )
         )
+        # Same format as `json.dumps`
+        self.assertEqual(wrapper.as_json, json.dumps(self.mapping))
@@ -3,6 +3,10 @@ Utils.
 """
 
 import datetime
+from functools import lru_cache
+import threading
+
+from elasticsearch_dsl import Date, Object
 from elasticsearch_dsl.search import AggsProxy
 
 
@@ -13,8 +17,14 @@ __license__ = 'GPL 2.0/LGPL 2.1'
 __all__ = (
     'DictionaryProxy',
     'EmptySearch',
+    'Registry',
+    'ResponseProxy',
+    'get_deserialized_fields',
 )
 
+# No fields deserialized
+_NO_FIELDS = {}
+
 
 class EmptySearch(object):
     """Empty Search."""
@@ -51,24 +61,222 @@ class EmptySearch(object):
         return {}
 
 
-class DictionaryProxy(object):
-    """Dictionary proxy."""
+class ResponseProxy(object):
+    """Read-only proxy of a dictionary (for instance, `_source` of a hit).
+
+    Values are accessible as attributes and as items. Nothing is copied:
+    values of the `fields` given (see `get_deserialized_fields`) are
+    deserialized on access, the same way the document deserializes them,
+    and naive datetimes are converted to dates. Attributes missing in the
+    dictionary are None. Proxy is converted back (`to_dict`) to the
+    original dictionary.
+
+    Example:
+
+        >>> proxy = ResponseProxy({'title': 'Lorem'})
+        >>> proxy.title
+        'Lorem'
+        >>> proxy['title']
+        'Lorem'
+        >>> proxy.summary is None
+        True
+    """
+
+    __slots__ = ('_d_', 'meta', '_fields_')
+
+    # Proxies are not iterable, since `django_elasticsearch_dsl` object
+    # fields index iterables as lists of objects.
+    __iter__ = None
 
-    def __init__(self, mapping, meta=None):
-        self.__mapping = mapping
+    def __init__(self, mapping, meta=None, fields=None):
+        self._d_ = mapping
         self.meta = meta
+        self._fields_ = fields or _NO_FIELDS
+
+    def _deserialize(self, item, value):
+        """Deserialize value of the field.
+
+        :param item: Field name.
+        :param value: Raw value.
+        :return: Deserialized value (objects are converted back to
+            dictionaries).
+        """
+        __field = self._fields_[item]
+        value = __field.deserialize(value)
+        if isinstance(__field, Object):
+            if isinstance(value, list):
+                return [
+                    __v if __v is None else __v.to_dict() for __v in value
+                ]
+            if value is not None:
+                return value.to_dict()
+        return value
+
+    def _get_value(self, value):
+        """Normalise dates.
+
+        :param value:
+        :return:
+        """
+        if isinstance(value, datetime.datetime) and not value.tzinfo:
+            return value.date()
+        return value
 
     def __getattr__(self, item):
-        if item == "meta":
-            return self.meta
-        val = self.__mapping.get(item, None)
-        if isinstance(val, datetime.datetime) and not val.tzinfo:
-            val = val.date()
-        return val
+        try:
+            value = self._d_[item]
+        except KeyError:
+            # Do not pretend to implement protocols (`__html__`, etc.)
+            if item.startswith('__'):
+                raise AttributeError(item)
+            return None
+        # Same as `_get_value`, inlined (attribute access is the hot path)
+        if item in self._fields_:
+            value = self._deserialize(item, value)
+        if isinstance(value, datetime.datetime) and not value.tzinfo:
+            return value.date()
+        return value
+
+    def __getitem__(self, item):
+        value = self._d_[item]
+        if item in self._fields_:
+            value = self._deserialize(item, value)
+        return self._get_value(value)
+
+    def __contains__(self, item):
+        return item in self._d_
+
+    def __getstate__(self):
+        return self._d_, self.meta, self._fields_
+
+    def __setstate__(self, state):
+        self._d_, self.meta, self._fields_ = state
+
+    def __repr__(self):
+        return '<{}: {!r}>'.format(self.__class__.__name__, self._d_)
+
+    def get(self, item, default=None):
+        """Get value of the key given.
+
+        :param item:
+        :param default:
+        :return:
+        """
+        if item in self._d_:
+            return self[item]
+        return default
+
+    def keys(self):
+        """Keys of the dictionary.
+
+        :return:
+        """
+        return self._d_.keys()
+
+    def items(self):
+        """Items of the dictionary (with dates normalised).
+
+        :return:
+        """
+        return ((__key, self[__key]) for __key in self._d_)
 
     def to_dict(self):
         """To dict.
 
-        :return:
+        :return: Original dictionary.
+        :rtype: dict
+        """
+        return self._d_
+
+
+# For backwards compatibility
+DictionaryProxy = ResponseProxy
+
+
+def _has_dates(field):
+    """Check if the values of the field are (or contain) dates.
+
+    :param field: Field.
+    :type field: elasticsearch_dsl.field.Field
+    :rtype: bool
+    """
+    if isinstance(field, Date):
+        return True
+    if isinstance(field, Object):
+        __mapping = field._doc_class._doc_type.mapping
+        return any(_has_dates(__mapping[__name]) for __name in __mapping)
+    return False
+
+
+@lru_cache(maxsize=None)
+def get_deserialized_fields(document):
+    """Get fields of the document deserialized by the `ResponseProxy`.
+
+    Values of the raw hits are JSON, thus dates (also in the objects and
+    nested objects) are strings, unlike in the documents.
+
+    :param document: Document class.
+    :type document: django_elasticsearch_dsl.Document
+    :return: Fields by name.
+    :rtype: dict
+    """
+    __mapping = document._doc_type.mapping
+    return {
+        __name: __mapping[__name]
+        for __name in __mapping
+        if _has_dates(__mapping[__name])
+    }
+
+
+class Registry(dict):
+    """Thread-safe registry (module level cache) of objects.
+
+    Reads are lock-free, writes are done with the `lock` held.
+
+    Example:
+
+        >>> from django_elasticsearch_dsl_drf.utils import Registry
+        >>>
+        >>> CLIENTS = Registry()
+        >>>
+        >>> client = CLIENTS.get_or_create('default', create_client)
+        >>> CLIENTS.remove(lambda key: key == 'default')
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(Registry, self).__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+
+    def get_or_create(self, key, factory):
+        """Get the object registered, creating it (once) if not registered.
+
+        :param key: Key of the object.
+        :param factory: Callable (called without arguments, with the lock
+            held) creating the object.
+        :type factory: callable
+        :return: Object registered.
         """
-        return self.__mapping
+        try:
+            return self[key]
+        except KeyError:
+            pass
+
+        with self.lock:
+            if key not in self:
+                self[key] = factory()
+            return self[key]
+
+    def remove(self, predicate=None):
+        """Remove objects, keys of which match the predicate given.
+
+        :param predicate: Callable taking the key. If not given, all objects
+            are removed.
+        :type predicate: callable
+        """
+        with self.lock:
+            if predicate is None:
+                self.clear()
+                return
+
+            for __key in [__key for __key in self if predicate(__key)]:
+                del self[__key]
@@ -5,22 +5,33 @@ Base ViewSets.
 """
 from __future__ import absolute_import, unicode_literals
 
+from concurrent.futures import ThreadPoolExecutor
 import copy
+import threading
 
+from django.db import connections as db_connections
 from django.http import Http404
 from django.core.exceptions import ImproperlyConfigured
+from django.utils.cache import get_conditional_response
 
-from elasticsearch_dsl import Search
-from elasticsearch_dsl.connections import connections
+from elasticsearch_dsl import MultiSearch, Search
 from elasticsearch_dsl.query import MoreLikeThis
+from elasticsearch_dsl.utils import HitMeta
 
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
+from six import string_types
+
+from .conditional import get_etag, get_index_generation
+from .filter_backends.aggregations import GeoGridAggregationBackend
+from .json_codecs import clear_clients, get_client
 from .pagination import PageNumberPagination
-from .utils import DictionaryProxy
+from .resilience import is_stale, reset_stale
+from .utils import Registry, ResponseProxy, get_deserialized_fields
 from .versions import ELASTICSEARCH_GTE_7_0
 
 __title__ = 'django_elasticsearch_dsl_drf.viewsets'
@@ -29,27 +40,145 @@ __copyright__ = '2017-2020 Artur Barseghyan'
 __license__ = 'GPL 2.0/LGPL 2.1'
 __all__ = (
     'BaseDocumentViewSet',
+    'clear_view_prototypes',
+    'ConditionalGetMixin',
     'DocumentViewSet',
     'FunctionalSuggestMixin',
+    'GeoGridMixin',
+    'get_suggest_executor',
     'MoreLikeThisMixin',
+    'OmniSuggestMixin',
     'SuggestMixin',
 )
 
 
+# Prototypes (client, index name, mapping name and base search) of the
+# views, key is the view class.
+VIEW_PROTOTYPES = Registry()
+
+# Executor of the concurrent functional suggestions (created on first use)
+# and its lock
+_SUGGEST_EXECUTOR = None
+_SUGGEST_EXECUTOR_LOCK = threading.Lock()
+
+# Max number of the concurrent functional suggestions in-flight
+SUGGEST_MAX_WORKERS = 32
+
+
+def clear_view_prototypes(view_class=None):
+    """Clear prototypes of the views.
+
+    Shall be called if the connections or the indexes (for instance, the
+    index aliases) of the documents change at run time.
+
+    :param view_class: View class. If not given, all prototypes (and the
+        clients with custom transport serializers) are cleared.
+    :type view_class: type
+    """
+    VIEW_PROTOTYPES.remove(
+        None if view_class is None else lambda key: key is view_class
+    )
+
+    if view_class is None:
+        clear_clients()
+
+
+def get_suggest_executor():
+    """Get executor of the concurrent functional suggestions.
+
+    :return:
+    :rtype: concurrent.futures.ThreadPoolExecutor
+    """
+    global _SUGGEST_EXECUTOR
+    if _SUGGEST_EXECUTOR is None:
+        with _SUGGEST_EXECUTOR_LOCK:
+            if _SUGGEST_EXECUTOR is None:
+                _SUGGEST_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=SUGGEST_MAX_WORKERS,
+                    thread_name_prefix='functional-suggest'
+                )
+    return _SUGGEST_EXECUTOR
+
+
 class SuggestMixin(object):
-    """Suggest mixin."""
+    """Suggest mixin.
+
+    If ``concurrent_functional_suggest`` is set to True on a view having
+    the ``FunctionalSuggestMixin`` as well, functional suggesters given in
+    the same request (for instance, ``?name_suggest=Ad`` would hit both the
+    ``suggester_fields`` and the ``functional_suggester_fields`` entries
+    named ``name_suggest``) are executed concurrently with the native ones.
+    Their results are returned under the ``functional_suggest_key``.
+    """
+
+    concurrent_functional_suggest = False
+
+    functional_suggest_key = 'functional_suggest'
+
+    def get_functional_suggestions(self):
+        """Get functional suggestions for the current request.
+
+        Executed in a separate thread, on a copy of the view.
+
+        :return: Functional suggestions or None if no functional
+            suggesters are given in the request.
+        :rtype: dict
+        """
+        view = copy.copy(self)
+        view.action = 'functional_suggest'
+        try:
+            suggestions = view.filter_queryset(view.get_queryset())
+        except ValidationError:
+            return None
+        finally:
+            # Database connections are per thread
+            db_connections.close_all()
+
+        # Unless the ``FunctionalSuggesterFilterBackend`` is used,
+        # queryset is returned as is.
+        if isinstance(suggestions, dict):
+            return suggestions
+        return None
 
     @action(detail=False)
     def suggest(self, request):
         """Suggest functionality."""
-        queryset = self.filter_queryset(self.get_queryset())
-        is_suggest = getattr(queryset, '_suggest', False)
-        if not is_suggest:
+        functional_suggestions = None
+        if self.concurrent_functional_suggest \
+                and isinstance(self, FunctionalSuggestMixin):
+            functional_suggestions = get_suggest_executor().submit(
+                self.get_functional_suggestions
+            )
+
+        try:
+            queryset = self.filter_queryset(self.get_queryset())
+            is_suggest = getattr(queryset, '_suggest', False)
+            # Suggestions served from the in-process cache (see the
+            # ``cache`` option of the ``suggester_fields``).
+            cached_suggestions = getattr(self, 'cached_suggestions', None)
+
+            page = {}
+            if is_suggest:
+                page = self.paginate_queryset(queryset) or {}
+            if cached_suggestions:
+                page.update(cached_suggestions)
+        except Exception:
+            # Functional suggestions are not needed (nor their errors)
+            if functional_suggestions is not None:
+                functional_suggestions.cancel()
+            raise
+
+        if functional_suggestions is not None:
+            functional_suggestions = functional_suggestions.result()
+
+        if functional_suggestions:
+            page[self.functional_suggest_key] = functional_suggestions
+
+        if not page:
             return Response(
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        page = self.paginate_queryset(queryset)
         return Response(page)
 
 
@@ -83,6 +212,292 @@ class FunctionalSuggestMixin(object):
         return Response(page)
 
 
+class OmniSuggestMixin(object):
+    """Omni-suggest mixin.
+
+    Fans a single prefix out to a number of completion suggester fields,
+    across a number of documents (indices), in a single `_msearch` request
+    (one search per index, each holding a suggester per field). Options
+    are merged and ranked by score (multiplied by the `boost` of the
+    field). All documents shall use the connection of the view.
+
+    Example:
+
+        >>> class BookDocumentViewSet(BaseDocumentViewSet, OmniSuggestMixin):
+        >>>
+        >>>     document = BookDocument
+        >>>     # ...
+        >>>     omnisuggest_fields = {
+        >>>         'title': 'title.suggest',  # Field of the `BookDocument`
+        >>>         'author': {
+        >>>             'document': AuthorDocument,
+        >>>             'field': 'name.suggest',
+        >>>             'size': 3,
+        >>>         },
+        >>>         'publisher': {
+        >>>             'document': PublisherDocument,
+        >>>             'field': 'name.suggest',
+        >>>             'boost': 0.5,
+        >>>         },
+        >>>     }
+
+    Example query:
+
+        /search/books/omnisuggest/?prefix=Ad
+
+    Response:
+
+        {
+            "text": "Ad",
+            "options": [
+                {
+                    "suggester": "publisher",
+                    "text": "Addison-Wesley",
+                    "_index": "publisher",
+                    "_id": "1",
+                    "_score": 1.0,
+                    "_source": {...}
+                }
+            ]
+        }
+    """
+
+    omnisuggest_param = 'prefix'
+
+    # Default number of options per field
+    omnisuggest_field_size = 5
+
+    # Max number of (merged) options returned
+    omnisuggest_size = 10
+
+    def prepare_omnisuggest_fields(self):
+        """Prepare omni-suggest fields.
+
+        :return: Options per field.
+        :rtype: dict
+        """
+        fields = {}
+        for name, options in self.omnisuggest_fields.items():
+            if options is None or isinstance(options, string_types):
+                options = {'field': options or name}
+            else:
+                options = dict(options)
+                options.setdefault('field', name)
+
+            options.setdefault('document', self.document)
+            options.setdefault('size', self.omnisuggest_field_size)
+            options.setdefault('boost', 1.0)
+            fields[name] = options
+
+        return fields
+
+    def get_omnisuggest_searches(self, fields, prefix):
+        """Get searches (one per document) to be executed.
+
+        :param fields: Omni-suggest fields options.
+        :param prefix: Prefix to suggest on.
+        :type fields: dict
+        :type prefix: str
+        :return: List of searches.
+        :rtype: list
+        """
+        searches = {}
+        for name, options in fields.items():
+            document = options['document']
+            if document not in searches:
+                searches[document] = Search(
+                    index=document._index._name
+                ).extra(size=0)
+
+            completion_kwargs = {
+                'field': options['field'],
+                'size': options['size'],
+            }
+            if 'skip_duplicates' in options:
+                completion_kwargs['skip_duplicates'] = \
+                    options['skip_duplicates']
+
+            searches[document] = searches[document].suggest(
+                name,
+                prefix,
+                completion=completion_kwargs
+            )
+
+        return list(searches.values())
+
+    def merge_omnisuggest_options(self, fields, responses):
+        """Merge suggester options of a number of responses.
+
+        :param fields: Omni-suggest fields options.
+        :param responses: Search responses.
+        :type fields: dict
+        :type responses: list
+        :return: Options, ranked by score.
+        :rtype: list
+        """
+        options = []
+        for response in responses:
+            suggest = response.to_dict().get('suggest', {})
+            for name, suggestions in suggest.items():
+                for suggestion in suggestions:
+                    for option in suggestion['options']:
+                        option['suggester'] = name
+                        option['_score'] = \
+                            option.get('_score', 0) * fields[name]['boost']
+                        options.append(option)
+
+        # Stable sort, thus order of options of equal score is preserved
+        options.sort(key=lambda __option: -__option['_score'])
+        return options[:self.omnisuggest_size]
+
+    @action(detail=False)
+    def omnisuggest(self, request):
+        """Omni-suggest functionality.
+
+        :param request:
+        :return:
+        """
+        prefix = request.query_params.get(self.omnisuggest_param, '').strip()
+        fields = self.prepare_omnisuggest_fields()
+        if not prefix or not fields:
+            return Response(
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        multi_search = MultiSearch(using=self.client)
+        for search in self.get_omnisuggest_searches(fields, prefix):
+            multi_search = multi_search.add(search)
+
+        return Response({
+            'text': prefix,
+            'options': self.merge_omnisuggest_options(
+                fields,
+                multi_search.execute()
+            ),
+        })
+
+
+class ConditionalResponse(Exception):
+    """Conditional response (for instance, 304 Not Modified) to be
+    returned instead of executing the handler."""
+
+    def __init__(self, response):
+        super(ConditionalResponse, self).__init__(response)
+        self.response = response
+
+
+class ConditionalGetMixin(object):
+    """Conditional GET mixin.
+
+    ETags of the responses are derived from the request and the generation
+    of the index (see `django_elasticsearch_dsl_drf.conditional`). Requests
+    matching the `If-None-Match` headers are answered with 304 Not
+    Modified, without touching Elasticsearch. Last-Modified is not set:
+    generations are more precise than HTTP dates (changes made within the
+    same second would not be seen).
+
+    Generation is bumped when the model of the document (or the
+    `related_models` of the document) are saved or deleted, if the models
+    of the documents are watched (`ELASTICSEARCH_DSL_DRF_WATCH_DOCUMENTS`
+    setting set to True, or `watch_documents` called). Other models
+    changing the index (for instance, re-indexing the document by custom
+    signal handlers) shall be watched when the app is ready (see
+    `django_elasticsearch_dsl_drf.conditional.watch_document`).
+
+    Example:
+
+        >>> class BookDocumentViewSet(ConditionalGetMixin, DocumentViewSet):
+        >>>
+        >>>     document = BookDocument
+    """
+
+    def get_index_generation(self):
+        """Get generation of the index of the view.
+
+        :return:
+        :rtype: float
+        """
+        return get_index_generation(self.index)
+
+    def get_etag(self, request, generation):
+        """Get ETag of the response.
+
+        :param request: Django REST framework request.
+        :param generation: Index generation.
+        :type request: rest_framework.request.Request
+        :type generation: float
+        :return:
+        :rtype: str
+        """
+        return get_etag(request, generation, self.__class__.__name__)
+
+    def initial(self, request, *args, **kwargs):
+        super(ConditionalGetMixin, self).initial(request, *args, **kwargs)
+        self.etag = None
+        if request.method not in ('GET', 'HEAD'):
+            return
+
+        __generation = self.get_index_generation()
+        self.etag = self.get_etag(request, __generation)
+        __response = get_conditional_response(
+            request._request,
+            etag=self.etag
+        )
+        if __response is not None:
+            raise ConditionalResponse(__response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, ConditionalResponse):
+            return exc.response
+        return super(ConditionalGetMixin, self).handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super(ConditionalGetMixin, self).finalize_response(
+            request,
+            response,
+            *args,
+            **kwargs
+        )
+        # Stale responses (see `django_elasticsearch_dsl_drf.resilience`)
+        # must not be validated by the current generation.
+        if getattr(self, 'etag', None) is not None \
+                and response.status_code in (200, 304) \
+                and not is_stale():
+            response['ETag'] = self.etag
+        return response
+
+
+class GeoGridMixin(object):
+    """Geo grid mixin.
+
+    Returns geo grid clusters (see `GeoGridAggregationBackend`) for the
+    viewport given, without fetching the documents themselves.
+    """
+
+    @action(detail=False)
+    def geo_grid(self, request):
+        """Geo grid functionality.
+
+        :param request:
+        :return:
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        if not any(
+            __name.startswith(GeoGridAggregationBackend.aggregation_prefix)
+            for __name in queryset.aggs
+        ):
+            return Response(
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        response = queryset.extra(size=0).execute()
+        return Response(
+            GeoGridAggregationBackend.get_geo_grid_buckets(
+                response.aggregations.to_dict()
+            )
+        )
+
+
 class MoreLikeThisMixin(object):
     """More-like-this mixin."""
 
@@ -149,7 +564,19 @@ class BaseDocumentViewSet(ReadOnlyModelViewSet):
     document_uid_field = 'id'
     document = None  # Re-define
     pagination_class = PageNumberPagination
-    dictionary_proxy = DictionaryProxy
+    dictionary_proxy = ResponseProxy
+    # If set to True, hits of the list pages are given to the serializer as
+    # `dictionary_proxy` instances of the raw hits (same as the detail
+    # views), instead of the documents (see
+    # `django_elasticsearch_dsl_drf.pagination.get_page_hits`).
+    proxy_hits = False
+    # Elasticsearch transport serializer class (for instance,
+    # `django_elasticsearch_dsl_drf.json_codecs.FastJSONSerializer`). If
+    # not given, serializer of the connection is used.
+    transport_serializer = None
+    # Search class (for instance,
+    # `django_elasticsearch_dsl_drf.coalescing.CoalescingSearch`).
+    search_class = Search
     # permission_classes = (AllowAny,)
     ignore = []
 
@@ -157,22 +584,66 @@ class BaseDocumentViewSet(ReadOnlyModelViewSet):
         self.run_checks()
 
         if self.document:
-            self.client = connections.get_connection(
-                self.document._get_using()
+            (
+                self.client,
+                self.index,
+                self.mapping,
+                self.search
+            ) = self.get_prototype()
+
+        super(BaseDocumentViewSet, self).__init__(*args, **kwargs)
+
+    @classmethod
+    def get_prototype(cls):
+        """Get prototype of the view.
+
+        Client, index name, mapping name and the base search are resolved
+        once per view class (DRF instantiates the view on each request).
+        The base search is never modified (`get_queryset` clones it). See
+        `clear_view_prototypes` for invalidation.
+
+        :return: Tuple of client, index name, mapping name and search.
+        :rtype: tuple
+        """
+        def create_prototype():
+            client = get_client(
+                cls.document._get_using(),
+                cls.transport_serializer
             )
-            self.index = self.document._index._name
-            self.mapping = self.document._doc_type.mapping.properties.name
-            self.search = Search(
-                using=self.client,
-                index=self.index,
-                doc_type=self.document._doc_type.name
+            index = cls.document._index._name
+            return (
+                client,
+                index,
+                cls.document._doc_type.mapping.properties.name,
+                cls.search_class(
+                    using=client,
+                    index=index,
+                    doc_type=cls.document._doc_type.name
+                ),
             )
 
-        super(BaseDocumentViewSet, self).__init__(*args, **kwargs)
+        return VIEW_PROTOTYPES.get_or_create(cls, create_prototype)
 
     def run_checks(self):
         assert self.document is not None
 
+    def initial(self, request, *args, **kwargs):
+        reset_stale()
+        super(BaseDocumentViewSet, self).initial(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Mark responses built from stale search responses (see
+        `django_elasticsearch_dsl_drf.resilience.ResilientSearch`)."""
+        response = super(BaseDocumentViewSet, self).finalize_response(
+            request,
+            response,
+            *args,
+            **kwargs
+        )
+        if is_stale():
+            response['Warning'] = '110 - "Response is Stale"'
+        return response
+
     def get_queryset(self):
         """Get queryset."""
         queryset = self.search.query()
@@ -197,6 +668,25 @@ class BaseDocumentViewSet(ReadOnlyModelViewSet):
         queryset.model = self.document.Django.model
         return queryset
 
+    def get_hit_proxy(self, hit, source=None):
+        """Proxy the raw hit (`dictionary_proxy`).
+
+        Dates are deserialized on access, according to the document.
+
+        :param hit: Raw hit (or response of the get API).
+        :param source: Source of the hit. If not given, `_source` of the
+            hit.
+        :type hit: dict
+        :type source: dict
+        :return:
+        :rtype: django_elasticsearch_dsl_drf.utils.ResponseProxy
+        """
+        return self.dictionary_proxy(
+            hit.get('_source', {}) if source is None else source,
+            HitMeta(hit),
+            fields=get_deserialized_fields(self.document)
+        )
+
     def get_object(self):
         """Get object."""
         queryset = self.get_queryset()
@@ -212,52 +702,48 @@ class BaseDocumentViewSet(ReadOnlyModelViewSet):
             )
 
         if lookup_url_kwarg == 'id':
-            get_kwargs = {'id': self.kwargs[lookup_url_kwarg]}
+            get_kwargs = {
+                'index': self.index,
+                'id': self.kwargs[lookup_url_kwarg],
+            }
+            if not ELASTICSEARCH_GTE_7_0:
+                get_kwargs['doc_type'] = self.mapping
             if self.ignore:
                 get_kwargs.update({'ignore': self.ignore})
-            obj = self.document.get(**get_kwargs)
+            # Search classes may execute the GET API on their own (for
+            # instance, `django_elasticsearch_dsl_drf.hedging.HedgedSearch`)
+            if hasattr(self.search, 'execute_get'):
+                doc = self.search.execute_get(**get_kwargs)
+            else:
+                doc = self.client.get(**get_kwargs)
+            # The `_source` is proxied as it is, no document is built
+            obj = None
+            if doc.get('found', False):
+                obj = self.get_hit_proxy(doc)
 
             # May raise a permission denied
             self.check_object_permissions(self.request, obj)
 
             if not obj and self.ignore:
                 raise Http404("No result matches the given query.")
-            # Remark 1: Code below works fine. Do not try to do the same as
-            # done in `Remark 2`.
-            dictionary_proxy = self.dictionary_proxy(
-                obj.to_dict(),
-                getattr(obj, 'meta', None)
-            )
-            return dictionary_proxy
+            return obj
         else:
             queryset = queryset.filter(
                 'term',
                 **{self.document_uid_field: self.kwargs[lookup_url_kwarg]}
             )
 
-            hits = queryset.execute().hits.hits
+            # Raw hits (`to_dict` of the response does not copy)
+            hits = queryset.execute().to_dict()['hits']['hits']
             count = len(hits)
 
             if count == 1:
-                obj = hits[0]['_source']
+                obj = self.get_hit_proxy(hits[0])
 
                 # May raise a permission denied
                 self.check_object_permissions(self.request, obj)
 
-                # Remark 2: Unlike code in `Remark 1`, here we do need the
-                # conditional treatment.
-                if ELASTICSEARCH_GTE_7_0:
-                    dictionary_proxy = self.dictionary_proxy(
-                        obj.to_dict(),
-                        getattr(obj, 'meta', None)
-                    )
-                else:
-                    dictionary_proxy = self.dictionary_proxy(
-                        obj,
-                        getattr(obj, 'meta', None)
-                    )
-
-                return dictionary_proxy
+                return obj
 
             elif count > 1:
                 raise Http404(
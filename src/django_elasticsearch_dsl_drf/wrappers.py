@@ -1,5 +1,7 @@
 import json
 
+from .utils import ResponseProxy
+
 __title__ = 'django_elasticsearch_dsl_drf.wrappers'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
 __copyright__ = '2017-2020 Artur Barseghyan'
@@ -11,9 +13,13 @@ __all__ = (
 )
 
 
-class Wrapper(object):
+class Wrapper(ResponseProxy):
     """Wrapper.
 
+    Read-only proxy of the dictionary (no copies are made). Unlike the
+    `ResponseProxy`, nested dictionaries are proxied, missing attributes
+    raise `AttributeError` and dates are returned as they are.
+
     Example:
     >>> from django_elasticsearch_dsl_drf.wrappers import dict_to_obj
     >>>
@@ -52,12 +58,32 @@ class Wrapper(object):
     >>> "Netherlands"
     """
 
+    __slots__ = ()
+
+    def __init__(self, mapping=None, meta=None):
+        super(Wrapper, self).__init__(
+            {} if mapping is None else mapping,
+            meta
+        )
+
+    def _get_value(self, value):
+        if isinstance(value, dict):
+            return self.__class__(value)
+        return value
+
+    def __getattr__(self, item):
+        try:
+            return self._get_value(self._d_[item])
+        except KeyError:
+            raise AttributeError(item)
+
     def __str__(self):
-        for key, item in self.__dict__.items():
-            if isinstance(item, Wrapper):
-                return item.__str__()
+        for key, item in self._d_.items():
+            if isinstance(item, dict):
+                return self.__class__(item).__str__()
             else:
                 return item
+        return ''
 
     @property
     def as_dict(self):
@@ -66,7 +92,7 @@ class Wrapper(object):
         :return:
         :rtype: dict
         """
-        return obj_to_dict(self)
+        return self.to_dict()
 
     @property
     def as_json(self):
@@ -86,14 +112,7 @@ def dict_to_obj(mapping):
     :return:
     :rtype: :obj:`Wrapper`
     """
-    wrapper = Wrapper()
-
-    for key, item in mapping.items():
-        if isinstance(item, dict):
-            setattr(wrapper, key, dict_to_obj(item))
-        else:
-            setattr(wrapper, key, item)
-    return wrapper
+    return Wrapper(mapping)
 
 
 def obj_to_dict(obj):
@@ -104,12 +123,4 @@ def obj_to_dict(obj):
     :return:
     :rtype: dict
     """
-    mapping = {}
-
-    for key, item in obj.__dict__.items():
-        if isinstance(item, Wrapper):
-            mapping.update({key: obj_to_dict(item)})
-        else:
-            mapping.update({key: item})
-
-    return mapping
+    return obj.to_dict()